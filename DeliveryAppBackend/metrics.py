@@ -0,0 +1,269 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Counters and histograms live in process memory. Under gunicorn, set METRICS_MULTIPROC_DIR
+to a directory shared by the workers: each process writes a snapshot file there (at most
+once per METRICS_FLUSH_INTERVAL_SECONDS, and at exit), and exposition sums every snapshot.
+Without it only the serving process is reported.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+class Metric:
+    kind = ''
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError('Counters only go up.')
+        self.registry._update(self, self._key(labels), lambda value: (value or 0) + amount)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        def update(state):
+            # [per-bucket counts..., +Inf count, sum]
+            state = state or [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+            return state
+
+        self.registry._update(self, self._key(labels), update)
+
+    def time(self, **labels) -> '_Timer':
+        return _Timer(self, labels)
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._values: dict[str, dict[tuple, object]] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._snapshot_name = self._new_snapshot_name()
+        self._last_flush = 0.0
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric {metric.name} is already registered.')
+            self._metrics[metric.name] = metric
+            self._values[metric.name] = {}
+        return metric
+
+    def _new_snapshot_name(self) -> str:
+        return f'{os.getpid()}-{time.time_ns()}.json'
+
+    def _check_fork(self) -> None:
+        # A forked worker must not re-report what its parent counted before the fork.
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._snapshot_name = self._new_snapshot_name()
+            for values in self._values.values():
+                values.clear()
+
+    def _update(self, metric: Metric, key: tuple, update) -> None:
+        with self._lock:
+            self._check_fork()
+            values = self._values[metric.name]
+            values[key] = update(values.get(key))
+        self.maybe_flush()
+
+    def reset(self) -> None:
+        """Zero every series in this process (tests)."""
+        with self._lock:
+            for values in self._values.values():
+                values.clear()
+
+    # --- multi-process snapshots -------------------------------------------------
+
+    def _multiproc_dir(self) -> Path | None:
+        directory = getattr(settings, 'METRICS_MULTIPROC_DIR', '')
+        return Path(directory) if directory else None
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            self._check_fork()
+            return {
+                name: [[list(key), list(value) if isinstance(value, list) else value] for key, value in values.items()]
+                for name, values in self._values.items()
+            }
+
+    def flush(self) -> None:
+        directory = self._multiproc_dir()
+        if directory is None:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(self._snapshot())
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            handle.write(payload)
+        os.replace(tmp_path, directory / self._snapshot_name)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self) -> None:
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL_SECONDS', DEFAULT_FLUSH_INTERVAL_SECONDS)
+        if self._multiproc_dir() is not None and time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def _collect(self) -> dict[str, dict[tuple, object]]:
+        directory = self._multiproc_dir()
+        if directory is None:
+            snapshots = [self._snapshot()]
+        else:
+            self.flush()
+            snapshots = []
+            for path in directory.glob('*.json'):
+                try:
+                    snapshots.append(json.loads(path.read_text(encoding='utf-8')))
+                except (OSError, ValueError):
+                    continue
+
+        merged: dict[str, dict[tuple, object]] = {name: {} for name in self._metrics}
+        for snapshot in snapshots:
+            for name, series in snapshot.items():
+                if name not in merged:
+                    continue
+                for key, value in series:
+                    key = tuple(key)
+                    current = merged[name].get(key)
+                    if isinstance(value, list):
+                        merged[name][key] = value if current is None else [a + b for a, b in zip(current, value)]
+                    else:
+                        merged[name][key] = value + (current or 0)
+        return merged
+
+    # --- exposition --------------------------------------------------------------
+
+    def render(self) -> str:
+        """All series in Prometheus text exposition format (0.0.4)."""
+        merged = self._collect()
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f'# HELP {name} {_escape_help(metric.documentation)}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for key, value in sorted(merged[name].items()):
+                labels = dict(zip(metric.labelnames, key))
+                if metric.kind == 'histogram':
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets, value):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{_labels({**labels, "le": _number(bound)})} {cumulative}')
+                    cumulative += value[len(metric.buckets)]
+                    lines.append(f'{name}_bucket{_labels({**labels, "le": "+Inf"})} {cumulative}')
+                    lines.append(f'{name}_sum{_labels(labels)} {_number(value[-1])}')
+                    lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+                else:
+                    lines.append(f'{name}{_labels(labels)} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value) -> str:
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + '}'
+
+
+REGISTRY = MetricsRegistry()
+atexit.register(lambda: REGISTRY.flush())
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds',
+    'API request latency by DRF route name.',
+    ('route', 'method', 'status'),
+)
+DB_QUERIES = REGISTRY.counter(
+    'db_queries_total',
+    'SQL statements executed while serving a request, by route name.',
+    ('route',),
+)
+GEOCODING_REQUESTS = REGISTRY.counter(
+    'geocoding_requests_total',
+    'External geocoding calls by provider and outcome (ok, no_results, error).',
+    ('provider', 'outcome'),
+)
+GEOCODING_DURATION = REGISTRY.histogram(
+    'geocoding_request_duration_seconds',
+    'External geocoding call latency by provider.',
+    ('provider',),
+)
+S3_OPERATION_DURATION = REGISTRY.histogram(
+    's3_operation_duration_seconds',
+    'S3 presign and upload latency by operation.',
+    ('operation',),
+)
+COMPLIANCE_JOB_RESULTS = REGISTRY.counter(
+    'compliance_job_results_total',
+    'Compliance job outcomes (expired documents, reminders queued/sent/skipped).',
+    ('job', 'result'),
+)
@@ -0,0 +1,149 @@
+"""
+List pagination: page numbers by default, keyset cursors on request.
+
+``?pagination=cursor`` (or any ``?cursor=``) switches a view that declares ``cursor_ordering``
+to keyset pages: ``{"next", "previous", "results"}`` with no COUNT(*) and no OFFSET, so
+deep pages cost the same as the first. Other requests keep the PageNumberPagination shape.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+PAGINATION_QUERY_PARAM = 'pagination'
+CURSOR_QUERY_PARAM = 'cursor'
+CURSOR_MODE = 'cursor'
+
+
+def _flip(field: str) -> str:
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class KeysetPagination(BasePagination):
+    """Composite keyset pages over ``view.cursor_ordering`` (every field non-null, last one unique)."""
+
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(view.cursor_ordering)
+        self.page_size = api_settings.PAGE_SIZE
+        self.base_url = request.build_absolute_uri()
+        model = queryset.model
+
+        cursor = self._decode_cursor(request.query_params.get(CURSOR_QUERY_PARAM), model)
+        reverse = bool(cursor and cursor['reverse'])
+        ordering = tuple(_flip(field) for field in self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(ordering, cursor['position']))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = cursor is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def _field_name(self, field: str) -> str:
+        return field.lstrip('-')
+
+    def _after(self, ordering, position) -> Q:
+        """Rows strictly after ``position`` in ``ordering``: (a, b) > (x, y) as OR-ed prefixes."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = self._field_name(field)
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _link(self, row, *, reverse: bool) -> str:
+        # Rows are model instances, or dicts when the view paginates a values() projection.
+        position = [
+            row[name] if isinstance(row, dict) else getattr(row, name)
+            for name in map(self._field_name, self.ordering)
+        ]
+        payload = json.dumps({'p': [_serialize(value) for value in position], 'r': reverse})
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = replace_query_param(self.base_url, PAGINATION_QUERY_PARAM, CURSOR_MODE)
+        return replace_query_param(url, CURSOR_QUERY_PARAM, token)
+
+    def _decode_cursor(self, token, model):
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError('cursor length')
+            position = [
+                model._meta.get_field(self._field_name(field)).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except Exception as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        return {'position': position, 'reverse': bool(payload.get('r'))}
+
+
+def _serialize(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def wants_cursor_pagination(request) -> bool:
+    params = request.query_params
+    return params.get(PAGINATION_QUERY_PARAM) == CURSOR_MODE or CURSOR_QUERY_PARAM in params
+
+
+class SelectablePagination(PageNumberPagination):
+    """PageNumberPagination unless the request asks for cursors and the view supports them."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if getattr(view, 'cursor_ordering', None) and wants_cursor_pagination(request):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
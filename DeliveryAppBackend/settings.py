@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta  # override simple jwt settings for timeouts
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -63,6 +64,8 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'delivery.middleware.RequestIdMiddleware',
+    'delivery.middleware.QueryProfilingMiddleware',
+    'delivery.middleware.MetricsMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -158,7 +161,7 @@ REST_FRAMEWORK = {
     #     'rest_framework.authentication.TokenAuthentication',
     # ],
       'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'delivery.authentication.RoleClaimsJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
@@ -171,6 +174,8 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,                   # optional: issue new refresh token on use
     "BLACKLIST_AFTER_ROTATION": True,                # optional: old refresh token becomes invalid
 }
+# How long each worker trusts its memo of a user's role-claims revocation marker
+ROLE_CLAIMS_REVOCATION_CHECK_SECONDS = config('ROLE_CLAIMS_REVOCATION_CHECK_SECONDS', default=5, cast=int)
 
 # CORS settings for React frontend and mobile app
 CORS_ALLOW_ALL_ORIGINS = DEBUG  # Relax in dev only
@@ -215,9 +220,73 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'delivery.queries': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
+# Cache shared by every worker: the vehicle catalog payload, the version stamps of the
+# in-process spec and driver geo indexes, role-claim revocations and the fleet summary
+# live here. It must not be the database cache: cache reads stand in for queries on the
+# hot paths, so deployments (DEBUG=False) require REDIS_URL. Local DEBUG runs without it
+# use the in-memory cache (single process).
+_redis_url = config('REDIS_URL', default='')
+if _redis_url:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': _redis_url,
+        }
+    }
+elif DEBUG:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    raise ImproperlyConfigured('REDIS_URL is required when DEBUG is False (shared cache for all workers).')
+
+# SQL profiling per request (delivery.middleware.QueryProfilingMiddleware): logs query
+# count/DB time on delivery.queries, sets Server-Timing, warns above the budget.
+QUERY_PROFILING_ENABLED = config('QUERY_PROFILING_ENABLED', default=False, cast=bool)
+QUERY_PROFILING_BUDGET = config('QUERY_PROFILING_BUDGET', default=50, cast=int)
+
+# Runtime metrics (GET /metrics, Prometheus text format). Under gunicorn point
+# METRICS_MULTIPROC_DIR at a directory shared by the workers (cleared on deploy) so the
+# scrape sums every worker. Scrapers authenticate with "Authorization: Metrics <token>".
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_MULTIPROC_DIR = config('METRICS_MULTIPROC_DIR', default='')
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Staff exports (/api/exports/...): rows fetched and encoded per chunk while streaming.
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Auto dispatch (POST /api/assignments/auto-dispatch/): daily deliveries per driver unless
+# the request sets max_per_driver.
+DISPATCH_MAX_DELIVERIES_PER_DRIVER = config('DISPATCH_MAX_DELIVERIES_PER_DRIVER', default=8, cast=int)
+
+# Nearby drivers (GET /api/deliveries/{id}/nearby-drivers/): search radius around the pickup
+# unless the request sets max_km.
+PROXIMITY_MAX_KM = config('PROXIMITY_MAX_KM', default=100, cast=float)
+
+# Delivery pricing (POST /api/deliveries/quotes/, estimate_delivery_costs): base fee +
+# per-km x great-circle distance x detour factor + vehicle class surcharge, where the class
+# is picked by catalog spec payload: (class, max payload kg or None, surcharge), lightest first.
+PRICING_BASE_FEE = config('PRICING_BASE_FEE', default=15.0, cast=float)
+PRICING_PER_KM = config('PRICING_PER_KM', default=1.25, cast=float)
+PRICING_DETOUR_FACTOR = config('PRICING_DETOUR_FACTOR', default=1.3, cast=float)
+PRICING_AVERAGE_SPEED_KMH = config('PRICING_AVERAGE_SPEED_KMH', default=40.0, cast=float)
+PRICING_VEHICLE_CLASSES = (
+    ('light', 700, 0.0),
+    ('standard', 1200, 10.0),
+    ('heavy', None, 25.0),
+)
+PRICING_BATCH_SIZE = config('PRICING_BATCH_SIZE', default=1000, cast=int)
+
 # Email (Phase 4D — compliance expiry reminders)
 DEFAULT_FROM_EMAIL = config(
     'DEFAULT_FROM_EMAIL',
@@ -234,3 +303,10 @@ if _email_host:
     EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
     EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
     EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+
+# Address validation logs: opt in to buffer writes off the request path (the test suite
+# expects synchronous writes); compact stores a summary of provider responses.
+ADDRESS_VALIDATION_LOG_BUFFERED = config('ADDRESS_VALIDATION_LOG_BUFFERED', default=False, cast=bool)
+ADDRESS_VALIDATION_LOG_COMPACT_RESPONSES = config(
+    'ADDRESS_VALIDATION_LOG_COMPACT_RESPONSES', default=False, cast=bool,
+)
@@ -18,6 +18,8 @@ from django.contrib import admin
 from django.urls import path, include  # Add 'include' here
 from django.http import JsonResponse
 
+from delivery.views_metrics import MetricsView
+
 def health_check(request):
     """Simple health check endpoint"""
     return JsonResponse({
@@ -37,4 +39,5 @@ urlpatterns = [
     path('api/', include('delivery.urls')),  # Include delivery app URLs
     path('api/health/', health_check, name='api_health_check'),  # API health check
     path('api/address-validation/', include('address_validation.urls')),  # Include address validation URLs
+    path('metrics', MetricsView.as_view(), name='metrics'),  # Prometheus scrape (staff or METRICS_TOKEN)
 ]
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Geocode Cache
+Reuse validated addresses for repeat inputs: in-process LRU in front of GeocodeCacheEntry
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import GeocodeCacheEntry, ValidatedAddress
+
+DEFAULT_TTL = timedelta(days=30)
+DEFAULT_LRU_SIZE = 1024
+DEFAULT_STATS_FLUSH_SECONDS = 60
+
+COUNTER_KEYS = {
+    'lru_hits': 'address_validation:geocode_cache:lru_hits',
+    'db_hits': 'address_validation:geocode_cache:db_hits',
+    'misses': 'address_validation:geocode_cache:misses',
+}
+
+UNIT_WORDS = {'apt', 'apartment', 'suite', 'ste', 'unit', '#'}
+
+_lru: 'OrderedDict[str, ValidatedAddress]' = OrderedDict()
+_lru_expiry: Dict[str, object] = {}
+_lru_lock = threading.Lock()
+
+# Counts accumulate per process and are added to the shared counters at most once per
+# ADDRESS_GEOCODE_STATS_FLUSH_SECONDS, so lookups (LRU hits above all) don't write the cache
+_pending_counts: Dict[str, int] = dict.fromkeys(COUNTER_KEYS, 0)
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _ttl() -> timedelta:
+    days = getattr(settings, 'ADDRESS_GEOCODE_CACHE_TTL_DAYS', None)
+    return timedelta(days=days) if days is not None else DEFAULT_TTL
+
+
+def _lru_size() -> int:
+    return getattr(settings, 'ADDRESS_GEOCODE_LRU_SIZE', DEFAULT_LRU_SIZE)
+
+
+def normalize_address_key(address_text: str, country_hint: str = 'US') -> str:
+    """
+    Canonical form of an address for cache lookups.
+
+    Case and whitespace are folded, "Apt 4" / "Suite 4" / "#4" become "unit 4",
+    Canadian postal codes lose their space and ZIP+4 always uses a hyphen.
+    """
+    text = address_text.casefold()
+    text = re.sub(r'\b([a-z]\d[a-z])\s*(\d[a-z]\d)\b', r'\1\2', text)
+    text = re.sub(r'\b(\d{5})\s*-?\s*(\d{4})\b', r'\1-\2', text)
+    text = text.replace('#', ' # ')
+    text = re.sub(r'[,.;]', ' ', text)
+    tokens = ['unit' if token in UNIT_WORDS else token for token in text.split()]
+    # "unit unit 4" can arise from "Apt #4"
+    collapsed = []
+    for token in tokens:
+        if token == 'unit' and collapsed and collapsed[-1] == 'unit':
+            continue
+        collapsed.append(token)
+    return f"{country_hint.upper()}|{' '.join(collapsed)}"
+
+
+def _hash_key(normalized_key: str) -> str:
+    return hashlib.sha256(normalized_key.encode('utf-8')).hexdigest()
+
+
+def _stats_flush_seconds() -> float:
+    return getattr(settings, 'ADDRESS_GEOCODE_STATS_FLUSH_SECONDS', DEFAULT_STATS_FLUSH_SECONDS)
+
+
+def _count(counter: str, amount: int = 1) -> None:
+    if amount:
+        with _pending_lock:
+            _pending_counts[counter] += amount
+
+
+def _flush_counts(force: bool = False) -> None:
+    """Add this process's pending counts to the shared counters if due (or ``force``)"""
+    global _last_flush
+    with _pending_lock:
+        if not force and time.monotonic() - _last_flush < _stats_flush_seconds():
+            return
+        pending = {counter: amount for counter, amount in _pending_counts.items() if amount}
+        for counter in _pending_counts:
+            _pending_counts[counter] = 0
+        _last_flush = time.monotonic()
+    for counter, amount in pending.items():
+        key = COUNTER_KEYS[counter]
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, None)
+
+
+def _lru_get(cache_key: str) -> Optional[ValidatedAddress]:
+    with _lru_lock:
+        address = _lru.get(cache_key)
+        if address is None:
+            return None
+        if _lru_expiry[cache_key] <= timezone.now():
+            del _lru[cache_key]
+            del _lru_expiry[cache_key]
+            return None
+        _lru.move_to_end(cache_key)
+        return address
+
+
+def _lru_put(cache_key: str, address: ValidatedAddress, expires_at) -> None:
+    with _lru_lock:
+        _lru[cache_key] = address
+        _lru_expiry[cache_key] = expires_at
+        _lru.move_to_end(cache_key)
+        while len(_lru) > _lru_size():
+            evicted, _ = _lru.popitem(last=False)
+            del _lru_expiry[evicted]
+
+
+def lookup(address_text: str, country_hint: str = 'US') -> Optional[ValidatedAddress]:
+    """Return the cached ValidatedAddress for this input, or None on a miss"""
+    normalized_key = normalize_address_key(address_text, country_hint)
+    return lookup_many([normalized_key]).get(normalized_key)
+
+
+def lookup_many(normalized_keys: Iterable[str]) -> Dict[str, ValidatedAddress]:
+    """Batch lookup by normalized key; returns hits only. LRU first, then one query for the rest"""
+    hashed = {_hash_key(normalized_key): normalized_key for normalized_key in normalized_keys}
+    found: Dict[str, ValidatedAddress] = {}
+    for cache_key, normalized_key in hashed.items():
+        address = _lru_get(cache_key)
+        if address is not None:
+            found[normalized_key] = address
+    _count('lru_hits', len(found))
+
+    remaining = [cache_key for cache_key, normalized_key in hashed.items() if normalized_key not in found]
+    if remaining:
+        entries = GeocodeCacheEntry.objects.select_related('address').filter(
+            cache_key__in=remaining,
+            expires_at__gt=timezone.now(),
+        )
+        db_hits = 0
+        for entry in entries:
+            found[hashed[entry.cache_key]] = entry.address
+            _lru_put(entry.cache_key, entry.address, entry.expires_at)
+            db_hits += 1
+        _count('db_hits', db_hits)
+        _count('misses', len(remaining) - db_hits)
+        _flush_counts()
+    return found
+
+
+def store(address_text: str, country_hint: str, address: ValidatedAddress) -> None:
+    """Remember a validated address for repeat inputs until the TTL elapses"""
+    store_many([(address_text, country_hint, address)])
+
+
+def store_many(items) -> None:
+    """Upsert cache rows for ``(address_text, country_hint, address)`` triples in one statement"""
+    expires_at = timezone.now() + _ttl()
+    entries = {}
+    for address_text, country_hint, address in items:
+        normalized_key = normalize_address_key(address_text, country_hint)
+        cache_key = _hash_key(normalized_key)
+        entries[cache_key] = GeocodeCacheEntry(
+            cache_key=cache_key,
+            normalized_key=normalized_key,
+            address=address,
+            expires_at=expires_at,
+        )
+    if not entries:
+        return
+    GeocodeCacheEntry.objects.bulk_create(
+        entries.values(),
+        update_conflicts=True,
+        unique_fields=['cache_key'],
+        update_fields=['normalized_key', 'address', 'expires_at', 'updated_at'],
+    )
+    for cache_key, entry in entries.items():
+        _lru_put(cache_key, entry.address, expires_at)
+
+
+def get_cache_statistics() -> Dict:
+    """
+    Hit/miss counters (shared through the Django cache) and live entry count. Includes this
+    process's counts; other workers' appear once they flush.
+    """
+    _flush_counts(force=True)
+    counters = cache.get_many(COUNTER_KEYS.values())
+    stats = {name: counters.get(key, 0) for name, key in COUNTER_KEYS.items()}
+    stats['hits'] = stats['lru_hits'] + stats['db_hits']
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = (stats['hits'] / lookups) * 100 if lookups else 0
+    stats['entries'] = GeocodeCacheEntry.objects.filter(expires_at__gt=timezone.now()).count()
+    return stats
+
+
+def clear() -> None:
+    """Empty the in-process LRU and reset counters (table rows expire on their own)"""
+    with _lru_lock:
+        _lru.clear()
+        _lru_expiry.clear()
+    with _pending_lock:
+        for counter in _pending_counts:
+            _pending_counts[counter] = 0
+    cache.delete_many(list(COUNTER_KEYS.values()))
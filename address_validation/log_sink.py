@@ -0,0 +1,111 @@
+"""
+Address Validation Log Sink
+Buffers AddressValidationLog rows in memory and writes them with bulk_create
+"""
+import atexit
+import logging
+import threading
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import AddressValidationLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 100
+DEFAULT_FLUSH_SECONDS = 5.0
+
+
+def summarize_response(response_data):
+    """Compact form of a provider response: scalars, location and result count only"""
+    if not isinstance(response_data, dict):
+        return response_data
+    summary: Dict = {
+        key: value for key, value in response_data.items()
+        if value is None or isinstance(value, (str, int, float, bool))
+    }
+    geometry = response_data.get('geometry')
+    if isinstance(geometry, dict):
+        summary['location'] = geometry.get('location')
+        summary['location_type'] = geometry.get('location_type')
+    if isinstance(response_data.get('results'), list):
+        summary['result_count'] = len(response_data['results'])
+    return summary
+
+
+class BufferedLogSink:
+    """Collect log rows and flush them once the buffer fills or the interval elapses"""
+    
+    def __init__(self, max_size: int = DEFAULT_BUFFER_SIZE, flush_interval: float = DEFAULT_FLUSH_SECONDS):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._buffer: List[AddressValidationLog] = []
+        self._lock = threading.Lock()
+        self._timer = None
+    
+    def add(self, logs: List[AddressValidationLog]) -> None:
+        with self._lock:
+            self._buffer.extend(logs)
+            full = len(self._buffer) >= self.max_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+    
+    def flush(self) -> int:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not batch:
+            return 0
+        try:
+            AddressValidationLog.objects.bulk_create(batch)
+        except Exception:
+            logger.exception("Dropped %s address validation log rows", len(batch))
+            return 0
+        return len(batch)
+    
+    def _flush_from_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            # Timer threads get their own connection; don't leak it.
+            connection.close()
+    
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+
+_sink = BufferedLogSink(
+    max_size=getattr(settings, 'ADDRESS_VALIDATION_LOG_BUFFER_SIZE', DEFAULT_BUFFER_SIZE),
+    flush_interval=getattr(settings, 'ADDRESS_VALIDATION_LOG_FLUSH_SECONDS', DEFAULT_FLUSH_SECONDS),
+)
+atexit.register(_sink.flush)
+
+
+def write_logs(logs: List[AddressValidationLog]) -> None:
+    """Record log rows: buffered when ADDRESS_VALIDATION_LOG_BUFFERED, else written now"""
+    if not logs:
+        return
+    if getattr(settings, 'ADDRESS_VALIDATION_LOG_COMPACT_RESPONSES', False):
+        for log in logs:
+            log.response_data = summarize_response(log.response_data)
+    if getattr(settings, 'ADDRESS_VALIDATION_LOG_BUFFERED', False):
+        # Rows reference addresses that may still be inside a transaction.
+        transaction.on_commit(lambda: _sink.add(logs))
+    else:
+        AddressValidationLog.objects.bulk_create(logs)
+
+
+def flush_logs() -> int:
+    """Write any buffered rows now; returns how many were written"""
+    return _sink.flush()
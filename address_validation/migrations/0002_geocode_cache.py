@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address_validation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(help_text='SHA-256 of the normalized address key', max_length=64, unique=True)),
+                ('normalized_key', models.TextField(help_text='Canonical address text the key was built from')),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('address', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cache_entries', to='address_validation.validatedaddress')),
+            ],
+        ),
+    ]
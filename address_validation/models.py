@@ -129,3 +129,21 @@ class AddressValidationLog(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+
+
+class GeocodeCacheEntry(models.Model):
+    """Map a normalized address key to its validated result until it expires"""
+    
+    cache_key = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the normalized address key")
+    normalized_key = models.TextField(help_text="Canonical address text the key was built from")
+    address = models.ForeignKey(ValidatedAddress, on_delete=models.CASCADE, related_name='cache_entries')
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.normalized_key} -> {self.address_id}"
+    
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
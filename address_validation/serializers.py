@@ -4,6 +4,7 @@ DRF serializers for address validation API
 """
 from rest_framework import serializers
 from .models import ValidatedAddress, AddressValidationLog
+from .services import BULK_MAX_ADDRESSES
 
 
 class ValidatedAddressSerializer(serializers.ModelSerializer):
@@ -79,6 +80,7 @@ class BatchAddressValidationRequestSerializer(serializers.Serializer):
     
     addresses = serializers.ListField(
         child=AddressValidationRequestSerializer(),
-        max_length=50,
-        help_text="List of addresses to validate (max 50)"
+        min_length=1,
+        max_length=BULK_MAX_ADDRESSES,
+        help_text=f"List of addresses to validate (max {BULK_MAX_ADDRESSES})"
     )
\ No newline at end of file
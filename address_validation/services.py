@@ -4,15 +4,47 @@ Handles Google Maps API and Canada Post API integration
 """
 import time
 import logging
-from typing import Dict, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from django.conf import settings
+from django.db import transaction
 import googlemaps
 import usaddress
 import pycountry
+from DeliveryAppBackend.metrics import GEOCODING_DURATION, GEOCODING_REQUESTS
+from . import geocode_cache, log_sink
 from .models import ValidatedAddress, AddressValidationLog
 
 logger = logging.getLogger(__name__)
 
+# Bulk validation limits (overridable in settings)
+BULK_MAX_ADDRESSES = 500
+BULK_MAX_WORKERS = getattr(settings, 'ADDRESS_VALIDATION_BULK_WORKERS', 8)
+GOOGLE_MAX_QPS = getattr(settings, 'ADDRESS_VALIDATION_GOOGLE_QPS', 10)
+
+
+class ProviderRateLimiter:
+    """Space calls to one provider at least 1/qps seconds apart across threads"""
+    
+    def __init__(self, qps: float):
+        self.interval = 1.0 / qps if qps else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+google_rate_limiter = ProviderRateLimiter(GOOGLE_MAX_QPS)
+
 
 class AddressValidationService:
     """Main service for address validation with LIVE Google Maps integration"""
@@ -49,6 +81,11 @@ class AddressValidationService:
         Returns:
             ValidatedAddress object
         """
+        # Repeat inputs reuse the earlier result (no new rows, no external call)
+        cached_address = geocode_cache.lookup(address_text, country_hint)
+        if cached_address is not None:
+            return cached_address
+        
         # Create initial address record
         validated_address = ValidatedAddress.objects.create(
             original_address=address_text,
@@ -66,11 +103,95 @@ class AddressValidationService:
             logger.error(f"Address validation failed: {e}")
             validated_address.validation_status = 'invalid'
             validated_address.save()
+            return validated_address
         
+        if self._is_cacheable(validated_address):
+            geocode_cache.store(address_text, country_hint, validated_address)
         return validated_address
     
+    def validate_addresses(self, items: List[Tuple[str, str]]) -> List[ValidatedAddress]:
+        """
+        Validate many (address_text, country_hint) pairs, returning results in input order
+        
+        Inputs sharing a normalized key are validated once; cache hits skip validation.
+        Misses are resolved concurrently (provider calls only, no database access in
+        worker threads) and written with bulk_create.
+        """
+        keys = [geocode_cache.normalize_address_key(text, hint) for text, hint in items]
+        first_by_key: Dict[str, Tuple[str, str]] = {}
+        for key, item in zip(keys, items):
+            first_by_key.setdefault(key, item)
+        
+        results = geocode_cache.lookup_many(first_by_key)
+        misses = [(key, item) for key, item in first_by_key.items() if key not in results]
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, len(misses))) as pool:
+                resolved = list(pool.map(lambda miss: self._resolve_address(*miss[1]), misses))
+            results.update(self._save_resolved(misses, resolved))
+        
+        return [results[key] for key in keys]
+    
+    def _resolve_address(self, address_text: str, country_hint: str) -> Tuple[ValidatedAddress, list]:
+        """Unsaved address and log rows for one input; runs in a worker thread"""
+        address = ValidatedAddress(original_address=address_text, validation_status='pending')
+        logs: list = []
+        try:
+            if country_hint.upper() == 'CA':
+                self._resolve_canadian_address(address, logs)
+            else:
+                self._resolve_us_address(address, logs)
+        except Exception as e:
+            logger.error(f"Address validation failed: {e}")
+            address.validation_status = 'invalid'
+        return address, logs
+    
+    @transaction.atomic
+    def _save_resolved(self, misses, resolved) -> Dict[str, ValidatedAddress]:
+        addresses = ValidatedAddress.objects.bulk_create([address for address, _ in resolved])
+        logs = []
+        for address, (_, address_logs) in zip(addresses, resolved):
+            for log in address_logs:
+                log.address = address
+                logs.append(log)
+        log_sink.write_logs(logs)
+        
+        saved = {}
+        cacheable = []
+        for (key, (address_text, country_hint)), address in zip(misses, addresses):
+            saved[key] = address
+            if self._is_cacheable(address):
+                cacheable.append((address_text, country_hint, address))
+        geocode_cache.store_many(cacheable)
+        return saved
+    
+    def _is_cacheable(self, address: ValidatedAddress) -> bool:
+        """Cache definitive results only, not usaddress fallbacks after a Google failure"""
+        if address.validation_status in ('pending', 'invalid') and address.validation_source != 'google':
+            return False
+        if self.google_client and address.validation_source == 'usaddress':
+            return False
+        return True
+    
+    def _save_with_logs(self, address: ValidatedAddress, resolve) -> None:
+        logs: list = []
+        try:
+            resolve(address, logs)
+            address.save()
+        finally:
+            for log in logs:
+                log.address = address
+            log_sink.write_logs(logs)
+    
     def _validate_us_address(self, address: ValidatedAddress) -> None:
         """Validate US address using usaddress parser and Google Maps API"""
+        self._save_with_logs(address, self._resolve_us_address)
+    
+    def _validate_canadian_address(self, address: ValidatedAddress) -> None:
+        """Validate Canadian address using Canada Post API (placeholder)"""
+        self._save_with_logs(address, self._resolve_canadian_address)
+    
+    def _resolve_us_address(self, address: ValidatedAddress, logs: list) -> None:
+        """Fill US address fields from usaddress and Google Maps; collects (unsaved) log rows"""
         start_time = time.time()
         
         try:
@@ -82,41 +203,37 @@ class AddressValidationService:
             
             # If Google Maps API is available, validate with it
             if self.google_client:
-                self._validate_with_google_maps(address)
+                self._validate_with_google_maps(address, logs)
             else:
                 # Use basic validation if no Google API
                 address.validation_status = 'partial'
                 address.validation_source = 'usaddress'
                 address.confidence_score = 0.7
             
-            address.save()
-            
             # Log the validation attempt
             processing_time = time.time() - start_time
-            AddressValidationLog.objects.create(
-                address=address,
+            logs.append(AddressValidationLog(
                 validation_source=address.validation_source,
                 request_data={'original_address': address.original_address},
                 response_data=parsed_address,
                 success=True,
                 processing_time=processing_time
-            )
+            ))
             
         except Exception as e:
             processing_time = time.time() - start_time
-            AddressValidationLog.objects.create(
-                address=address,
+            logs.append(AddressValidationLog(
                 validation_source='usaddress',
                 request_data={'original_address': address.original_address},
                 response_data={},
                 success=False,
                 error_message=str(e),
                 processing_time=processing_time
-            )
+            ))
             raise e
     
-    def _validate_canadian_address(self, address: ValidatedAddress) -> None:
-        """Validate Canadian address using Canada Post API (placeholder)"""
+    def _resolve_canadian_address(self, address: ValidatedAddress, logs: list) -> None:
+        """Fill Canadian address fields (Canada Post API placeholder); collects log rows"""
         # TODO: Implement Canada Post API integration
         # For now, use basic parsing
         start_time = time.time()
@@ -129,29 +246,26 @@ class AddressValidationService:
             address.validation_source = 'manual'
             address.confidence_score = 0.5
             address.country = 'Canada'
-            address.save()
             
             processing_time = time.time() - start_time
-            AddressValidationLog.objects.create(
-                address=address,
+            logs.append(AddressValidationLog(
                 validation_source='canada_post',
                 request_data={'original_address': address.original_address},
                 response_data=parsed_address,
                 success=True,
                 processing_time=processing_time
-            )
+            ))
             
         except Exception as e:
             processing_time = time.time() - start_time
-            AddressValidationLog.objects.create(
-                address=address,
+            logs.append(AddressValidationLog(
                 validation_source='canada_post',
                 request_data={'original_address': address.original_address},
                 response_data={},
                 success=False,
                 error_message=str(e),
                 processing_time=processing_time
-            )
+            ))
             raise e
     
     def _parse_us_address(self, address_text: str) -> Dict:
@@ -173,13 +287,22 @@ class AddressValidationService:
             logger.warning(f"Failed to parse address with usaddress: {e}")
             return {}
     
-    def _validate_with_google_maps(self, address: ValidatedAddress) -> None:
+    def _validate_with_google_maps(self, address: ValidatedAddress, logs: list) -> None:
         """Validate address using LIVE Google Maps Geocoding API"""
         start_time = time.time()
         
         try:
             # LIVE Google Maps Geocoding API call
-            geocode_result = self.google_client.geocode(address.original_address)
+            google_rate_limiter.wait()
+            call_started = time.perf_counter()
+            try:
+                geocode_result = self.google_client.geocode(address.original_address)
+            except Exception:
+                GEOCODING_REQUESTS.inc(provider='google', outcome='error')
+                raise
+            finally:
+                GEOCODING_DURATION.observe(time.perf_counter() - call_started, provider='google')
+            GEOCODING_REQUESTS.inc(provider='google', outcome='ok' if geocode_result else 'no_results')
             
             if geocode_result and len(geocode_result) > 0:
                 result = geocode_result[0]
@@ -209,14 +332,13 @@ class AddressValidationService:
                 
                 # Log successful validation
                 processing_time = time.time() - start_time
-                AddressValidationLog.objects.create(
-                    address=address,
+                logs.append(AddressValidationLog(
                     validation_source='google',
                     request_data={'original_address': address.original_address},
                     response_data=result,
                     success=True,
                     processing_time=processing_time
-                )
+                ))
                 
             else:
                 # No results from Google - mark as invalid
@@ -225,30 +347,28 @@ class AddressValidationService:
                 address.confidence_score = 0.0
                 
                 processing_time = time.time() - start_time
-                AddressValidationLog.objects.create(
-                    address=address,
+                logs.append(AddressValidationLog(
                     validation_source='google',
                     request_data={'original_address': address.original_address},
                     response_data={'results': []},
                     success=False,
                     error_message='No geocoding results found',
                     processing_time=processing_time
-                )
+                ))
                 
         except Exception as e:
             logger.error(f"Google Maps validation failed: {e}")
             processing_time = time.time() - start_time
             
             # Log the error
-            AddressValidationLog.objects.create(
-                address=address,
+            logs.append(AddressValidationLog(
                 validation_source='google',
                 request_data={'original_address': address.original_address},
                 response_data={},
                 success=False,
                 error_message=str(e),
                 processing_time=processing_time
-            )
+            ))
             
             # Fall back to usaddress parsing
             logger.info(f"Falling back to usaddress parsing for: {address.original_address}")
@@ -304,6 +424,12 @@ def validate_address(address_text: str, country_hint: str = 'US') -> ValidatedAd
     return service.validate_address(address_text, country_hint)
 
 
+def validate_addresses(items: List[Tuple[str, str]]) -> List[ValidatedAddress]:
+    """Convenience function to validate (address, country_hint) pairs in bulk"""
+    service = AddressValidationService()
+    return service.validate_addresses(items)
+
+
 def get_validation_statistics() -> Dict:
     """Get address validation statistics"""
     from django.db.models import Count, Q
@@ -325,4 +451,5 @@ def get_validation_statistics() -> Dict:
         stats['valid_percentage'] = 0
         stats['success_rate'] = 0
     
+    stats['geocode_cache'] = geocode_cache.get_cache_statistics()
     return stats
\ No newline at end of file
@@ -4,14 +4,15 @@ Required for RED status project - must achieve ≥80% coverage
 """
 import json
 from unittest.mock import Mock, patch, MagicMock
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import ValidatedAddress, AddressValidationLog
+from . import geocode_cache, log_sink
+from .models import GeocodeCacheEntry, ValidatedAddress, AddressValidationLog
 from .services import AddressValidationService, validate_address, get_validation_statistics
 from .serializers import (
     ValidatedAddressSerializer, 
@@ -364,6 +365,134 @@ class AddressValidationServiceTests(TestCase):
         self.assertEqual(stats['success_rate'], 70.0)  # (6+1)/10 * 100
 
 
+class GeocodeCacheTests(TestCase):
+    """Test normalized-address cache in front of validation"""
+    
+    def setUp(self):
+        geocode_cache.clear()
+    
+    def test_normalized_key_folds_formatting(self):
+        """Case, whitespace, unit and postal formatting share one key"""
+        self.assertEqual(
+            geocode_cache.normalize_address_key('123 Main St, Apt #4, Toronto ON M5V 3A8', 'ca'),
+            geocode_cache.normalize_address_key('  123 main st  unit 4 toronto on m5v3a8', 'CA'),
+        )
+        self.assertEqual(
+            geocode_cache.normalize_address_key('1 Elm St Suite 2, Austin TX 78701 1234'),
+            geocode_cache.normalize_address_key('1 elm st ste 2 austin tx 78701-1234'),
+        )
+        self.assertNotEqual(
+            geocode_cache.normalize_address_key('1 Elm St', 'US'),
+            geocode_cache.normalize_address_key('1 Elm St', 'CA'),
+        )
+    
+    @patch('address_validation.services.usaddress.tag')
+    def test_repeat_validation_reuses_result(self, mock_tag):
+        """Second validation returns the first row without parsing or new rows"""
+        mock_tag.return_value = ({'AddressNumber': '42', 'StreetName': 'Oak'}, 'Street Address')
+        
+        first = validate_address('42 Oak St, Springfield IL 62701', 'US')
+        second = validate_address('42 OAK ST  springfield il 62701', 'US')
+        
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(mock_tag.call_count, 1)
+        self.assertEqual(ValidatedAddress.objects.count(), 1)
+        self.assertEqual(AddressValidationLog.objects.count(), 1)
+        
+        stats = get_validation_statistics()['geocode_cache']
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['entries'], 1)
+    
+    @patch('address_validation.services.usaddress.tag')
+    def test_table_serves_other_processes_and_honours_ttl(self, mock_tag):
+        """Rows in the cache table are used after the LRU is cleared, until they expire"""
+        mock_tag.return_value = ({'AddressNumber': '7'}, 'Street Address')
+        first = validate_address('7 Birch Rd', 'US')
+        geocode_cache.clear()
+        
+        self.assertEqual(validate_address('7 birch rd', 'US').id, first.id)
+        self.assertEqual(get_validation_statistics()['geocode_cache']['db_hits'], 1)
+        
+        GeocodeCacheEntry.objects.update(expires_at=timezone.now())
+        geocode_cache.clear()
+        self.assertNotEqual(validate_address('7 Birch Rd', 'US').id, first.id)
+    
+    @patch('address_validation.services.usaddress.tag')
+    def test_lru_hits_do_not_write_shared_counters(self, mock_tag):
+        """Counts stay in-process until a due flush or a statistics read"""
+        mock_tag.return_value = ({'AddressNumber': '9'}, 'Street Address')
+        validate_address('9 Pine Ln', 'US')
+        with patch.object(geocode_cache, 'cache') as shared:
+            for _ in range(3):
+                self.assertIsNotNone(geocode_cache.lookup('9 pine ln', 'US'))
+        self.assertEqual(shared.method_calls, [])
+        self.assertEqual(get_validation_statistics()['geocode_cache']['lru_hits'], 3)
+    
+    def test_invalid_results_are_not_cached(self):
+        """Failed validations are retried on the next request"""
+        service = AddressValidationService()
+        with patch.object(service, '_validate_us_address', side_effect=Exception('boom')):
+            service.validate_address('13 Failing Way', 'US')
+        self.assertFalse(GeocodeCacheEntry.objects.exists())
+
+
+class AddressValidationLogSinkTests(TestCase):
+    """Test buffered and compact validation log writes"""
+    
+    def setUp(self):
+        geocode_cache.clear()
+        self.address = ValidatedAddress.objects.create(original_address='1 Sink St')
+    
+    def _log(self, **kwargs):
+        values = {
+            'address': self.address,
+            'validation_source': 'google',
+            'request_data': {'original_address': '1 Sink St'},
+            'response_data': {},
+            'success': True,
+            'processing_time': 0.01,
+        }
+        values.update(kwargs)
+        return AddressValidationLog(**values)
+    
+    @override_settings(ADDRESS_VALIDATION_LOG_BUFFERED=True)
+    @patch('address_validation.services.usaddress.tag')
+    def test_buffered_logs_written_on_flush(self, mock_tag):
+        """Validation does not write logs inline when buffering"""
+        mock_tag.return_value = ({'AddressNumber': '5'}, 'Street Address')
+        with self.captureOnCommitCallbacks(execute=True):
+            validate_address('5 Buffer Ln', 'US')
+        self.assertEqual(AddressValidationLog.objects.count(), 0)
+        self.assertEqual(log_sink.flush_logs(), 1)
+        self.assertEqual(AddressValidationLog.objects.count(), 1)
+    
+    def test_sink_flushes_when_full(self):
+        """Reaching max_size writes the whole buffer in one insert"""
+        sink = log_sink.BufferedLogSink(max_size=3, flush_interval=60)
+        sink.add([self._log(), self._log()])
+        self.assertEqual(sink.pending(), 2)
+        with self.assertNumQueries(1):
+            sink.add([self._log()])
+        self.assertEqual(sink.pending(), 0)
+        self.assertEqual(AddressValidationLog.objects.count(), 3)
+    
+    @override_settings(ADDRESS_VALIDATION_LOG_COMPACT_RESPONSES=True)
+    def test_compact_responses_store_summary(self):
+        """Full geocoder payloads are reduced to a summary"""
+        result = {
+            'formatted_address': '1 Sink St, Austin, TX',
+            'place_id': 'abc',
+            'geometry': {'location': {'lat': 1.0, 'lng': 2.0}, 'location_type': 'ROOFTOP', 'viewport': {}},
+            'address_components': [{'long_name': 'Austin', 'types': ['locality']}],
+        }
+        log_sink.write_logs([self._log(response_data=result)])
+        stored = AddressValidationLog.objects.get().response_data
+        self.assertEqual(stored['formatted_address'], '1 Sink St, Austin, TX')
+        self.assertEqual(stored['location_type'], 'ROOFTOP')
+        self.assertNotIn('address_components', stored)
+
+
 class AddressValidationSerializerTests(TestCase):
     """Test address validation serializers"""
     
@@ -456,6 +585,28 @@ class AddressValidationAPITests(APITestCase):
         self.client = APIClient()
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
     
+    def test_validation_logs_cursor_pagination(self):
+        """?pagination=cursor walks the log list by (created_at, id) without COUNT"""
+        address = ValidatedAddress.objects.create(original_address='1 Page St')
+        AddressValidationLog.objects.bulk_create([
+            AddressValidationLog(
+                address=address, validation_source='google', request_data={},
+                response_data={}, success=True, processing_time=0.1,
+            )
+            for _ in range(15)
+        ])
+        response = self.client.get('/api/address-validation/validation-logs/?pagination=cursor')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        first_ids = [row['id'] for row in response.data['results']]
+        self.assertEqual(len(first_ids), 10)
+
+        second = self.client.get(response.data['next'])
+        second_ids = [row['id'] for row in second.data['results']]
+        self.assertEqual(len(second_ids), 5)
+        self.assertFalse(set(first_ids) & set(second_ids))
+        self.assertIsNone(second.data['next'])
+
     def test_validate_endpoint_requires_auth(self):
         """Test that validation endpoint requires authentication"""
         client = APIClient()  # No auth
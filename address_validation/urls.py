@@ -12,5 +12,6 @@ router.register(r'validation-logs', views.AddressValidationLogViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('validate/', views.ValidateAddressView.as_view(), name='validate-address'),
+    path('validate-bulk/', views.ValidateBulkAddressView.as_view(), name='validate-address-bulk'),
     path('statistics/', views.ValidationStatisticsView.as_view(), name='validation-statistics'),
 ]
\ No newline at end of file
@@ -8,12 +8,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from DeliveryAppBackend.pagination import SelectablePagination
 from .models import ValidatedAddress, AddressValidationLog
-from .services import validate_address, get_validation_statistics
+from .services import validate_address, validate_addresses, get_validation_statistics
 from .serializers import (
     ValidatedAddressSerializer, 
     AddressValidationLogSerializer,
-    AddressValidationRequestSerializer
+    AddressValidationRequestSerializer,
+    BatchAddressValidationRequestSerializer
 )
 
 
@@ -85,6 +87,8 @@ class AddressValidationLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AddressValidationLog.objects.all()
     serializer_class = AddressValidationLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = SelectablePagination
+    cursor_ordering = ('-created_at', '-id')
 
 
 class ValidateAddressView(APIView):
@@ -119,6 +123,44 @@ class ValidateAddressView(APIView):
             )
 
 
+class ValidateBulkAddressView(APIView):
+    """Bulk address validation endpoint (address book imports)"""
+    
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        """
+        Validate many addresses; results are returned in input order
+        
+        POST /api/address-validation/validate-bulk/
+        {
+            "addresses": [
+                {"address": "123 Main St, Toronto, ON", "country_hint": "CA"},
+                {"address": "1 Elm St, Austin, TX"}
+            ]
+        }
+        """
+        serializer = BatchAddressValidationRequestSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        items = [
+            (item['address'], item.get('country_hint', 'US'))
+            for item in serializer.validated_data['addresses']
+        ]
+        
+        try:
+            validated_addresses = validate_addresses(items)
+            result_serializer = ValidatedAddressSerializer(validated_addresses, many=True)
+            return Response({'results': result_serializer.data}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {'error': f'Validation failed: {str(e)}'}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class ValidationStatisticsView(APIView):
     """Standalone validation statistics endpoint"""
     
@@ -31,7 +31,7 @@ def pytest_configure():
                 'rest_framework.permissions.IsAuthenticated',
             ],
             'DEFAULT_AUTHENTICATION_CLASSES': (
-                'rest_framework_simplejwt.authentication.JWTAuthentication',
+                'delivery.authentication.RoleClaimsJWTAuthentication',
             ),
             'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
             'PAGE_SIZE': 10
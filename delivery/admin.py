@@ -1,7 +1,7 @@
 # delivery/admin.py
 from django.contrib import admin
 from django import forms
-from .models import Delivery, Driver, Vehicle, DeliveryAssignment, DriverVehicle, Customer, LegalDocument
+from .models import Delivery, Driver, Vehicle, DeliveryAssignment, DeliveryStatusEvent, DriverVehicle, Customer, LegalDocument
 
 # Custom form for admin, vehicle, driver, delivery assignment
 class DeliveryAssignmentAdminForm(forms.ModelForm):
@@ -101,6 +101,13 @@ class DeliveryAssignmentAdmin(admin.ModelAdmin):
     list_filter = ('assigned_at',)
     search_fields = ('delivery__id', 'driver__user__username', 'driver__user__first_name', 'driver__user__last_name', 'vehicle__license_plate')  # CIO DIRECTIVE: Use User fields
 
+@admin.register(DeliveryStatusEvent)
+class DeliveryStatusEventAdmin(admin.ModelAdmin):
+    list_display = ('delivery', 'from_status', 'to_status', 'changed_by', 'created_at')
+    list_filter = ('to_status',)
+    readonly_fields = ('delivery', 'from_status', 'to_status', 'batch_id', 'changed_by', 'reason', 'created_at')
+
+
 @admin.register(DriverVehicle)
 class DriverVehicleAdmin(admin.ModelAdmin):
     list_display = ('driver', 'vehicle', 'assigned_from', 'assigned_to')
@@ -0,0 +1,217 @@
+"""JWT authentication that loads RBAC state alongside the user, or from role claims."""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .me_service import ROLE_CLAIMS_ATTR, ROLE_CLAIMS_KEY, build_role_claims
+from .models import StaffProfile
+from .staff_permissions import STAFF_ACCESS_ATTR
+
+ROLE_CLAIMS_REVOKED_KEY = 'auth:role_claims_revoked:{user_id}'
+DEFAULT_REVOCATION_CHECK_SECONDS = 5
+REVOCATION_MEMO_MAX_ENTRIES = 10000
+
+# Per-process memo of revocation markers: user_id -> (checked_at monotonic, revoked_at or None).
+# Bounds shared-cache reads to one per user per ROLE_CLAIMS_REVOCATION_CHECK_SECONDS; a
+# revocation made by another worker takes effect here within that window.
+_revocations: dict = {}
+
+
+def add_role_claims(token, user) -> None:
+    """Embed the user's resolved role, profile ids and staff permissions in ``token``."""
+    token[ROLE_CLAIMS_KEY] = {**build_role_claims(user), 'issued_at': time.time()}
+
+
+def revoke_role_claims(user_id: int) -> None:
+    """
+    Stop trusting role claims issued to ``user_id`` up to now. Affected access tokens stay
+    valid but fall back to a database-loaded user (with the usual is_active and password
+    checks) until the client refreshes, which re-resolves claims. The marker lives in the
+    shared default cache and only needs to outlive one access-token lifetime.
+    """
+    revoked_at = time.time()
+    cache.set(
+        ROLE_CLAIMS_REVOKED_KEY.format(user_id=user_id),
+        revoked_at,
+        int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
+    _remember_revocation(user_id, revoked_at)
+
+
+def _remember_revocation(user_id, revoked_at) -> None:
+    if len(_revocations) >= REVOCATION_MEMO_MAX_ENTRIES:
+        _revocations.clear()
+    _revocations[user_id] = (time.monotonic(), revoked_at)
+
+
+def _revoked_at(user_id):
+    memo = _revocations.get(user_id)
+    check_seconds = getattr(settings, 'ROLE_CLAIMS_REVOCATION_CHECK_SECONDS', DEFAULT_REVOCATION_CHECK_SECONDS)
+    if memo is not None and time.monotonic() - memo[0] < check_seconds:
+        return memo[1]
+    revoked_at = cache.get(ROLE_CLAIMS_REVOKED_KEY.format(user_id=user_id))
+    _remember_revocation(user_id, revoked_at)
+    return revoked_at
+
+
+def role_claims_revoked(user_id, claims: dict) -> bool:
+    revoked_at = _revoked_at(user_id)
+    return revoked_at is not None and claims.get('issued_at', 0) <= revoked_at
+
+
+def revoke_claims_on_user_save(sender=None, instance=None, created=False, update_fields=None, **kwargs) -> None:
+    """User post_save receiver: deactivation, password and name changes (admin and ORM included)."""
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    revoke_role_claims(instance.pk)
+
+
+def revoke_claims_on_profile_change(sender=None, instance=None, created=False, **kwargs) -> None:
+    """
+    Receiver for StaffProfile save/delete and Customer/Driver create/delete: the owner's
+    role, staff permissions or profile ids changed.
+    """
+    if kwargs.get('signal') is post_save and not created and sender is not StaffProfile:
+        return
+    if instance.user_id:
+        revoke_role_claims(instance.user_id)
+
+
+class RoleClaimsRefreshToken(RefreshToken):
+    """Refresh token (and derived access token) carrying role claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        add_role_claims(token, user)
+        return token
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleClaimsRefreshToken
+
+
+class RoleClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Re-resolve role claims on every refresh so they are never older than one access lifetime."""
+
+    token_class = RoleClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        user = (
+            get_user_model().objects.select_related('staff_profile')
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .first()
+        )
+        if user is None or not user.is_active:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        add_role_claims(refresh, user)
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    Principal built from role claims. Identity, ``is_staff``, staff permissions and profile
+    ids are answered from the token; any other attribute (``is_active`` included) loads the
+    User row on first use.
+    """
+
+    def __init__(self, user_id, claims: dict, loader):
+        super().__init__(loader)
+        values = {
+            'id': user_id,
+            'pk': user_id,
+            'is_staff': claims['is_staff'],
+            'is_authenticated': True,
+            'is_anonymous': False,
+            ROLE_CLAIMS_ATTR: claims,
+        }
+        me = claims.get('me')
+        if me:
+            values['username'] = me['username']
+            if claims['is_staff']:
+                values[STAFF_ACCESS_ATTR] = (me['staff_role'], frozenset(me['permissions']))
+        # LazyObject.__setattr__ would force the load; write straight to the proxy.
+        self.__dict__.update(values)
+
+    def __bool__(self):
+        # ``request.user and ...`` must not force the load.
+        return True
+
+
+class StaffProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that fetches ``staff_profile`` in the same query as the user, so
+    staff permission checks later in the request never touch the database.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        try:
+            user = self.user_model.objects.select_related('staff_profile').get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code='password_changed'
+                )
+
+        return user
+
+
+class RoleClaimsJWTAuthentication(StaffProfileJWTAuthentication):
+    """
+    Build a ClaimsUser from role claims without touching the database. Tokens without
+    claims (or whose claims were revoked) fall back to the database-loaded user.
+    """
+
+    def get_user(self, validated_token):
+        claims = validated_token.get(ROLE_CLAIMS_KEY)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if claims is None or user_id is None or role_claims_revoked(user_id, claims):
+            return super().get_user(validated_token)
+        return ClaimsUser(
+            user_id,
+            claims,
+            lambda: StaffProfileJWTAuthentication.get_user(self, validated_token),
+        )
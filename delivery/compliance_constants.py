@@ -17,6 +17,12 @@ class DocumentStatus(models.TextChoices):
     EXPIRED = 'EXPIRED', 'Expired'
 
 
+class OutboxStatus(models.TextChoices):
+    PENDING = 'PENDING', 'Pending'
+    SENT = 'SENT', 'Sent'
+    FAILED = 'FAILED', 'Failed'
+
+
 class CoverageType(models.TextChoices):
     COMMERCIAL = 'COMMERCIAL', 'Commercial'
     PERSONAL = 'PERSONAL', 'Personal'
@@ -0,0 +1,139 @@
+"""Database-backed outbox for compliance notification emails (Phase 4D).
+
+Producers enqueue rows keyed by an idempotency key; drain_compliance_email_outbox sends
+due rows in batches over one connection, retrying failures with exponential backoff.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from DeliveryAppBackend.metrics import COMPLIANCE_JOB_RESULTS
+
+from .compliance_constants import OutboxStatus
+from .models import ComplianceEmailOutbox, LegalDocument
+
+DEFAULT_BATCH_SIZE = 100
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 6 * 60 * 60
+
+REMINDER_SENT_FIELD = {
+    30: 'expiry_reminder_30_sent_at',
+    14: 'expiry_reminder_14_sent_at',
+    0: 'expiry_reminder_0_sent_at',
+}
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Delay before retry number ``attempts`` (1-based): 1m, 2m, 4m, … capped at 6h."""
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+def enqueue_emails(rows: list[ComplianceEmailOutbox]) -> int:
+    """Insert rows whose idempotency key is new. Returns how many were queued."""
+    if not rows:
+        return 0
+    existing = set(
+        ComplianceEmailOutbox.objects.filter(
+            idempotency_key__in=[row.idempotency_key for row in rows],
+        ).values_list('idempotency_key', flat=True)
+    )
+    new_rows = [row for row in rows if row.idempotency_key not in existing]
+    # ignore_conflicts covers a concurrent enqueue of the same key.
+    ComplianceEmailOutbox.objects.bulk_create(new_rows, ignore_conflicts=True)
+    return len(new_rows)
+
+
+def _mark_documents_reminded(rows: list[ComplianceEmailOutbox], sent_at) -> None:
+    document_ids_by_threshold: dict[int, list[int]] = defaultdict(list)
+    for row in rows:
+        if row.document_id and row.threshold_days in REMINDER_SENT_FIELD:
+            document_ids_by_threshold[row.threshold_days].append(row.document_id)
+    for threshold, document_ids in document_ids_by_threshold.items():
+        LegalDocument.objects.filter(id__in=document_ids).update(
+            **{REMINDER_SENT_FIELD[threshold]: sent_at},
+        )
+
+
+def _drain_batch(batch_size: int) -> dict | None:
+    with transaction.atomic():
+        rows = list(
+            ComplianceEmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxStatus.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if not rows:
+            return None
+
+        result = {'sent': 0, 'retrying': 0, 'failed': 0}
+        sent_rows = []
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            open_error = None
+        except Exception as exc:
+            open_error = exc
+
+        for row in rows:
+            row.attempts += 1
+            try:
+                if open_error is not None:
+                    raise open_error
+                EmailMessage(
+                    subject=row.subject,
+                    body=row.body,
+                    from_email=row.from_email,
+                    to=[row.to_email],
+                    connection=connection,
+                ).send()
+            except Exception as exc:
+                row.last_error = str(exc)[:1000]
+                if row.attempts >= MAX_ATTEMPTS:
+                    row.status = OutboxStatus.FAILED
+                    result['failed'] += 1
+                else:
+                    row.next_attempt_at = timezone.now() + backoff_delay(row.attempts)
+                    result['retrying'] += 1
+                continue
+            row.status = OutboxStatus.SENT
+            row.sent_at = timezone.now()
+            row.last_error = ''
+            sent_rows.append(row)
+            result['sent'] += 1
+
+        if open_error is None:
+            connection.close()
+
+        now = timezone.now()
+        for row in rows:
+            row.updated_at = now  # auto_now does not fire in bulk_update
+        ComplianceEmailOutbox.objects.bulk_update(
+            rows,
+            ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'updated_at'],
+        )
+        _mark_documents_reminded(sent_rows, now)
+    return result
+
+
+def drain_compliance_email_outbox(*, batch_size: int = DEFAULT_BATCH_SIZE, max_batches: int | None = None) -> dict:
+    """
+    Send due outbox rows, ``batch_size`` at a time, until none are due (or ``max_batches``).
+    Failures are rescheduled with backoff and never abort the drain.
+    """
+    totals = {'sent': 0, 'retrying': 0, 'failed': 0, 'batches': 0}
+    while max_batches is None or totals['batches'] < max_batches:
+        result = _drain_batch(batch_size)
+        if result is None:
+            break
+        totals['batches'] += 1
+        for key, value in result.items():
+            totals[key] += value
+    for result in ('sent', 'retrying', 'failed'):
+        COMPLIANCE_JOB_RESULTS.inc(totals[result], job='email_outbox', result=result)
+    return totals
@@ -5,20 +5,15 @@ from __future__ import annotations
 from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.utils import timezone
 
+from DeliveryAppBackend.metrics import COMPLIANCE_JOB_RESULTS
 from delivery.compliance_constants import DocumentStatus, DocumentType
-from delivery.models import Driver, DriverVehicle, LegalDocument
+from delivery.compliance_email_outbox import REMINDER_SENT_FIELD, enqueue_emails
+from delivery.models import ComplianceEmailOutbox, Driver, DriverVehicle, LegalDocument
 
 COMPLIANCE_REMINDER_DAYS = (30, 14, 0)
 
-_REMINDER_SENT_FIELD = {
-    30: 'expiry_reminder_30_sent_at',
-    14: 'expiry_reminder_14_sent_at',
-    0: 'expiry_reminder_0_sent_at',
-}
-
 _DOCUMENT_TYPE_LABEL = {
     DocumentType.DRIVER_LICENSE: 'Driver license',
     DocumentType.VEHICLE_REGISTRATION: 'Vehicle registration',
@@ -59,14 +54,35 @@ def resolve_driver_for_document(document: LegalDocument) -> Driver | None:
     return assignment.driver if assignment else None
 
 
-def recipient_email_for_document(document: LegalDocument) -> str | None:
-    driver = resolve_driver_for_document(document)
+def resolve_drivers_for_documents(documents) -> dict[int, Driver | None]:
+    """Batch resolve_driver_for_document: one DriverVehicle query for all vehicle documents."""
+    vehicle_ids = {doc.vehicle_id for doc in documents if not doc.driver_id and doc.vehicle_id}
+    driver_by_vehicle: dict[int, Driver] = {}
+    if vehicle_ids:
+        assignments = (
+            DriverVehicle.objects.filter(vehicle_id__in=vehicle_ids, assigned_to__isnull=True)
+            .select_related('driver', 'driver__user')
+            .order_by('vehicle_id', '-assigned_from')
+        )
+        for assignment in assignments:
+            driver_by_vehicle.setdefault(assignment.vehicle_id, assignment.driver)
+    return {
+        doc.id: doc.driver if doc.driver_id else driver_by_vehicle.get(doc.vehicle_id)
+        for doc in documents
+    }
+
+
+def _driver_email(driver: Driver | None) -> str | None:
     if not driver or not driver.user_id:
         return None
     email = (driver.user.email or '').strip()
     return email or None
 
 
+def recipient_email_for_document(document: LegalDocument) -> str | None:
+    return _driver_email(resolve_driver_for_document(document))
+
+
 def _reminder_subject(document: LegalDocument, days_before: int) -> str:
     label = _DOCUMENT_TYPE_LABEL.get(document.document_type, document.document_type)
     if days_before == 0:
@@ -98,19 +114,27 @@ def _reminder_body(document: LegalDocument, *, driver_name: str, days_before: in
     return '\n'.join(lines)
 
 
+def reminder_idempotency_key(document: LegalDocument, days_before: int) -> str:
+    return f'expiry-reminder:{document.id}:{days_before}:{document.expiry_date.isoformat()}'
+
+
 def send_compliance_expiry_reminders(*, as_of_date=None, dry_run: bool = False) -> dict:
     """
-    Email drivers at 30, 14, and 0 days before verified document expiry.
-    Each threshold fires at most once per document (tracked on LegalDocument).
+    Queue emails to drivers at 30, 14, and 0 days before verified document expiry.
+
+    Only enqueues into ComplianceEmailOutbox (one query for documents, one for vehicle
+    recipients, one insert per threshold); drain_compliance_email_outbox delivers and
+    stamps the document's sent-at field. The idempotency key (document, threshold,
+    expiry date) keeps reruns from queueing duplicates.
     """
     today = as_of_date or timezone.now().date()
-    sent_by_day = {30: 0, 14: 0, 0: 0}
+    queued_by_day = {30: 0, 14: 0, 0: 0}
     skipped_no_email = 0
 
     for days_before in COMPLIANCE_REMINDER_DAYS:
         target_expiry = today + timedelta(days=days_before)
-        sent_field = _REMINDER_SENT_FIELD[days_before]
-        documents = (
+        sent_field = REMINDER_SENT_FIELD[days_before]
+        documents = list(
             LegalDocument.objects.filter(
                 status=DocumentStatus.VERIFIED,
                 expiry_date=target_expiry,
@@ -118,35 +142,39 @@ def send_compliance_expiry_reminders(*, as_of_date=None, dry_run: bool = False)
             )
             .select_related('driver', 'driver__user', 'vehicle')
         )
+        drivers = resolve_drivers_for_documents(documents)
 
+        rows = []
         for document in documents:
-            email = recipient_email_for_document(document)
+            driver = drivers[document.id]
+            email = _driver_email(driver)
             if not email:
                 skipped_no_email += 1
                 continue
-
-            driver = resolve_driver_for_document(document)
-            driver_name = _driver_display_name(driver)
-            subject = _reminder_subject(document, days_before)
-            body = _reminder_body(document, driver_name=driver_name, days_before=days_before)
-
-            if dry_run:
-                sent_by_day[days_before] += 1
-                continue
-
-            send_mail(
-                subject=subject,
-                message=body,
+            rows.append(ComplianceEmailOutbox(
+                idempotency_key=reminder_idempotency_key(document, days_before),
+                document=document,
+                threshold_days=days_before,
+                to_email=email,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                fail_silently=False,
-            )
-            setattr(document, sent_field, timezone.now())
-            document.save(update_fields=[sent_field])
-            sent_by_day[days_before] += 1
-
+                subject=_reminder_subject(document, days_before),
+                body=_reminder_body(
+                    document,
+                    driver_name=_driver_display_name(driver),
+                    days_before=days_before,
+                ),
+            ))
+
+        if dry_run:
+            queued_by_day[days_before] += len(rows)
+            continue
+        queued_by_day[days_before] += enqueue_emails(rows)
+
+    if not dry_run:
+        COMPLIANCE_JOB_RESULTS.inc(sum(queued_by_day.values()), job='expiry_reminders', result='queued')
+        COMPLIANCE_JOB_RESULTS.inc(skipped_no_email, job='expiry_reminders', result='skipped_no_email')
     return {
         'as_of_date': today.isoformat(),
-        'sent': sent_by_day,
+        'queued': queued_by_day,
         'skipped_no_email': skipped_no_email,
     }
@@ -1,11 +1,15 @@
 """Legal document compliance — business logic SSOT (Phase 4A)."""
 
-from datetime import timedelta
+import base64
+from datetime import date, datetime, timedelta
 
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Count, F, Q
 from django.utils import timezone
 from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 
+from DeliveryAppBackend.metrics import COMPLIANCE_JOB_RESULTS
+
 from .compliance_constants import (
     CoverageType,
     DocumentStatus,
@@ -14,9 +18,12 @@ from .compliance_constants import (
     VEHICLE_DOCUMENT_TYPES,
 )
 from . import compliance_storage
+from . import compliance_status_service
+from .compliance_status_service import subject_doc_blocker
 from .compliance_reminder_service import clear_expiry_reminder_fields
 from .driver_utils import get_current_vehicle, get_driver_for_user
 from .models import Driver, DriverApprovalStatus, DriverVehicle, LegalDocument, Vehicle
+from .permissions import driver_id_for_user
 from .staff_constants import (
     PERM_COMPLIANCE_VERIFY,
     PERM_COMPLIANCE_VIEW,
@@ -32,6 +39,9 @@ REQUIRED_COMPLIANCE_TYPES = (
     DocumentType.COMMERCIAL_INSURANCE,
 )
 
+ADMIN_LIST_DEFAULT_LIMIT = 50
+ADMIN_LIST_MAX_LIMIT = 200
+
 MISCLASSIFIED_DRIVER_LICENSE_FILENAME_HINTS = (
     'commercial_insurance',
     'vehicle_registration',
@@ -48,8 +58,7 @@ def user_can_access_driver(user, driver: Driver) -> bool:
             or user_has_staff_permission(user, PERM_COMPLIANCE_VIEW)
             or user_has_staff_permission(user, PERM_RESOURCES_VIEW)
         )
-    my_driver = get_driver_for_user(user)
-    return my_driver is not None and my_driver.id == driver.id
+    return driver_id_for_user(user) == driver.id
 
 
 def user_can_access_vehicle(user, vehicle: Vehicle) -> bool:
@@ -204,40 +213,36 @@ def _verified_doc_exists(docs, doc_type, *, driver_id=None, vehicle_id=None) ->
 
 
 def get_compliance_summary(driver: Driver) -> dict:
-    docs = list(list_documents_for_driver(driver))
-    today = timezone.now().date()
-    expiring_cutoff = today + timedelta(days=30)
+    """Driver license + current vehicle docs, read from the materialized status rows."""
+    vehicle = get_current_vehicle(driver)
+    driver_status, vehicle_status = compliance_status_service.get_subject_statuses(
+        driver_id=driver.id,
+        vehicle_id=vehicle.id if vehicle else None,
+    )
+    rows = [row for row in (driver_status, vehicle_status) if row is not None]
 
     summary = {
-        'pending': 0,
-        'verified': 0,
-        'rejected': 0,
-        'expired': 0,
-        'expiring_soon': 0,
+        'pending': sum(row.pending_count for row in rows),
+        'verified': sum(row.verified_count for row in rows),
+        'rejected': sum(row.rejected_count for row in rows),
+        'expired': sum(row.expired_count for row in rows),
+        'expiring_soon': sum(row.expiring_soon_count for row in rows),
         'missing_types': [],
         'is_fully_compliant': False,
     }
 
-    for doc in docs:
-        key = doc.status.lower()
-        summary[key] = summary.get(key, 0) + 1
-        if doc.status == DocumentStatus.VERIFIED and doc.expiry_date:
-            if today <= doc.expiry_date <= expiring_cutoff:
-                summary['expiring_soon'] += 1
-
-    vehicle = get_current_vehicle(driver)
     for doc_type in REQUIRED_COMPLIANCE_TYPES:
         if doc_type == DocumentType.DRIVER_LICENSE:
-            has = _verified_doc_exists(docs, doc_type, driver_id=driver.id)
-        elif vehicle:
-            has = _verified_doc_exists(docs, doc_type, vehicle_id=vehicle.id)
+            missing = doc_type in driver_status.missing_types
+        elif vehicle_status is not None:
+            missing = doc_type in vehicle_status.missing_types
         else:
-            has = False
-        if not has:
+            missing = True
+        if missing:
             summary['missing_types'].append(doc_type)
 
     summary['is_fully_compliant'] = (
-        len(summary['missing_types']) == 0 and summary.get('expired', 0) == 0
+        len(summary['missing_types']) == 0 and summary['expired'] == 0
     )
     return summary
 
@@ -357,6 +362,7 @@ def mark_verified(staff_user, document_id: int, notes=None) -> LegalDocument:
             })
 
     _expire_superseded_verified(document)
+    _reject_superseded_pending(document)
 
     clear_expiry_reminder_fields(document)
     document.status = DocumentStatus.VERIFIED
@@ -365,8 +371,8 @@ def mark_verified(staff_user, document_id: int, notes=None) -> LegalDocument:
     document.rejection_reason = None
     if notes is not None:
         document.notes = notes
+    # Saved after the sibling updates so its post_save refresh sees the final state.
     document.save()
-    _reject_superseded_pending(document)
     return document
 
 
@@ -436,22 +442,28 @@ def assert_vehicle_may_reactivate(vehicle: Vehicle):
 def mark_expired_documents(as_of_date=None) -> int:
     """Mark VERIFIED documents past expiry as EXPIRED. Returns count updated."""
     as_of = as_of_date or timezone.now().date()
-    return LegalDocument.objects.filter(
+    to_expire = LegalDocument.objects.filter(
         status=DocumentStatus.VERIFIED,
         expiry_date__lt=as_of,
-    ).update(status=DocumentStatus.EXPIRED)
+    )
+    subjects = list(to_expire.values_list('driver_id', 'vehicle_id').distinct())
+    count = to_expire.update(status=DocumentStatus.EXPIRED)
+    COMPLIANCE_JOB_RESULTS.inc(count, job='expire_documents', result='expired')
+    if count:
+        compliance_status_service.refresh_compliance_statuses(
+            driver_ids=[driver_id for driver_id, _ in subjects],
+            vehicle_ids=[vehicle_id for _, vehicle_id in subjects],
+        )
+        compliance_status_service.invalidate_fleet_summary_cache()
+    return count
 
 
 def is_vehicle_compliant(vehicle: Vehicle) -> dict:
-    """Current verified registration + commercial insurance (Phase 4B)."""
-    today = timezone.now().date()
-    has_registration = _vehicle_has_current_verified(
-        vehicle, DocumentType.VEHICLE_REGISTRATION, today=today,
-    )
-    has_insurance = _vehicle_has_current_verified(
-        vehicle, DocumentType.COMMERCIAL_INSURANCE, today=today,
-    )
-    blockers = get_vehicle_reactivation_blockers(vehicle)
+    """Current verified registration + commercial insurance (Phase 4B), from the status row."""
+    status_row = compliance_status_service.get_vehicle_status(vehicle.id)
+    has_registration = DocumentType.VEHICLE_REGISTRATION not in status_row.missing_types
+    has_insurance = DocumentType.COMMERCIAL_INSURANCE not in status_row.missing_types
+    blockers = list(status_row.blockers)
     return {
         'compliant': has_registration and has_insurance,
         'registration': has_registration,
@@ -507,6 +519,106 @@ def get_dispatch_eligibility_blockers(driver: Driver) -> list[str]:
     return blockers
 
 
+def current_assignments_by_driver(driver_ids, *, today) -> dict:
+    """driver_id -> open DriverVehicle row (same window as get_current_assignment)."""
+    rows = (
+        DriverVehicle.objects.filter(driver_id__in=driver_ids, assigned_from__lte=today)
+        .filter(Q(assigned_to__isnull=True) | Q(assigned_to__gt=today))
+        .select_related('vehicle')
+        .order_by('-assigned_from')
+    )
+    by_driver = {}
+    for row in rows:
+        by_driver.setdefault(row.driver_id, row)
+    return by_driver
+
+
+def get_dispatch_eligibility_for_drivers(driver_ids, *, today=None) -> dict[int, dict]:
+    """
+    Bulk twin of get_dispatch_eligibility_blockers for a dispatch board (Phase 4C).
+
+    Loads drivers, open assignments + vehicles and relevant legal documents in three
+    queries, then evaluates the same blocker rules in memory. Returns
+    ``{driver_id: {'eligible': bool, 'blockers': [...]}}``; unknown ids are omitted.
+    ``today`` (default: the current date) evaluates assignments and expiries on another day.
+    """
+    today = today or timezone.now().date()
+    drivers = list(Driver.objects.filter(id__in=set(driver_ids)))
+    if not drivers:
+        return {}
+    ids = [driver.id for driver in drivers]
+    assignments = current_assignments_by_driver(ids, today=today)
+    vehicle_ids = {row.vehicle_id for row in assignments.values() if row.vehicle_id}
+
+    docs_by_subject: dict[tuple, list] = {}
+    documents = LegalDocument.objects.filter(
+        Q(driver_id__in=ids, document_type=DocumentType.DRIVER_LICENSE)
+        | Q(
+            vehicle_id__in=vehicle_ids,
+            document_type__in=(
+                DocumentType.VEHICLE_REGISTRATION,
+                DocumentType.COMMERCIAL_INSURANCE,
+            ),
+        ),
+    ).only('id', 'document_type', 'driver_id', 'vehicle_id', 'status', 'expiry_date', 'coverage_type')
+    for doc in documents:
+        if doc.document_type == DocumentType.DRIVER_LICENSE:
+            key = ('driver', doc.driver_id, doc.document_type)
+        else:
+            key = ('vehicle', doc.vehicle_id, doc.document_type)
+        docs_by_subject.setdefault(key, []).append(doc)
+
+    results: dict[int, dict] = {}
+    for driver in drivers:
+        blockers: list[str] = []
+        if driver.approval_status == DriverApprovalStatus.PENDING:
+            blockers.append('driver_pending_approval')
+        elif driver.approval_status == DriverApprovalStatus.REJECTED:
+            blockers.append('driver_registration_rejected')
+        elif not driver.active:
+            blockers.append('driver_inactive')
+
+        assignment = assignments.get(driver.id)
+        vehicle = assignment.vehicle if assignment else None
+        if not vehicle:
+            blockers.append('no_vehicle_assigned')
+        elif vehicle.approval_status == 'PENDING':
+            blockers.append('vehicle_pending_approval')
+        elif vehicle.approval_status == 'RESUBMIT':
+            blockers.append('vehicle_resubmit_required')
+        elif vehicle.approval_status == 'REJECTED':
+            blockers.append('vehicle_rejected')
+        elif not vehicle.active:
+            blockers.append('vehicle_inactive')
+
+        license_blocker = subject_doc_blocker(
+            docs_by_subject.get(('driver', driver.id, DocumentType.DRIVER_LICENSE), ()),
+            today=today,
+            missing_code='driver_license_missing',
+            expired_code='driver_license_expired',
+        )
+        if license_blocker:
+            blockers.append(license_blocker)
+
+        if vehicle:
+            checks = (
+                (DocumentType.VEHICLE_REGISTRATION, 'vehicle_registration_missing', 'vehicle_registration_expired'),
+                (DocumentType.COMMERCIAL_INSURANCE, 'commercial_insurance_missing', 'commercial_insurance_expired'),
+            )
+            for doc_type, missing_code, expired_code in checks:
+                blocker = subject_doc_blocker(
+                    docs_by_subject.get(('vehicle', vehicle.id, doc_type), ()),
+                    today=today,
+                    missing_code=missing_code,
+                    expired_code=expired_code,
+                )
+                if blocker:
+                    blockers.append(blocker)
+
+        results[driver.id] = {'eligible': len(blockers) == 0, 'blockers': blockers}
+    return results
+
+
 def assert_driver_eligible_for_dispatch(driver: Driver):
     blockers = get_dispatch_eligibility_blockers(driver)
     if blockers:
@@ -644,18 +756,26 @@ def _driver_display_name(driver: Driver | None) -> str:
     return f'Driver #{driver.id}'
 
 
-def _serialize_admin_document_row(document: LegalDocument) -> dict:
+def _current_drivers_for_vehicles(vehicle_ids) -> dict[int, Driver]:
+    """vehicle_id -> driver on the vehicle's open assignment, in one query."""
+    if not vehicle_ids:
+        return {}
+    rows = (
+        DriverVehicle.objects.filter(vehicle_id__in=vehicle_ids, assigned_to__isnull=True)
+        .select_related('driver', 'driver__user')
+        .order_by('-assigned_from')
+    )
+    drivers: dict[int, Driver] = {}
+    for row in rows:
+        drivers.setdefault(row.vehicle_id, row.driver)
+    return drivers
+
+
+def _serialize_admin_document_row(document: LegalDocument, drivers_by_vehicle: dict) -> dict:
     driver = document.driver
     vehicle = document.vehicle
     if vehicle and not driver:
-        assignment = (
-            DriverVehicle.objects.filter(vehicle=vehicle, assigned_to__isnull=True)
-            .select_related('driver', 'driver__user')
-            .order_by('-assigned_from')
-            .first()
-        )
-        if assignment:
-            driver = assignment.driver
+        driver = drivers_by_vehicle.get(vehicle.id)
 
     return {
         'document_id': document.id,
@@ -672,41 +792,104 @@ def _serialize_admin_document_row(document: LegalDocument) -> dict:
     }
 
 
+def _serialize_admin_document_rows(documents) -> list[dict]:
+    documents = list(documents)
+    drivers_by_vehicle = _current_drivers_for_vehicles(
+        {doc.vehicle_id for doc in documents if doc.vehicle_id and not doc.driver_id},
+    )
+    return [_serialize_admin_document_row(doc, drivers_by_vehicle) for doc in documents]
+
+
+def _encode_admin_cursor(value, document_id: int) -> str:
+    raw = f'{value.isoformat() if value is not None else ""}|{document_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_admin_cursor(cursor: str, parse_value):
+    """Return ``(value, id)`` from an opaque admin-list cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        value, document_id = raw.rsplit('|', 1)
+        return (parse_value(value) if value else None), int(document_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValidationError({'cursor': 'Invalid cursor.'}) from exc
+
+
+def _page_admin_documents(documents, *, limit, cursor_field: str) -> dict:
+    """Slice an already keyset-filtered queryset into ``{'results', 'next_cursor'}``."""
+    limit = max(1, min(int(limit), ADMIN_LIST_MAX_LIMIT))
+    page = list(documents[:limit + 1])
+    has_next = len(page) > limit
+    page = page[:limit]
+    next_cursor = None
+    if has_next:
+        last = page[-1]
+        next_cursor = _encode_admin_cursor(getattr(last, cursor_field), last.id)
+    return {'results': _serialize_admin_document_rows(page), 'next_cursor': next_cursor}
+
+
 def get_fleet_compliance_summary(*, expiring_within_days: int = 30) -> dict:
-    """Fleet-wide compliance counts for admin dashboard (Phase 4D)."""
+    """Fleet-wide compliance counts for admin dashboard (Phase 4D).
+
+    One conditional aggregate per table, cached briefly per window; compliance and
+    driver-approval mutations invalidate the cache.
+    """
+    cached = cache.get(compliance_status_service.FLEET_SUMMARY_CACHE_KEY) or {}
+    if expiring_within_days in cached:
+        return cached[expiring_within_days]
+
     today = timezone.now().date()
     expiring_cutoff = today + timedelta(days=expiring_within_days)
 
-    return {
-        'documents_pending': LegalDocument.objects.filter(status=DocumentStatus.PENDING).count(),
-        'documents_expired': LegalDocument.objects.filter(status=DocumentStatus.EXPIRED).count(),
-        'documents_expiring_soon': LegalDocument.objects.filter(
+    summary = LegalDocument.objects.aggregate(
+        documents_pending=Count('id', filter=Q(status=DocumentStatus.PENDING)),
+        documents_expired=Count('id', filter=Q(status=DocumentStatus.EXPIRED)),
+        documents_expiring_soon=Count('id', filter=Q(
             status=DocumentStatus.VERIFIED,
             expiry_date__gte=today,
             expiry_date__lte=expiring_cutoff,
-        ).count(),
-        'drivers_pending_approval': Driver.objects.filter(
-            approval_status=DriverApprovalStatus.PENDING,
-        ).count(),
-        'drivers_rejected': Driver.objects.filter(
-            approval_status=DriverApprovalStatus.REJECTED,
-        ).count(),
-        'expiring_within_days': expiring_within_days,
-    }
+        )),
+    )
+    summary.update(Driver.objects.aggregate(
+        drivers_pending_approval=Count('id', filter=Q(approval_status=DriverApprovalStatus.PENDING)),
+        drivers_rejected=Count('id', filter=Q(approval_status=DriverApprovalStatus.REJECTED)),
+    ))
+    summary['expiring_within_days'] = expiring_within_days
+
+    cached[expiring_within_days] = summary
+    cache.set(
+        compliance_status_service.FLEET_SUMMARY_CACHE_KEY,
+        cached,
+        compliance_status_service.FLEET_SUMMARY_CACHE_SECONDS,
+    )
+    return summary
 
 
-def list_admin_compliance_inbox():
-    """Pending legal documents across all drivers/vehicles (Phase 4D)."""
-    documents = (
+def _admin_inbox_queryset():
+    return (
         LegalDocument.objects.filter(status=DocumentStatus.PENDING)
         .select_related('driver', 'driver__user', 'vehicle')
-        .order_by('created_at')
+        .order_by('created_at', 'id')
     )
-    return [_serialize_admin_document_row(doc) for doc in documents]
 
 
-def list_admin_expiring_documents(*, within_days: int = 30, include_expired: bool = True):
-    """Verified documents expiring soon or already expired (Phase 4D)."""
+def list_admin_compliance_inbox():
+    """Pending legal documents across all drivers/vehicles (Phase 4D)."""
+    return _serialize_admin_document_rows(_admin_inbox_queryset())
+
+
+def page_admin_compliance_inbox(*, cursor: str | None = None, limit: int = ADMIN_LIST_DEFAULT_LIMIT) -> dict:
+    """Keyset page of the inbox ordered by ``(created_at, id)``."""
+    documents = _admin_inbox_queryset()
+    if cursor:
+        created_at, document_id = _decode_admin_cursor(cursor, datetime.fromisoformat)
+        documents = documents.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=document_id),
+        )
+    return _page_admin_documents(documents, limit=limit, cursor_field='created_at')
+
+
+def _admin_expiring_queryset(*, within_days: int, include_expired: bool):
     today = timezone.now().date()
     expiring_cutoff = today + timedelta(days=within_days)
 
@@ -722,9 +905,37 @@ def list_admin_expiring_documents(*, within_days: int = 30, include_expired: boo
             expiry_date__lte=expiring_cutoff,
         )
 
-    documents = (
+    return (
         LegalDocument.objects.filter(status_filter)
         .select_related('driver', 'driver__user', 'vehicle')
-        .order_by('expiry_date', 'document_type')
+        .order_by(F('expiry_date').asc(nulls_last=True), 'id')
     )
-    return [_serialize_admin_document_row(doc) for doc in documents]
+
+
+def list_admin_expiring_documents(*, within_days: int = 30, include_expired: bool = True):
+    """Verified documents expiring soon or already expired (Phase 4D)."""
+    return _serialize_admin_document_rows(
+        _admin_expiring_queryset(within_days=within_days, include_expired=include_expired),
+    )
+
+
+def page_admin_expiring_documents(
+    *,
+    within_days: int = 30,
+    include_expired: bool = True,
+    cursor: str | None = None,
+    limit: int = ADMIN_LIST_DEFAULT_LIMIT,
+) -> dict:
+    """Keyset page of expiring documents ordered by ``(expiry_date, id)``, undated last."""
+    documents = _admin_expiring_queryset(within_days=within_days, include_expired=include_expired)
+    if cursor:
+        expiry_date, document_id = _decode_admin_cursor(cursor, date.fromisoformat)
+        if expiry_date is None:
+            documents = documents.filter(expiry_date__isnull=True, id__gt=document_id)
+        else:
+            documents = documents.filter(
+                Q(expiry_date__gt=expiry_date)
+                | Q(expiry_date=expiry_date, id__gt=document_id)
+                | Q(expiry_date__isnull=True),
+            )
+    return _page_admin_documents(documents, limit=limit, cursor_field='expiry_date')
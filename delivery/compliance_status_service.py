@@ -0,0 +1,305 @@
+"""Materialized per-driver / per-vehicle compliance status (Phase 4D read model).
+
+LegalDocument post_save/post_delete receivers refresh the affected subject row, whoever
+writes the document (services, admin, shell); bulk ``queryset.update()`` callers refresh
+explicitly and the nightly reconcile repairs anything else. Reads never write: a row that
+is missing or whose ``computed_on`` is not today is recomputed in memory, so date-driven
+flags never go stale across midnight.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .compliance_constants import CoverageType, DocumentStatus, DocumentType
+from .models import ComplianceStatus, Driver, LegalDocument, Vehicle
+
+EXPIRING_SOON_DAYS = 30
+
+# Admin dashboard polls the fleet summary; all ``expiring_within_days`` variants share one
+# key ({days: summary}) so a warm read is a single cache get and any compliance mutation
+# drops them together.
+FLEET_SUMMARY_CACHE_SECONDS = 30
+FLEET_SUMMARY_CACHE_KEY = 'compliance:fleet_summary'
+
+DRIVER_REQUIRED_TYPES = (DocumentType.DRIVER_LICENSE,)
+VEHICLE_REQUIRED_TYPES = (
+    DocumentType.VEHICLE_REGISTRATION,
+    DocumentType.COMMERCIAL_INSURANCE,
+)
+
+# doc_type -> (missing_code, expired_code); same codes as dispatch/reactivation blockers.
+BLOCKER_CODES = {
+    DocumentType.DRIVER_LICENSE: ('driver_license_missing', 'driver_license_expired'),
+    DocumentType.VEHICLE_REGISTRATION: ('vehicle_registration_missing', 'vehicle_registration_expired'),
+    DocumentType.COMMERCIAL_INSURANCE: ('commercial_insurance_missing', 'commercial_insurance_expired'),
+}
+
+STATUS_FIELDS = (
+    'pending_count',
+    'verified_count',
+    'rejected_count',
+    'expired_count',
+    'expiring_soon_count',
+    'missing_types',
+    'blockers',
+    'has_missing_docs',
+    'has_expired_docs',
+    'has_expiring_docs',
+    'has_verified_registration',
+    'is_fully_compliant',
+    'computed_on',
+)
+
+
+def doc_is_current_verified(doc: LegalDocument, *, today) -> bool:
+    """Verified, carries an expiry on/after today, and (insurance) commercial coverage."""
+    if doc.status != DocumentStatus.VERIFIED or not doc.expiry_date or doc.expiry_date < today:
+        return False
+    if doc.document_type == DocumentType.COMMERCIAL_INSURANCE:
+        return doc.coverage_type == CoverageType.COMMERCIAL
+    return True
+
+
+def doc_is_expired(doc: LegalDocument, *, today) -> bool:
+    if doc.status == DocumentStatus.EXPIRED:
+        return True
+    return (
+        doc.status == DocumentStatus.VERIFIED
+        and doc.expiry_date is not None
+        and doc.expiry_date < today
+    )
+
+
+def subject_doc_blocker(docs, *, today, missing_code: str, expired_code: str) -> str | None:
+    """In-memory twin of the verified/expired `.exists()` checks for one subject + type."""
+    if any(doc_is_current_verified(doc, today=today) for doc in docs):
+        return None
+    if any(doc_is_expired(doc, today=today) for doc in docs):
+        return expired_code
+    return missing_code
+
+
+def compute_subject_status(docs, *, required_types, today) -> dict:
+    """Status field values for one subject's documents."""
+    expiring_cutoff = today + timedelta(days=EXPIRING_SOON_DAYS)
+    counts = {status: 0 for status in DocumentStatus.values}
+    expiring_soon = 0
+    has_verified_registration = False
+    by_type: dict[str, list] = {}
+    for doc in docs:
+        counts[doc.status] = counts.get(doc.status, 0) + 1
+        by_type.setdefault(doc.document_type, []).append(doc)
+        if doc.status == DocumentStatus.VERIFIED:
+            if doc.expiry_date and today <= doc.expiry_date <= expiring_cutoff:
+                expiring_soon += 1
+            if doc.document_type == DocumentType.VEHICLE_REGISTRATION:
+                has_verified_registration = True
+
+    missing_types: list[str] = []
+    blockers: list[str] = []
+    for doc_type in required_types:
+        missing_code, expired_code = BLOCKER_CODES[doc_type]
+        blocker = subject_doc_blocker(
+            by_type.get(doc_type, ()),
+            today=today,
+            missing_code=missing_code,
+            expired_code=expired_code,
+        )
+        if blocker:
+            missing_types.append(str(doc_type))
+            blockers.append(blocker)
+
+    expired_count = counts[DocumentStatus.EXPIRED]
+    return {
+        'pending_count': counts[DocumentStatus.PENDING],
+        'verified_count': counts[DocumentStatus.VERIFIED],
+        'rejected_count': counts[DocumentStatus.REJECTED],
+        'expired_count': expired_count,
+        'expiring_soon_count': expiring_soon,
+        'missing_types': missing_types,
+        'blockers': blockers,
+        'has_missing_docs': bool(missing_types),
+        'has_expired_docs': expired_count > 0,
+        'has_expiring_docs': expiring_soon > 0,
+        'has_verified_registration': has_verified_registration,
+        'is_fully_compliant': not missing_types and expired_count == 0,
+        'computed_on': today,
+    }
+
+
+def _compute_statuses(*, driver_ids, vehicle_ids, today) -> tuple[dict, dict]:
+    """Load all documents for the given subjects in one query and compute their rows."""
+    driver_docs: dict[int, list] = {driver_id: [] for driver_id in driver_ids}
+    vehicle_docs: dict[int, list] = {vehicle_id: [] for vehicle_id in vehicle_ids}
+    if not driver_docs and not vehicle_docs:
+        return {}, {}
+    documents = LegalDocument.objects.filter(
+        Q(driver_id__in=driver_docs.keys()) | Q(vehicle_id__in=vehicle_docs.keys()),
+    ).only('id', 'document_type', 'driver_id', 'vehicle_id', 'status', 'expiry_date', 'coverage_type')
+    for doc in documents:
+        if doc.driver_id in driver_docs:
+            driver_docs[doc.driver_id].append(doc)
+        elif doc.vehicle_id in vehicle_docs:
+            vehicle_docs[doc.vehicle_id].append(doc)
+    return (
+        {
+            driver_id: compute_subject_status(docs, required_types=DRIVER_REQUIRED_TYPES, today=today)
+            for driver_id, docs in driver_docs.items()
+        },
+        {
+            vehicle_id: compute_subject_status(docs, required_types=VEHICLE_REQUIRED_TYPES, today=today)
+            for vehicle_id, docs in vehicle_docs.items()
+        },
+    )
+
+
+def _upsert(values_by_subject: dict, *, subject_field: str) -> None:
+    if not values_by_subject:
+        return
+    rows = [
+        ComplianceStatus(**{f'{subject_field}_id': subject_id}, **values)
+        for subject_id, values in values_by_subject.items()
+    ]
+    ComplianceStatus.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=[subject_field],
+        update_fields=[*STATUS_FIELDS, 'updated_at'],
+    )
+
+
+def invalidate_fleet_summary_cache() -> None:
+    """Drop every cached fleet summary (all ``expiring_within_days`` variants)."""
+    cache.delete(FLEET_SUMMARY_CACHE_KEY)
+
+
+def refresh_compliance_statuses(*, driver_ids=(), vehicle_ids=(), today=None) -> int:
+    """Recompute and store status rows for the given subjects. Returns rows written."""
+    today = today or timezone.now().date()
+    driver_values, vehicle_values = _compute_statuses(
+        driver_ids=set(driver_ids) - {None},
+        vehicle_ids=set(vehicle_ids) - {None},
+        today=today,
+    )
+    _upsert(driver_values, subject_field='driver')
+    _upsert(vehicle_values, subject_field='vehicle')
+    return len(driver_values) + len(vehicle_values)
+
+
+def refresh_status_for_document(document: LegalDocument) -> None:
+    """Refresh the subject (driver or vehicle) a document belongs to."""
+    refresh_compliance_statuses(
+        driver_ids=[document.driver_id],
+        vehicle_ids=[document.vehicle_id],
+    )
+    invalidate_fleet_summary_cache()
+
+
+# Fields a document save must touch to change its subject's status.
+STATUS_INPUT_FIELDS = frozenset({
+    'document_type', 'status', 'expiry_date', 'coverage_type', 'driver', 'driver_id', 'vehicle', 'vehicle_id',
+})
+
+
+def refresh_status_on_document_save(sender=None, instance=None, update_fields=None, **kwargs) -> None:
+    """LegalDocument post_save receiver."""
+    if update_fields is not None and not STATUS_INPUT_FIELDS & set(update_fields):
+        return  # e.g. reminder bookkeeping
+    refresh_status_for_document(instance)
+
+
+def refresh_status_on_document_delete(sender=None, instance=None, origin=None, **kwargs) -> None:
+    """LegalDocument post_delete receiver; cascades from a deleted driver/vehicle are skipped."""
+    if isinstance(origin, LegalDocument) or getattr(origin, 'model', None) is LegalDocument:
+        refresh_status_for_document(instance)
+
+
+def get_subject_statuses(*, driver_id=None, vehicle_id=None) -> tuple:
+    """
+    Return ``(driver_status, vehicle_status)`` in one query. Missing or stale rows are
+    recomputed in memory and returned unsaved. Either side is None when its id is None.
+    """
+    today = timezone.now().date()
+    query = Q()
+    if driver_id is not None:
+        query |= Q(driver_id=driver_id)
+    if vehicle_id is not None:
+        query |= Q(vehicle_id=vehicle_id)
+    if not query:
+        return None, None
+    rows = list(ComplianceStatus.objects.filter(query))
+    driver_status = next((row for row in rows if row.driver_id == driver_id), None) if driver_id else None
+    vehicle_status = next((row for row in rows if row.vehicle_id == vehicle_id), None) if vehicle_id else None
+
+    stale_driver = driver_id is not None and (driver_status is None or driver_status.computed_on != today)
+    stale_vehicle = vehicle_id is not None and (vehicle_status is None or vehicle_status.computed_on != today)
+    if stale_driver or stale_vehicle:
+        driver_values, vehicle_values = _compute_statuses(
+            driver_ids=[driver_id] if stale_driver else (),
+            vehicle_ids=[vehicle_id] if stale_vehicle else (),
+            today=today,
+        )
+        if stale_driver:
+            driver_status = ComplianceStatus(driver_id=driver_id, **driver_values[driver_id])
+        if stale_vehicle:
+            vehicle_status = ComplianceStatus(vehicle_id=vehicle_id, **vehicle_values[vehicle_id])
+    return driver_status, vehicle_status
+
+
+def get_vehicle_status(vehicle_id: int) -> ComplianceStatus:
+    return get_subject_statuses(vehicle_id=vehicle_id)[1]
+
+
+def get_vehicle_statuses(vehicle_ids) -> dict[int, ComplianceStatus]:
+    """Bulk get_vehicle_status for a page of vehicles: at most two queries, whatever the size."""
+    today = timezone.now().date()
+    ids = set(vehicle_ids)
+    statuses = {
+        row.vehicle_id: row
+        for row in ComplianceStatus.objects.filter(vehicle_id__in=ids, computed_on=today)
+    }
+    _, computed = _compute_statuses(driver_ids=(), vehicle_ids=ids - statuses.keys(), today=today)
+    statuses.update(
+        (vehicle_id, ComplianceStatus(vehicle_id=vehicle_id, **values))
+        for vehicle_id, values in computed.items()
+    )
+    return statuses
+
+
+def reconcile_compliance_statuses(*, dry_run: bool = False, batch_size: int = 500) -> dict:
+    """
+    Nightly repair: recompute every driver and vehicle row, write only those that drifted.
+
+    Returns counts of subjects checked and rows repaired (or that would be, on dry run).
+    """
+    today = timezone.now().date()
+    checked = 0
+    repaired = 0
+    for subject_field, model in (('driver', Driver), ('vehicle', Vehicle)):
+        subject_ids = list(model.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(subject_ids), batch_size):
+            batch = subject_ids[start:start + batch_size]
+            if subject_field == 'driver':
+                computed, _ = _compute_statuses(driver_ids=batch, vehicle_ids=(), today=today)
+            else:
+                _, computed = _compute_statuses(driver_ids=(), vehicle_ids=batch, today=today)
+            existing = {
+                getattr(row, f'{subject_field}_id'): row
+                for row in ComplianceStatus.objects.filter(**{f'{subject_field}_id__in': batch})
+            }
+            drifted = {
+                subject_id: values
+                for subject_id, values in computed.items()
+                if subject_id not in existing
+                or any(getattr(existing[subject_id], field) != values[field] for field in STATUS_FIELDS)
+            }
+            checked += len(computed)
+            repaired += len(drifted)
+            if not dry_run:
+                _upsert(drifted, subject_field=subject_field)
+    if repaired and not dry_run:
+        invalidate_fleet_summary_cache()
+    return {'checked': checked, 'repaired': repaired, 'as_of_date': today}
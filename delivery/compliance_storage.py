@@ -6,6 +6,8 @@ import uuid
 
 from rest_framework.exceptions import ValidationError
 
+from DeliveryAppBackend.metrics import S3_OPERATION_DURATION
+
 COMPLIANCE_STAGING_PREFIX = 'compliance/staging'
 ALLOWED_UPLOAD_CONTENT_TYPES = frozenset({'application/pdf'})
 MAX_COMPLIANCE_FILE_BYTES = 10 * 1024 * 1024
@@ -112,28 +114,30 @@ def assert_file_key_owned_by_user(user_id: int, file_key: str | None) -> None:
 def generate_presigned_put_url(*, file_key: str, content_type: str) -> str:
     config = get_storage_config()
     client = _get_s3_client()
-    return client.generate_presigned_url(
-        ClientMethod='put_object',
-        Params={
-            'Bucket': config['bucket'],
-            'Key': file_key,
-            'ContentType': content_type,
-        },
-        ExpiresIn=PRESIGNED_UPLOAD_EXPIRES_SECONDS,
-    )
+    with S3_OPERATION_DURATION.time(operation='presign_put'):
+        return client.generate_presigned_url(
+            ClientMethod='put_object',
+            Params={
+                'Bucket': config['bucket'],
+                'Key': file_key,
+                'ContentType': content_type,
+            },
+            ExpiresIn=PRESIGNED_UPLOAD_EXPIRES_SECONDS,
+        )
 
 
 def generate_presigned_get_url(*, file_key: str) -> str:
     config = get_storage_config()
     client = _get_s3_client()
-    return client.generate_presigned_url(
-        ClientMethod='get_object',
-        Params={
-            'Bucket': config['bucket'],
-            'Key': file_key,
-        },
-        ExpiresIn=PRESIGNED_DOWNLOAD_EXPIRES_SECONDS,
-    )
+    with S3_OPERATION_DURATION.time(operation='presign_get'):
+        return client.generate_presigned_url(
+            ClientMethod='get_object',
+            Params={
+                'Bucket': config['bucket'],
+                'Key': file_key,
+            },
+            ExpiresIn=PRESIGNED_DOWNLOAD_EXPIRES_SECONDS,
+        )
 
 
 def upload_staging_object(
@@ -157,12 +161,13 @@ def upload_staging_object(
     file_key = build_staging_file_key(user_id, safe_name)
     config = get_storage_config()
     client = _get_s3_client()
-    client.put_object(
-        Bucket=config['bucket'],
-        Key=file_key,
-        Body=file_body,
-        ContentType=normalized_type,
-    )
+    with S3_OPERATION_DURATION.time(operation='upload'):
+        client.put_object(
+            Bucket=config['bucket'],
+            Key=file_key,
+            Body=file_body,
+            ContentType=normalized_type,
+        )
     return {
         'file_key': file_key,
         'file_name': safe_name,
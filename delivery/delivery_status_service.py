@@ -0,0 +1,142 @@
+"""
+Delivery status lifecycle (Phase 4C): the transition table and race-free status writes.
+
+Every status change is a conditional ``UPDATE ... WHERE status = <allowed source>``; rows are
+never read before they are written, so two concurrent transitions cannot both apply. The
+update stamps the changed rows with the request's batch id, which is how they (and their
+DeliveryStatusEvent audit rows, written with bulk_create) are found afterwards.
+"""
+import logging
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status as http_status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Delivery, DeliveryStatusEvent
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'Pending'
+EN_ROUTE = 'En Route'
+COMPLETED = 'Completed'
+CANCELLED = 'Cancelled'
+
+TRANSITIONS = {
+    PENDING: (EN_ROUTE, CANCELLED),
+    EN_ROUTE: (COMPLETED, CANCELLED),
+    COMPLETED: (),
+    CANCELLED: (),
+}
+
+MAX_BULK_TRANSITION = 10000
+UPDATE_CHUNK_SIZE = 500  # ids per conditional UPDATE (keeps IN lists within backend limits)
+
+SKIPPED_NOT_FOUND = 'not_found'
+SKIPPED_INVALID_TRANSITION = 'invalid_transition'
+
+
+class DeliveryStatusConflict(APIException):
+    status_code = http_status.HTTP_409_CONFLICT
+    default_detail = 'The delivery status changed since it was read; reload and retry.'
+    default_code = 'status_conflict'
+
+
+def allowed_sources(to_status: str) -> tuple:
+    """Statuses that may move to ``to_status``."""
+    return tuple(source for source, targets in TRANSITIONS.items() if to_status in targets)
+
+
+def transition_deliveries(delivery_ids, to_status, *, user=None, from_status=None, reason='', queryset=None) -> dict:
+    """
+    Move every listed delivery whose current status allows it to ``to_status``.
+
+    ``from_status`` narrows the sources (e.g. only close out En Route deliveries);
+    ``queryset`` scopes which deliveries the caller may touch. Deliveries that are missing
+    or in a status that cannot make the transition are reported under ``skipped``.
+    """
+    if to_status not in TRANSITIONS:
+        raise ValidationError({'status': f'Unknown delivery status "{to_status}".'})
+    sources = allowed_sources(to_status)
+    if from_status is not None:
+        sources = tuple(source for source in sources if source == from_status)
+    if not sources:
+        raise ValidationError({'status': f'No delivery can move from {from_status or "any status"} to {to_status}.'})
+    if queryset is None:
+        queryset = Delivery.objects.all()
+
+    ids = list(dict.fromkeys(delivery_ids))
+    batch_id = uuid.uuid4()
+    now = timezone.now()
+    changed = {}  # delivery id -> from status
+    with transaction.atomic():
+        for start in range(0, len(ids), UPDATE_CHUNK_SIZE):
+            chunk = ids[start:start + UPDATE_CHUNK_SIZE]
+            for source in sources:
+                updated = queryset.filter(id__in=chunk, status=source).update(
+                    status=to_status, status_batch=batch_id, updated_at=now,
+                )
+                if updated:
+                    stamped = queryset.filter(id__in=chunk, status_batch=batch_id).values_list('id', flat=True)
+                    for delivery_id in stamped:
+                        changed.setdefault(delivery_id, source)
+        DeliveryStatusEvent.objects.bulk_create(
+            [
+                DeliveryStatusEvent(
+                    delivery_id=delivery_id,
+                    from_status=source,
+                    to_status=to_status,
+                    batch_id=batch_id,
+                    changed_by=user,
+                    reason=reason,
+                )
+                for delivery_id, source in changed.items()
+            ],
+            batch_size=UPDATE_CHUNK_SIZE,
+        )
+
+    missing = [delivery_id for delivery_id in ids if delivery_id not in changed]
+    current = {}
+    for start in range(0, len(missing), UPDATE_CHUNK_SIZE):
+        current.update(
+            queryset.filter(id__in=missing[start:start + UPDATE_CHUNK_SIZE]).values_list('id', 'status')
+        )
+    logger.info(
+        'Delivery status batch %s -> %s: %s transitioned, %s skipped',
+        batch_id, to_status, len(changed), len(missing),
+    )
+    return {
+        'batch_id': str(batch_id),
+        'status': to_status,
+        'transitioned': [
+            {'delivery_id': delivery_id, 'from_status': source}
+            for delivery_id, source in changed.items()
+        ],
+        'skipped': [
+            {
+                'delivery_id': delivery_id,
+                'status': current.get(delivery_id),
+                'reason': SKIPPED_INVALID_TRANSITION if delivery_id in current else SKIPPED_NOT_FOUND,
+            }
+            for delivery_id in missing
+        ],
+    }
+
+
+def transition_delivery(delivery, to_status, *, user=None, from_status=None, reason=''):
+    """
+    Single-delivery transition from the status the caller read (``delivery.status``).
+
+    Raises ValidationError when that status cannot move to ``to_status`` and
+    DeliveryStatusConflict when another request changed the status in the meantime.
+    """
+    expected = from_status or delivery.status
+    if to_status not in TRANSITIONS.get(expected, ()):
+        raise ValidationError({'status': f'A {expected} delivery cannot move to {to_status}.'})
+    result = transition_deliveries([delivery.pk], to_status, user=user, from_status=expected, reason=reason)
+    if not result['transitioned']:
+        raise DeliveryStatusConflict()
+    delivery.status = to_status
+    delivery.refresh_from_db(fields=['status_batch', 'updated_at'])
+    return delivery
@@ -0,0 +1,172 @@
+"""
+Automatic dispatch (Phase 4C): plan a day's Pending deliveries onto eligible drivers.
+
+One call loads the unassigned deliveries for the date, the drivers dispatch-eligible on that
+date with the vehicles assigned to them then (same blocker rules as the dispatch board) and
+each driver's existing assignments that day, matches them greedily and writes DeliveryAssignment rows with a
+single bulk_create inside one transaction.
+"""
+import logging
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from .compliance_service import current_assignments_by_driver, get_dispatch_eligibility_for_drivers
+from .models import Delivery, DeliveryAssignment, Driver, DriverApprovalStatus
+from .vehicle_catalog_cache import LB_TO_KG, get_model_spec_index
+from .vehicle_constants import MAX_VEHICLE_CAPACITY_KG
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DELIVERIES_PER_DRIVER = 8
+
+UNASSIGNED_NO_ELIGIBLE_DRIVER = 'no_eligible_driver'
+UNASSIGNED_DRIVER_LIMIT_REACHED = 'driver_limit_reached'
+UNASSIGNED_EXCEEDS_CAPACITY = 'exceeds_vehicle_capacity'
+
+
+@dataclass
+class DispatchCandidate:
+    driver_id: int
+    vehicle_id: int
+    capacity_kg: int
+    assigned: int  # deliveries on the plan date: already assigned + planned in this run
+
+
+def vehicle_capacity_kg(vehicle) -> int:
+    """Declared capacity in kg, capped by the catalog spec payload (fleet cap without a spec)."""
+    declared = vehicle.capacity * LB_TO_KG if vehicle.capacity_unit == 'lb' else vehicle.capacity
+    spec = get_model_spec_index().get(vehicle.model_spec_id) if vehicle.model_spec_id else None
+    limit = spec.max_capacity_kg if spec else MAX_VEHICLE_CAPACITY_KG
+    return int(min(declared, limit))
+
+
+def load_dispatch_candidates(plan_date) -> list[DispatchCandidate]:
+    """
+    Drivers eligible on ``plan_date`` with the capacity of the vehicle assigned to them that
+    day and their assignment count; documents expiring before then block the driver.
+    """
+    driver_ids = list(
+        Driver.objects.filter(active=True, approval_status=DriverApprovalStatus.APPROVED)
+        .values_list('id', flat=True)
+    )
+    eligibility = get_dispatch_eligibility_for_drivers(driver_ids, today=plan_date)
+    eligible_ids = [driver_id for driver_id, result in eligibility.items() if result['eligible']]
+    if not eligible_ids:
+        return []
+    assignments = current_assignments_by_driver(eligible_ids, today=plan_date)
+    booked = dict(
+        DeliveryAssignment.objects.filter(driver_id__in=eligible_ids, delivery__delivery_date=plan_date)
+        .values_list('driver_id')
+        .annotate(total=Count('id'))
+    )
+    return [
+        DispatchCandidate(
+            driver_id=driver_id,
+            vehicle_id=assignments[driver_id].vehicle_id,
+            capacity_kg=vehicle_capacity_kg(assignments[driver_id].vehicle),
+            assigned=booked.get(driver_id, 0),
+        )
+        for driver_id in sorted(eligible_ids)
+    ]
+
+
+def _pick(candidates, load_kg, max_per_driver):
+    """(candidate, None) or (None, reason): least-loaded driver, then best capacity fit."""
+    available = [c for c in candidates if c.assigned < max_per_driver]
+    if not available:
+        return None, UNASSIGNED_DRIVER_LIMIT_REACHED
+    if load_kg is not None:
+        available = [c for c in available if c.capacity_kg >= load_kg]
+        if not available:
+            return None, UNASSIGNED_EXCEEDS_CAPACITY
+        # Smallest vehicle that fits keeps the big trucks free for heavy loads.
+        return min(available, key=lambda c: (c.assigned, c.capacity_kg, c.driver_id)), None
+    return min(available, key=lambda c: (c.assigned, -c.capacity_kg, c.driver_id)), None
+
+
+def plan_dispatch(deliveries, candidates, *, loads_kg=None, max_per_driver) -> tuple[list, list]:
+    """
+    Greedy matching, heaviest known loads first: ``([(delivery, candidate)], [(delivery, reason)])``.
+
+    ``candidates`` are updated in place as deliveries are planned onto them.
+    """
+    loads_kg = loads_kg or {}
+    planned, unassigned = [], []
+    ordered = sorted(deliveries, key=lambda d: -loads_kg.get(d.id, 0))
+    for delivery in ordered:
+        if not candidates:
+            unassigned.append((delivery, UNASSIGNED_NO_ELIGIBLE_DRIVER))
+            continue
+        candidate, reason = _pick(candidates, loads_kg.get(delivery.id), max_per_driver)
+        if candidate is None:
+            unassigned.append((delivery, reason))
+            continue
+        candidate.assigned += 1
+        planned.append((delivery, candidate))
+    return planned, unassigned
+
+
+def auto_dispatch(plan_date, *, delivery_ids=None, loads_kg=None, max_per_driver=None, dry_run=False) -> dict:
+    """
+    Assign ``plan_date``'s Pending, unassigned deliveries (optionally only ``delivery_ids``).
+
+    ``loads_kg`` maps delivery id -> load; deliveries with a load only go to vehicles that can
+    carry it. With ``dry_run`` nothing is written.
+    """
+    if max_per_driver is None:
+        max_per_driver = getattr(settings, 'DISPATCH_MAX_DELIVERIES_PER_DRIVER', DEFAULT_MAX_DELIVERIES_PER_DRIVER)
+    queryset = (
+        Delivery.objects.filter(status='Pending', delivery_date=plan_date)
+        .exclude(id__in=DeliveryAssignment.objects.values('delivery_id'))
+        .order_by(F('delivery_time').asc(nulls_last=True), 'id')
+        .only('id', 'delivery_time')
+    )
+    if delivery_ids is not None:
+        queryset = queryset.filter(id__in=delivery_ids)
+
+    with transaction.atomic():
+        deliveries = list(queryset.select_for_update())
+        if deliveries:
+            # The exclude() above reads the statement's snapshot, taken before waiting on the
+            # row locks: a concurrent run that committed meanwhile is only visible to a new query.
+            taken = set(
+                DeliveryAssignment.objects.filter(delivery_id__in=[d.id for d in deliveries])
+                .values_list('delivery_id', flat=True)
+            )
+            deliveries = [d for d in deliveries if d.id not in taken]
+        candidates = load_dispatch_candidates(plan_date) if deliveries else []
+        planned, unassigned = plan_dispatch(
+            deliveries, candidates, loads_kg=loads_kg, max_per_driver=max_per_driver,
+        )
+        rows = [
+            DeliveryAssignment(delivery=delivery, driver_id=candidate.driver_id, vehicle_id=candidate.vehicle_id)
+            for delivery, candidate in planned
+        ]
+        if rows and not dry_run:
+            DeliveryAssignment.objects.bulk_create(rows)
+
+    logger.info(
+        'Auto dispatch %s: %s assigned, %s unassigned, %s eligible drivers%s',
+        plan_date, len(rows), len(unassigned), len(candidates), ' (dry run)' if dry_run else '',
+    )
+    return {
+        'date': plan_date.isoformat(),
+        'dry_run': dry_run,
+        'eligible_drivers': len(candidates),
+        'assigned': [
+            {
+                'delivery_id': row.delivery_id,
+                'driver_id': row.driver_id,
+                'vehicle_id': row.vehicle_id,
+                'assignment_id': row.pk,
+            }
+            for row in rows
+        ],
+        'unassigned': [
+            {'delivery_id': delivery.id, 'reason': reason}
+            for delivery, reason in unassigned
+        ],
+    }
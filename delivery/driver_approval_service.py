@@ -3,6 +3,7 @@
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
+from .compliance_status_service import invalidate_fleet_summary_cache
 from .models import Driver, DriverApprovalStatus
 from .staff_constants import PERM_DRIVERS_APPROVE
 from .staff_permissions import require_staff_permission
@@ -25,6 +26,7 @@ def approve_driver(staff_user, driver: Driver) -> Driver:
         'approved_at',
         'approved_by',
     ])
+    invalidate_fleet_summary_cache()
     return driver
 
 
@@ -45,4 +47,5 @@ def reject_driver(staff_user, driver: Driver, *, reason: str) -> Driver:
         'approved_at',
         'approved_by',
     ])
+    invalidate_fleet_summary_cache()
     return driver
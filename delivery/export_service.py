@@ -0,0 +1,185 @@
+"""
+Staff data exports streamed as NDJSON or CSV.
+
+Rows come from ``values()`` projections read with ``.iterator(chunk_size=...)`` and are
+encoded one chunk at a time, so memory stays flat however many rows match and no model
+instances or serializers are built.
+"""
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.exceptions import ValidationError
+
+from .compliance_constants import DocumentStatus, DocumentType
+from .models import Delivery, DriverApprovalStatus, LegalDocument
+from .permissions import scope_delivery_queryset, scope_driver_queryset
+from .staff_constants import PERM_COMPLIANCE_VIEW, PERM_DELIVERIES_VIEW, PERM_DRIVERS_VIEW
+
+EXPORT_FORMAT_NDJSON = 'ndjson'
+EXPORT_FORMAT_CSV = 'csv'
+EXPORT_CONTENT_TYPES = {
+    EXPORT_FORMAT_NDJSON: 'application/x-ndjson',
+    EXPORT_FORMAT_CSV: 'text/csv; charset=utf-8',
+}
+DEFAULT_EXPORT_CHUNK_SIZE = 2000
+# Spreadsheet apps evaluate cells starting with these as formulas; such text is quoted with '
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """
+    One exportable dataset: scoped base queryset, projected columns, the lookup behind
+    ``date_from`` / ``date_to`` and ``(query param, field, allowed values)`` choice filters.
+    """
+
+    name: str
+    permission: str
+    scope: Callable
+    fields: tuple[str, ...]
+    date_lookup: str
+    choice_filters: tuple[tuple[str, str, tuple[str, ...]], ...]
+
+
+DELIVERY_EXPORT = ExportSpec(
+    name='deliveries',
+    permission=PERM_DELIVERIES_VIEW,
+    scope=scope_delivery_queryset,
+    fields=(
+        'id', 'customer_id', 'customer__company_name', 'pickup_location', 'dropoff_location',
+        'item_description', 'status', 'delivery_date', 'delivery_time', 'estimated_cost',
+        'created_at', 'updated_at',
+    ),
+    date_lookup='created_at__date',
+    choice_filters=(('status', 'status', tuple(value for value, _ in Delivery.STATUS_CHOICES)),),
+)
+
+DRIVER_EXPORT = ExportSpec(
+    name='drivers',
+    permission=PERM_DRIVERS_VIEW,
+    scope=scope_driver_queryset,
+    fields=(
+        'id', 'user_id', 'user__username', 'user__email', 'first_name', 'last_name',
+        'phone_number', 'address_city', 'address_state', 'address_country', 'license_number',
+        'license_issuing_region', 'active', 'approval_status', 'approved_at',
+    ),
+    date_lookup='approved_at__date',
+    choice_filters=(('status', 'approval_status', tuple(DriverApprovalStatus.values)),),
+)
+
+DOCUMENT_EXPORT = ExportSpec(
+    name='documents',
+    permission=PERM_COMPLIANCE_VIEW,
+    scope=lambda user: LegalDocument.objects.all(),
+    fields=(
+        'id', 'document_type', 'driver_id', 'vehicle_id', 'vehicle__license_plate', 'status',
+        'policy_number', 'issuer', 'coverage_type', 'effective_date', 'expiry_date',
+        'verified_at', 'created_at',
+    ),
+    date_lookup='expiry_date',
+    choice_filters=(
+        ('status', 'status', tuple(DocumentStatus.values)),
+        ('document_type', 'document_type', tuple(DocumentType.values)),
+    ),
+)
+
+
+def _parse_date(params, name: str) -> date | None:
+    raw = params.get(name)
+    if not raw:
+        return None
+    try:
+        return date.fromisoformat(raw)
+    except ValueError:
+        raise ValidationError({name: 'Use YYYY-MM-DD.'})
+
+
+def _parse_choices(params, name: str, choices) -> list[str]:
+    raw = params.get(name)
+    if not raw:
+        return []
+    values = [value.strip() for value in raw.split(',') if value.strip()]
+    unknown = sorted(set(values) - set(choices))
+    if unknown:
+        raise ValidationError({name: f'Unknown value(s): {", ".join(unknown)}.'})
+    return values
+
+
+def parse_export_format(params) -> str:
+    export_format = params.get('export_format', EXPORT_FORMAT_NDJSON).lower()
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise ValidationError({'export_format': f'Use one of: {", ".join(EXPORT_CONTENT_TYPES)}.'})
+    return export_format
+
+
+def build_export_queryset(spec: ExportSpec, user, params):
+    """
+    ``spec.scope(user)`` narrowed by the spec's choice filters (comma-separated values) and
+    ``date_from`` / ``date_to`` (inclusive, on ``spec.date_lookup``).
+    """
+    queryset = spec.scope(user)
+    for param, field, choices in spec.choice_filters:
+        values = _parse_choices(params, param, choices)
+        if values:
+            queryset = queryset.filter(**{f'{field}__in': values})
+    date_from = _parse_date(params, 'date_from')
+    date_to = _parse_date(params, 'date_to')
+    if date_from and date_to and date_from > date_to:
+        raise ValidationError({'date_to': 'Must be on or after date_from.'})
+    if date_from:
+        queryset = queryset.filter(**{f'{spec.date_lookup}__gte': date_from})
+    if date_to:
+        queryset = queryset.filter(**{f'{spec.date_lookup}__lte': date_to})
+    return queryset.order_by('id').values(*spec.fields)
+
+
+def _chunks(queryset, chunk_size: int):
+    chunk = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_ndjson(queryset, *, chunk_size: int):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for chunk in _chunks(queryset, chunk_size):
+        yield ''.join(encoder.encode(row) + '\n' for row in chunk)
+
+
+def iter_csv(queryset, fields, *, chunk_size: int):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+    for chunk in _chunks(queryset, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(row[field]) for field in fields] for row in chunk)
+        yield buffer.getvalue()
+
+
+def export_rows(spec: ExportSpec, queryset, export_format: str):
+    """Encoded text chunks for a StreamingHttpResponse."""
+    chunk_size = getattr(settings, 'EXPORT_CHUNK_SIZE', DEFAULT_EXPORT_CHUNK_SIZE)
+    if export_format == EXPORT_FORMAT_CSV:
+        return iter_csv(queryset, spec.fields, chunk_size=chunk_size)
+    return iter_ndjson(queryset, chunk_size=chunk_size)
@@ -0,0 +1,203 @@
+"""
+In-process spatial index of driver home bases for proximity search.
+
+Points live in a lat/lng grid (``GeoGrid``); nearest-neighbour queries walk rings of cells
+outward from the query point and yield drivers in increasing great-circle distance, so a
+lookup touches only the cells near the pickup instead of every driver.
+
+Each process keeps its own index. A Driver save or delete updates the local index in place
+and moves a version stamp in the default cache, which every worker shares (see CACHES);
+other processes rebuild (one ``values()`` query) the next time they see a stamp they did
+not write. Writes that bypass the Driver signals (``bulk_update``, ``queryset.update()``)
+must call ``invalidate_driver_geo_index()``. No antimeridian wrap: single-region fleet.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import uuid
+
+from django.core.cache import cache
+
+from address_validation.models import ValidatedAddress
+
+from .models import Driver, DriverApprovalStatus
+
+DRIVER_GEO_INDEX_VERSION_KEY = 'driver_geo_index:version'
+DEFAULT_CELL_DEGREES = 0.1  # ~11 km of latitude
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoGrid:
+    """Keyed points bucketed into ``cell_degrees`` lat/lng cells."""
+
+    def __init__(self, cell_degrees: float = DEFAULT_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._points: dict[int, tuple[float, float]] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key) -> bool:
+        return key in self._points
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+
+    def upsert(self, key: int, lat: float, lng: float) -> None:
+        self.remove(key)
+        self._points[key] = (lat, lng)
+        self._cells.setdefault(self._cell(lat, lng), set()).add(key)
+
+    def remove(self, key: int) -> None:
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell(*point)
+        members = self._cells[cell]
+        members.discard(key)
+        if not members:
+            del self._cells[cell]
+
+    def _ring(self, center: tuple[int, int], radius: int):
+        row, col = center
+        if radius == 0:
+            yield center
+            return
+        for d in range(-radius, radius + 1):
+            yield row - radius, col + d
+            yield row + radius, col + d
+        for d in range(-radius + 1, radius):
+            yield row + d, col - radius
+            yield row + d, col + radius
+
+    def _covered_km(self, lat: float, radius: int) -> float:
+        """Lower bound on the distance to any point outside rings 0..radius."""
+        poleward = min(89.9, abs(lat) + (radius + 1) * self.cell_degrees)
+        return radius * self.cell_degrees * KM_PER_DEGREE * math.cos(math.radians(poleward)) * 0.99
+
+    def nearest(self, lat: float, lng: float, *, max_km: float):
+        """Yield ``(key, km)`` within ``max_km`` in increasing distance, lazily."""
+        center = self._cell(lat, lng)
+        heap: list[tuple[float, int]] = []
+        seen = 0
+        radius = 0
+        while True:
+            for cell in self._ring(center, radius):
+                # Snapshot the cell: a save in another thread may update the grid in place.
+                for key in tuple(self._cells.get(cell, ())):
+                    point = self._points.get(key)
+                    if point is None:
+                        continue
+                    seen += 1
+                    km = haversine_km(lat, lng, *point)
+                    if km <= max_km:
+                        heapq.heappush(heap, (km, key))
+            covered = self._covered_km(lat, radius)
+            exhausted = seen >= len(self._points) or covered > max_km
+            while heap and (exhausted or heap[0][0] <= covered):
+                km, key = heapq.heappop(heap)
+                yield key, km
+            if exhausted:
+                return
+            radius += 1
+
+
+_index = GeoGrid()
+_index_version: str | None = None
+_index_lock = threading.Lock()
+
+
+def _current_version() -> str:
+    version = cache.get(DRIVER_GEO_INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(DRIVER_GEO_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(DRIVER_GEO_INDEX_VERSION_KEY)
+    return version
+
+
+def indexed_drivers():
+    """Active, approved drivers with a geocoded home base: ``(id, lat, lng)`` rows."""
+    return (
+        Driver.objects.filter(
+            active=True,
+            approval_status=DriverApprovalStatus.APPROVED,
+            home_address__latitude__isnull=False,
+            home_address__longitude__isnull=False,
+        )
+        .values_list('id', 'home_address__latitude', 'home_address__longitude')
+    )
+
+
+def get_driver_geo_index() -> GeoGrid:
+    """This process's index; rebuilt when another process moved the version stamp."""
+    global _index, _index_version
+    version = _current_version()
+    if version == _index_version:
+        return _index
+    with _index_lock:
+        if version != _index_version:
+            grid = GeoGrid()
+            for driver_id, lat, lng in indexed_drivers():
+                grid.upsert(driver_id, lat, lng)
+            _index = grid
+            _index_version = version
+    return _index
+
+
+def _index_is_current() -> bool:
+    return _index_version is not None and _index_version == cache.get(DRIVER_GEO_INDEX_VERSION_KEY)
+
+
+def _apply_change(apply) -> None:
+    """Update the local index in place, then publish a new stamp others rebuild on."""
+    global _index_version
+    with _index_lock:
+        up_to_date = _index_is_current()
+        version = uuid.uuid4().hex
+        cache.set(DRIVER_GEO_INDEX_VERSION_KEY, version, None)
+        if up_to_date:
+            apply(_index)
+            _index_version = version
+        else:
+            _index_version = None
+
+
+def invalidate_driver_geo_index() -> None:
+    """Move the version stamp so every process, this one included, rebuilds its index."""
+    global _index_version
+    with _index_lock:
+        cache.set(DRIVER_GEO_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+        _index_version = None
+
+
+def update_driver_location(sender=None, instance: Driver = None, **kwargs) -> None:
+    """post_save receiver: (re)index the driver's home base, or drop it when not dispatchable."""
+    point = None
+    if instance.active and instance.approval_status == DriverApprovalStatus.APPROVED and instance.home_address_id:
+        point = (
+            ValidatedAddress.objects.filter(
+                pk=instance.home_address_id, latitude__isnull=False, longitude__isnull=False,
+            )
+            .values_list('latitude', 'longitude')
+            .first()
+        )
+    if point is None and instance.pk not in _index and _index_is_current():
+        return  # not indexed before or after this save
+    _apply_change(lambda grid: grid.upsert(instance.pk, *point) if point else grid.remove(instance.pk))
+
+
+def remove_driver_location(sender=None, instance: Driver = None, **kwargs) -> None:
+    """post_delete receiver."""
+    _apply_change(lambda grid: grid.remove(instance.pk))
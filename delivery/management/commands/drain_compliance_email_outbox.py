@@ -0,0 +1,44 @@
+"""Deliver queued compliance emails from the outbox, retrying failures with backoff (Phase 4D)."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from delivery.compliance_email_outbox import DEFAULT_BATCH_SIZE, drain_compliance_email_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Send due ComplianceEmailOutbox rows in batches. Failed sends are rescheduled with '
+        'exponential backoff and marked FAILED after the last attempt. '
+        'Run once after run_compliance_daily_jobs, or with --loop as a worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this many batches per pass (default: until nothing is due).',
+        )
+        parser.add_argument('--loop', action='store_true', help='Keep draining until interrupted.')
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=30.0,
+            help='Seconds to sleep between passes with --loop.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = drain_compliance_email_outbox(
+                batch_size=options['batch_size'],
+                max_batches=options['max_batches'],
+            )
+            self.stdout.write(
+                f"Sent {result['sent']}, retrying {result['retrying']}, "
+                f"failed {result['failed']} outbox email(s)."
+            )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,42 @@
+"""Backfill Delivery.estimated_cost from the pricing rate card (Phase 4C)."""
+from django.core.management.base import BaseCommand
+
+from delivery.models import Delivery
+from delivery.pricing_service import DEFAULT_BATCH_SIZE, estimate_delivery_costs, geocode_delivery_routes
+
+
+class Command(BaseCommand):
+    help = (
+        'Price deliveries that have no estimated_cost (or all with --overwrite) from their '
+        'geocoded pickup and dropoff. With --geocode, missing or stale pickups and dropoffs are '
+        'geocoded first through the geocode cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--overwrite', action='store_true', help='Re-price deliveries that already have an estimate.')
+        parser.add_argument('--geocode', action='store_true', help='Geocode pickup/dropoff locations before pricing.')
+
+    def handle(self, *args, **options):
+        queryset = Delivery.objects.all()
+        if not options['overwrite']:
+            queryset = queryset.filter(estimated_cost__isnull=True)
+        batch_size = options['batch_size']
+
+        if options['geocode']:
+            deliveries = queryset.select_related('customer', 'pickup_address', 'dropoff_address').order_by('id')
+            geocoded = 0
+            last_id = 0
+            while True:
+                batch = list(deliveries.filter(id__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                geocoded += geocode_delivery_routes(batch)
+                last_id = batch[-1].id
+            self.stdout.write(f'Geocoded routes for {geocoded} delivery(ies).')
+
+        result = estimate_delivery_costs(overwrite=options['overwrite'], batch_size=batch_size)
+        self.stdout.write(
+            f"Priced {result['priced']} delivery(ies); "
+            f"{result['skipped_not_geocoded']} skipped without geocoded pickup and dropoff."
+        )
@@ -0,0 +1,32 @@
+"""Geocode driver home bases for nearby-driver search (Phase 4C)."""
+from django.core.management.base import BaseCommand
+
+from delivery.models import Driver, DriverApprovalStatus
+from delivery.proximity_service import geocode_driver_home_bases
+
+
+class Command(BaseCommand):
+    help = (
+        'Geocode the address of every active, approved driver whose home base is missing or '
+        'no longer matches their address. Addresses go through the geocode cache in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        drivers = (
+            Driver.objects.filter(active=True, approval_status=DriverApprovalStatus.APPROVED)
+            .select_related('home_address')
+            .order_by('id')
+        )
+        batch_size = options['batch_size']
+        updated = 0
+        last_id = 0
+        while True:
+            batch = list(drivers.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            updated += geocode_driver_home_bases(batch)
+            last_id = batch[-1].id
+        self.stdout.write(f'Geocoded {updated} driver home base(s).')
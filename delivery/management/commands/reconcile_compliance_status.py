@@ -0,0 +1,26 @@
+"""Nightly job: repair drift in the materialized compliance status table (Phase 4D)."""
+from django.core.management.base import BaseCommand
+
+from delivery.compliance_status_service import reconcile_compliance_statuses
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute per-driver and per-vehicle compliance status rows from LegalDocument '
+        'and rewrite any that drifted. Also run as the last step of run_compliance_daily_jobs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many rows drifted without rewriting them.',
+        )
+
+    def handle(self, *args, **options):
+        result = reconcile_compliance_statuses(dry_run=options['dry_run'])
+        prefix = 'Dry run: would repair' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {result['repaired']} of {result['checked']} compliance status row(s) "
+            f"as of {result['as_of_date']}.",
+        ))
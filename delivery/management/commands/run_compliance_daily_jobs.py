@@ -1,15 +1,18 @@
-"""Nightly compliance maintenance: expire documents + send expiry reminders (Phase 4D)."""
+"""Nightly compliance maintenance: expire documents, queue and send expiry reminders, reconcile status (Phase 4D)."""
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from delivery.compliance_email_outbox import drain_compliance_email_outbox
 from delivery.compliance_reminder_service import send_compliance_expiry_reminders
 from delivery.compliance_service import mark_expired_documents
+from delivery.compliance_status_service import reconcile_compliance_statuses
 
 
 class Command(BaseCommand):
     help = (
-        'Run nightly compliance jobs: mark expired documents, then send 30/14/0-day '
-        'expiry reminder emails. Schedule on Heroku Scheduler once daily.'
+        'Run nightly compliance jobs: mark expired documents, queue 30/14/0-day '
+        'expiry reminder emails and drain the outbox once, then reconcile compliance status rows. '
+        'Schedule on Heroku Scheduler once daily.'
     )
 
     def add_arguments(self, parser):
@@ -18,6 +21,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Report actions without updating documents or sending email.',
         )
+        parser.add_argument(
+            '--no-drain',
+            action='store_true',
+            help='Only queue reminders; leave delivery to drain_compliance_email_outbox.',
+        )
 
     def handle(self, *args, **options):
         today = timezone.now().date()
@@ -39,10 +47,10 @@ class Command(BaseCommand):
             ))
 
         reminder_result = send_compliance_expiry_reminders(as_of_date=today, dry_run=dry_run)
-        sent = reminder_result['sent']
-        prefix = 'Dry run: would send' if dry_run else 'Sent'
+        queued = reminder_result['queued']
+        prefix = 'Dry run: would queue' if dry_run else 'Queued'
         self.stdout.write(
-            f'{prefix} {sent[30]} (30-day), {sent[14]} (14-day), {sent[0]} (expiry-day) '
+            f'{prefix} {queued[30]} (30-day), {queued[14]} (14-day), {queued[0]} (expiry-day) '
             f"reminder(s) as of {reminder_result['as_of_date']}."
         )
         if reminder_result['skipped_no_email']:
@@ -51,3 +59,22 @@ class Command(BaseCommand):
                     f"Skipped {reminder_result['skipped_no_email']} reminder(s) — no driver email.",
                 ),
             )
+
+        if not dry_run and not options['no_drain']:
+            # Undelivered rows stay queued for the next drain; don't block the reconcile.
+            try:
+                drain_result = drain_compliance_email_outbox()
+            except Exception as exc:
+                self.stdout.write(self.style.WARNING(f'Outbox drain failed: {exc}'))
+            else:
+                self.stdout.write(
+                    f"Sent {drain_result['sent']} outbox email(s) "
+                    f"({drain_result['retrying']} retrying, {drain_result['failed']} failed)."
+                )
+
+        reconcile_result = reconcile_compliance_statuses(dry_run=dry_run)
+        prefix = 'Dry run: would repair' if dry_run else 'Repaired'
+        self.stdout.write(
+            f"{prefix} {reconcile_result['repaired']} of {reconcile_result['checked']} "
+            'compliance status row(s).'
+        )
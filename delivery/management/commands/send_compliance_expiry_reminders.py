@@ -1,12 +1,14 @@
-"""Send compliance expiry reminder emails at 30, 14, and 0 days (Phase 4D)."""
+"""Queue compliance expiry reminder emails at 30, 14, and 0 days, then send them (Phase 4D)."""
 from django.core.management.base import BaseCommand
 
+from delivery.compliance_email_outbox import drain_compliance_email_outbox
 from delivery.compliance_reminder_service import send_compliance_expiry_reminders
 
 
 class Command(BaseCommand):
     help = (
-        'Email drivers when verified compliance documents expire in 30, 14, or 0 days. '
+        'Queue emails to drivers when verified compliance documents expire in 30, 14, or 0 days, '
+        'then drain the outbox once. '
         'Schedule daily on Heroku via run_compliance_daily_jobs or this command alone.'
     )
 
@@ -14,15 +16,20 @@ class Command(BaseCommand):
         parser.add_argument(
             '--dry-run',
             action='store_true',
-            help='Count reminders that would send without emailing or updating rows.',
+            help='Count reminders that would be queued without writing outbox rows.',
+        )
+        parser.add_argument(
+            '--no-drain',
+            action='store_true',
+            help='Only queue reminders; leave delivery to drain_compliance_email_outbox.',
         )
 
     def handle(self, *args, **options):
         result = send_compliance_expiry_reminders(dry_run=options['dry_run'])
-        sent = result['sent']
-        prefix = 'Dry run: would send' if options['dry_run'] else 'Sent'
+        queued = result['queued']
+        prefix = 'Dry run: would queue' if options['dry_run'] else 'Queued'
         self.stdout.write(
-            f'{prefix} {sent[30]} (30-day), {sent[14]} (14-day), {sent[0]} (expiry-day) '
+            f'{prefix} {queued[30]} (30-day), {queued[14]} (14-day), {queued[0]} (expiry-day) '
             f"reminder(s) as of {result['as_of_date']}."
         )
         if result['skipped_no_email']:
@@ -31,3 +38,9 @@ class Command(BaseCommand):
                     f"Skipped {result['skipped_no_email']} document(s) with no driver email.",
                 ),
             )
+        if not options['dry_run'] and not options['no_drain']:
+            drain_result = drain_compliance_email_outbox()
+            self.stdout.write(
+                f"Sent {drain_result['sent']} outbox email(s) "
+                f"({drain_result['retrying']} retrying, {drain_result['failed']} failed)."
+            )
@@ -11,6 +11,10 @@ ROLE_STAFF = 'staff'
 ROLE_CUSTOMER = 'customer'
 ROLE_DRIVER = 'driver'
 
+# JWT claim holding the resolved role (see authentication.RoleClaimsJWTAuthentication).
+ROLE_CLAIMS_KEY = 'rbac'
+ROLE_CLAIMS_ATTR = 'role_claims'
+
 
 def _build_staff_payload(user: User) -> dict:
     staff_role = get_staff_role_for_user(user)
@@ -46,6 +50,10 @@ def resolve_current_user_role(user: User) -> dict | None:
     Staff (Option A): super_admin → role admin; other staff roles → role staff
     with staff_role + permissions.
     """
+    claims = get_role_claims(user)
+    if claims is not None:
+        return claims['me']
+
     if user.is_staff:
         return _build_staff_payload(user)
 
@@ -76,3 +84,18 @@ def resolve_current_user_role(user: User) -> dict | None:
         }
 
     return None
+
+
+def build_role_claims(user: User) -> dict:
+    """Role claims embedded in issued JWTs: the /me payload plus ids used by permission checks."""
+    return {
+        'me': resolve_current_user_role(user),
+        'is_staff': user.is_staff,
+        'customer_id': Customer.objects.filter(user=user).values_list('id', flat=True).first(),
+        'driver_id': Driver.objects.filter(user=user).values_list('id', flat=True).first(),
+    }
+
+
+def get_role_claims(user) -> dict | None:
+    """Role claims of a token-backed principal; None for database-loaded users."""
+    return getattr(user, ROLE_CLAIMS_ATTR, None)
@@ -1,4 +1,13 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from DeliveryAppBackend.metrics import DB_QUERIES, HTTP_REQUEST_DURATION
+
 from .auth_logging import assign_request_id
+from .query_profiling import QueryProfile, log_query_profile, profiling_enabled
 
 
 class RequestIdMiddleware:
@@ -12,3 +21,60 @@ class RequestIdMiddleware:
         response = self.get_response(request)
         response['X-Request-ID'] = request_id
         return response
+
+
+class QueryProfilingMiddleware:
+    """
+    Opt-in (QUERY_PROFILING_ENABLED): log per-request query count, DB time, slowest and
+    repeated statements keyed by request id, add a Server-Timing header, and warn when a
+    view goes over QUERY_PROFILING_BUDGET. Place after RequestIdMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling_enabled():
+            return self.get_response(request)
+        profile = QueryProfile()
+        started = time.perf_counter()
+        with profile.capture():
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        response['Server-Timing'] = profile.server_timing(total_ms)
+        log_query_profile(request, response, profile, total_ms)
+        return response
+
+
+class MetricsMiddleware:
+    """Record request latency and SQL statement counts per DRF route name (METRICS_ENABLED)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            return self.get_response(request)
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_queries))
+            response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        route = (match.view_name if match else '') or 'unmatched'
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - started,
+            route=route,
+            method=request.method,
+            status=response.status_code,
+        )
+        if queries:
+            DB_QUERIES.inc(queries, route=route)
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0011_staff_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplianceStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('verified_count', models.PositiveIntegerField(default=0)),
+                ('rejected_count', models.PositiveIntegerField(default=0)),
+                ('expired_count', models.PositiveIntegerField(default=0)),
+                ('expiring_soon_count', models.PositiveIntegerField(default=0)),
+                ('missing_types', models.JSONField(blank=True, default=list)),
+                ('blockers', models.JSONField(blank=True, default=list)),
+                ('has_missing_docs', models.BooleanField(default=True)),
+                ('has_expired_docs', models.BooleanField(default=False)),
+                ('has_expiring_docs', models.BooleanField(default=False)),
+                ('has_verified_registration', models.BooleanField(default=False)),
+                ('is_fully_compliant', models.BooleanField(default=False)),
+                ('computed_on', models.DateField(help_text='Date the time-dependent flags were evaluated for.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('driver', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='compliance_status', to='delivery.driver')),
+                ('vehicle', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='compliance_status', to='delivery.vehicle')),
+            ],
+            options={
+                'verbose_name_plural': 'compliance statuses',
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('driver__isnull', False), ('vehicle__isnull', True)), models.Q(('driver__isnull', True), ('vehicle__isnull', False)), _connector='OR'), name='compliance_status_single_subject')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0013_compliance_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='drivervehicle',
+            index=models.Index(fields=['driver', '-assigned_from'], name='drivervehicle_driver_from_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drivervehicle',
+            index=models.Index(fields=['vehicle', '-assigned_from'], name='drivervehicle_vehicle_from_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drivervehicle',
+            index=models.Index(condition=models.Q(('assigned_to__isnull', True)), fields=['driver', '-assigned_from'], name='drivervehicle_open_driver_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drivervehicle',
+            index=models.Index(condition=models.Q(('assigned_to__isnull', True)), fields=['vehicle'], name='drivervehicle_open_vehicle_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-17 22:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address_validation', '0002_geocode_cache'),
+        ('delivery', '0014_drivervehicle_assignment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='pickup_address',
+            field=models.ForeignKey(blank=True, help_text='Geocoded pickup_location (proximity search).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='address_validation.validatedaddress'),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='home_address',
+            field=models.ForeignKey(blank=True, help_text='Geocoded home base (proximity search).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='address_validation.validatedaddress'),
+        ),
+    ]
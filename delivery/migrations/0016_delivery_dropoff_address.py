@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-17 22:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address_validation', '0002_geocode_cache'),
+        ('delivery', '0015_geocoded_pickup_and_home_base'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='dropoff_address',
+            field=models.ForeignKey(blank=True, help_text='Geocoded dropoff_location (pricing).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='address_validation.validatedaddress'),
+        ),
+        migrations.AlterField(
+            model_name='delivery',
+            name='pickup_address',
+            field=models.ForeignKey(blank=True, help_text='Geocoded pickup_location (proximity search, pricing).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='address_validation.validatedaddress'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-17 22:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0016_delivery_dropoff_address'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='status_batch',
+            field=models.UUIDField(blank=True, editable=False, help_text='Transition that last changed status (DeliveryStatusEvent.batch_id).', null=True),
+        ),
+        migrations.CreateModel(
+            name='DeliveryStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('Pending', 'Pending'), ('En Route', 'En Route'), ('Completed', 'Completed'), ('Cancelled', 'Cancelled')], max_length=50)),
+                ('to_status', models.CharField(choices=[('Pending', 'Pending'), ('En Route', 'En Route'), ('Completed', 'Completed'), ('Cancelled', 'Cancelled')], max_length=50)),
+                ('batch_id', models.UUIDField(db_index=True)),
+                ('reason', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('delivery', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='delivery.delivery')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['delivery', '-created_at'], name='delivery_status_event_idx')],
+            },
+        ),
+    ]
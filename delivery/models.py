@@ -9,6 +9,7 @@ from .compliance_constants import (
     DocumentStatus,
     DocumentType,
     DRIVER_DOCUMENT_TYPES,
+    OutboxStatus,
     VEHICLE_DOCUMENT_TYPES,
 )
 from .staff_constants import StaffRole
@@ -89,10 +90,21 @@ class Customer(models.Model):
     @property
     def display_name(self):
         """Get display name for customer (company name or individual name)"""
-        if self.is_business and self.company_name:
-            return self.company_name
-        full_name = self.user.get_full_name()
-        return full_name if full_name else self.user.username
+        return self.format_display_name(
+            is_business=self.is_business,
+            company_name=self.company_name,
+            first_name=self.user.first_name,
+            last_name=self.user.last_name,
+            username=self.user.username,
+        )
+
+    @staticmethod
+    def format_display_name(*, is_business, company_name, first_name, last_name, username):
+        """display_name from plain column values (projection-based serializers)."""
+        if is_business and company_name:
+            return company_name
+        full_name = f'{first_name} {last_name}'.strip()
+        return full_name if full_name else username
     
     @property
     def full_address(self):
@@ -171,6 +183,28 @@ class Delivery(models.Model):
     delivery_time = models.TimeField(null=True, blank=True)
     special_instructions = models.TextField(blank=True, null=True, help_text="Special delivery instructions")
     estimated_cost = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True, help_text="Estimated delivery cost")
+    pickup_address = models.ForeignKey(
+        'address_validation.ValidatedAddress',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Geocoded pickup_location (proximity search, pricing).',
+    )
+    dropoff_address = models.ForeignKey(
+        'address_validation.ValidatedAddress',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Geocoded dropoff_location (pricing).',
+    )
+    status_batch = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='Transition that last changed status (DeliveryStatusEvent.batch_id).',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -243,6 +277,14 @@ class Driver(models.Model):
         blank=True,
         related_name='approved_drivers',
     )
+    home_address = models.ForeignKey(
+        'address_validation.ValidatedAddress',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Geocoded home base (proximity search).',
+    )
 
     def clean(self):
         """CIO DIRECTIVE: Validate that every driver has a User account"""
@@ -420,6 +462,22 @@ class DriverVehicle(models.Model):
     class Meta:
         unique_together = ('driver', 'vehicle', 'assigned_from')
         ordering = ['-assigned_from']
+        indexes = [
+            # Current-assignment window: driver/vehicle + assigned_from range, newest first.
+            models.Index(fields=['driver', '-assigned_from'], name='drivervehicle_driver_from_idx'),
+            models.Index(fields=['vehicle', '-assigned_from'], name='drivervehicle_vehicle_from_idx'),
+            # Open assignments only (partial on PostgreSQL/SQLite): stays small as history grows.
+            models.Index(
+                fields=['driver', '-assigned_from'],
+                condition=models.Q(assigned_to__isnull=True),
+                name='drivervehicle_open_driver_idx',
+            ),
+            models.Index(
+                fields=['vehicle'],
+                condition=models.Q(assigned_to__isnull=True),
+                name='drivervehicle_open_vehicle_idx',
+            ),
+        ]
 
     def __str__(self):
         vehicle_info = self.vehicle.license_plate if self.vehicle else "No Vehicle"
@@ -457,6 +515,29 @@ class DeliveryAssignment(models.Model):
         ordering = ['-assigned_at']
 
 
+class DeliveryStatusEvent(models.Model):
+    """One delivery status transition (Phase 4C audit); rows of one request share ``batch_id``.
+
+    Written by delivery_status_service alongside the conditional status update.
+    """
+
+    delivery = models.ForeignKey(Delivery, on_delete=models.CASCADE, related_name='status_events')
+    from_status = models.CharField(max_length=50, choices=Delivery.STATUS_CHOICES)
+    to_status = models.CharField(max_length=50, choices=Delivery.STATUS_CHOICES)
+    batch_id = models.UUIDField(db_index=True)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    reason = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['delivery', '-created_at'], name='delivery_status_event_idx'),
+        ]
+
+    def __str__(self):
+        return f'Delivery {self.delivery_id}: {self.from_status} -> {self.to_status}'
+
+
 class LegalDocument(models.Model):
     """Legal/compliance document metadata for drivers and vehicles (Phase 4A)."""
 
@@ -562,3 +643,99 @@ class LegalDocument(models.Model):
             models.Index(fields=['vehicle', 'document_type', 'status']),
             models.Index(fields=['driver', 'document_type', 'status']),
         ]
+
+
+class ComplianceStatus(models.Model):
+    """Denormalized compliance snapshot for one driver or one vehicle (Phase 4D).
+
+    Maintained by compliance_status_service on document mutations; reconciled nightly.
+    """
+
+    driver = models.OneToOneField(
+        Driver,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='compliance_status',
+    )
+    vehicle = models.OneToOneField(
+        Vehicle,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='compliance_status',
+    )
+    pending_count = models.PositiveIntegerField(default=0)
+    verified_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    expired_count = models.PositiveIntegerField(default=0)
+    expiring_soon_count = models.PositiveIntegerField(default=0)
+    missing_types = models.JSONField(default=list, blank=True)
+    blockers = models.JSONField(default=list, blank=True)
+    has_missing_docs = models.BooleanField(default=True)
+    has_expired_docs = models.BooleanField(default=False)
+    has_expiring_docs = models.BooleanField(default=False)
+    has_verified_registration = models.BooleanField(default=False)
+    is_fully_compliant = models.BooleanField(default=False)
+    computed_on = models.DateField(help_text='Date the time-dependent flags were evaluated for.')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'compliance statuses'
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    models.Q(driver__isnull=False, vehicle__isnull=True)
+                    | models.Q(driver__isnull=True, vehicle__isnull=False)
+                ),
+                name='compliance_status_single_subject',
+            ),
+        ]
+
+    def __str__(self):
+        subject = f'driver {self.driver_id}' if self.driver_id else f'vehicle {self.vehicle_id}'
+        return f'Compliance status for {subject} ({self.computed_on})'
+
+
+class ComplianceEmailOutbox(models.Model):
+    """Queued compliance notification email (Phase 4D).
+
+    The reminder job enqueues; drain_compliance_email_outbox delivers with retry/backoff.
+    """
+
+    idempotency_key = models.CharField(
+        max_length=128,
+        unique=True,
+        help_text='One row per notification, e.g. expiry-reminder:<document>:<threshold>:<expiry>.',
+    )
+    document = models.ForeignKey(
+        LegalDocument,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='queued_emails',
+    )
+    threshold_days = models.PositiveSmallIntegerField(null=True, blank=True)
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(
+        max_length=16,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='compliance_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.idempotency_key} -> {self.to_email} ({self.status})'
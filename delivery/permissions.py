@@ -1,8 +1,11 @@
 """v1.0 RBAC permission classes and queryset scoping helpers."""
 
+import hmac
+
+from django.conf import settings
 from rest_framework.permissions import BasePermission
 
-from .driver_utils import get_driver_for_user
+from .me_service import get_role_claims
 from .models import Customer, Delivery, Driver, DriverVehicle
 from .staff_constants import (
     PERM_DELIVERIES_ASSIGN,
@@ -16,14 +19,32 @@ from .staff_constants import (
 from .staff_permissions import staff_can_view_operational_data, user_has_staff_permission
 
 
-def user_has_customer_profile(user) -> bool:
+def customer_id_for_user(user) -> int | None:
+    """Customer profile id from role claims, else one query."""
     if not user or not user.is_authenticated:
-        return False
-    return Customer.objects.filter(user=user).exists()
+        return None
+    claims = get_role_claims(user)
+    if claims is not None:
+        return claims['customer_id']
+    return Customer.objects.filter(user=user).values_list('id', flat=True).first()
+
+
+def driver_id_for_user(user) -> int | None:
+    """Driver profile id from role claims, else one query."""
+    if not user or not user.is_authenticated:
+        return None
+    claims = get_role_claims(user)
+    if claims is not None:
+        return claims['driver_id']
+    return Driver.objects.filter(user=user).values_list('id', flat=True).first()
+
+
+def user_has_customer_profile(user) -> bool:
+    return customer_id_for_user(user) is not None
 
 
 def user_has_driver_profile(user) -> bool:
-    return get_driver_for_user(user) is not None
+    return driver_id_for_user(user) is not None
 
 
 def scope_customer_queryset(user):
@@ -35,11 +56,10 @@ def scope_customer_queryset(user):
 def scope_delivery_queryset(user):
     if staff_can_view_operational_data(user):
         return Delivery.objects.all()
-    try:
-        customer = user.customer_profile
-    except Customer.DoesNotExist:
+    customer_id = customer_id_for_user(user)
+    if customer_id is None:
         return Delivery.objects.none()
-    return Delivery.objects.filter(customer=customer)
+    return Delivery.objects.filter(customer_id=customer_id)
 
 
 def scope_driver_queryset(user):
@@ -51,10 +71,10 @@ def scope_driver_queryset(user):
 def scope_driver_vehicle_queryset(user):
     if staff_can_view_operational_data(user):
         return DriverVehicle.objects.all()
-    driver = get_driver_for_user(user)
-    if not driver:
+    driver_id = driver_id_for_user(user)
+    if driver_id is None:
         return DriverVehicle.objects.none()
-    return DriverVehicle.objects.filter(driver=driver)
+    return DriverVehicle.objects.filter(driver_id=driver_id)
 
 
 class IsStaffUser(BasePermission):
@@ -68,6 +88,28 @@ class IsStaffUser(BasePermission):
         )
 
 
+class CanViewMetrics(BasePermission):
+    """Reports staff, or a scraper sending ``Authorization: Metrics <METRICS_TOKEN>``."""
+
+    def has_permission(self, request, view):
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+        if token and scheme == 'Metrics' and hmac.compare_digest(credentials.strip(), token):
+            return True
+        return IsStaffUser().has_permission(request, view)
+
+
+class CanExportData(BasePermission):
+    """Staff holding the view permission of the export's dataset (``view.export_spec.permission``)."""
+
+    def has_permission(self, request, view):
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and user_has_staff_permission(request.user, view.export_spec.permission)
+        )
+
+
 class CanManageCustomer(BasePermission):
     """Staff manage all customers; customers read/update own profile only."""
 
@@ -89,7 +131,7 @@ class CanManageCustomer(BasePermission):
 
 
 class CanManageDelivery(BasePermission):
-    """Staff CRUD; customers list/read own deliveries and use request_delivery."""
+    """Staff CRUD and quotes; customers list/read own deliveries and use request_delivery."""
 
     def has_permission(self, request, view):
         if not (request.user and request.user.is_authenticated):
@@ -98,6 +140,10 @@ class CanManageDelivery(BasePermission):
             return user_has_staff_permission(request.user, PERM_RESOURCES_WRITE)
         if view.action == 'request_delivery':
             return user_has_customer_profile(request.user)
+        if view.action in ('nearby_drivers', 'bulk_transition'):
+            return user_has_staff_permission(request.user, PERM_DELIVERIES_ASSIGN)
+        if view.action == 'quotes':
+            return user_has_staff_permission(request.user, PERM_DELIVERIES_VIEW)
         if view.action == 'cancel':
             return (
                 user_has_staff_permission(request.user, PERM_RESOURCES_WRITE)
@@ -106,15 +152,15 @@ class CanManageDelivery(BasePermission):
         return True
 
     def has_object_permission(self, request, view, obj):
+        if view.action == 'nearby_drivers':
+            return user_has_staff_permission(request.user, PERM_DELIVERIES_ASSIGN)
         if user_has_staff_permission(request.user, PERM_RESOURCES_WRITE):
             return True
         if user_has_staff_permission(request.user, PERM_DELIVERIES_VIEW):
             return view.action in ('retrieve', 'list')
         if view.action in ('retrieve', 'cancel'):
-            try:
-                return obj.customer_id == request.user.customer_profile.id
-            except Customer.DoesNotExist:
-                return False
+            customer_id = customer_id_for_user(request.user)
+            return customer_id is not None and obj.customer_id == customer_id
         return False
 
 
@@ -128,6 +174,8 @@ class CanManageDriver(BasePermission):
             return user_has_staff_permission(request.user, PERM_RESOURCES_WRITE)
         if view.action in ('approve', 'reject'):
             return user_has_staff_permission(request.user, PERM_DRIVERS_APPROVE)
+        if view.action == 'bulk_dispatch_eligibility':
+            return user_has_staff_permission(request.user, PERM_DRIVERS_VIEW)
         return True
 
     def has_object_permission(self, request, view, obj):
@@ -158,8 +206,8 @@ class CanManageDriverVehicleAssignment(BasePermission):
         if user_has_staff_permission(request.user, PERM_DRIVERS_VIEW):
             return view.action in ('retrieve', 'list')
         if view.action in ('retrieve',):
-            driver = get_driver_for_user(request.user)
-            return driver is not None and obj.driver_id == driver.id
+            driver_id = driver_id_for_user(request.user)
+            return driver_id is not None and obj.driver_id == driver_id
         return False
 
 
@@ -169,7 +217,7 @@ class CanManageDeliveryAssignment(BasePermission):
     def has_permission(self, request, view):
         if not (request.user and request.user.is_authenticated):
             return False
-        if view.action in ('create', 'update', 'partial_update', 'destroy'):
+        if view.action in ('create', 'update', 'partial_update', 'destroy', 'auto_dispatch'):
             return user_has_staff_permission(request.user, PERM_DELIVERIES_ASSIGN)
         if view.action in ('list', 'retrieve'):
             return (
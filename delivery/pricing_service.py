@@ -0,0 +1,185 @@
+"""
+Delivery pricing (Phase 4C): route distance, ETA and ``estimated_cost`` for batches of routes.
+
+A quote is the base fee + a per-km rate x road distance + the surcharge for the vehicle's
+class, where the class comes from the catalog spec payload. Road distance is the great-circle
+distance between the geocoded pickup and dropoff scaled by a detour factor. A batch is
+priced in one pass over plain floats (spec lookups from the in-process spec index, no
+per-route queries) and stored deliveries are written with one bulk_update per chunk.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from address_validation.services import validate_addresses
+
+from .geo_index import haversine_km
+from .models import Delivery, DeliveryAssignment
+from .proximity_service import address_is_current
+from .vehicle_catalog_cache import get_model_spec_index
+
+DEFAULT_BASE_FEE = 15.0
+DEFAULT_PER_KM = 1.25
+DEFAULT_DETOUR_FACTOR = 1.3
+DEFAULT_AVERAGE_SPEED_KMH = 40.0
+# (class, max spec payload in kg or None for the rest, surcharge), lightest first
+DEFAULT_VEHICLE_CLASSES = (
+    ('light', 700, 0.0),
+    ('standard', 1200, 10.0),
+    ('heavy', None, 25.0),
+)
+DEFAULT_BATCH_SIZE = 1000
+MAX_QUOTES_PER_REQUEST = 5000
+
+
+@dataclass(frozen=True)
+class RateCard:
+    base_fee: float
+    per_km: float
+    detour_factor: float
+    average_speed_kmh: float
+    vehicle_classes: tuple
+
+    def vehicle_class(self, payload_kg: int) -> tuple[str, float]:
+        for name, max_payload_kg, surcharge in self.vehicle_classes:
+            if max_payload_kg is None or payload_kg <= max_payload_kg:
+                return name, surcharge
+        name, _, surcharge = self.vehicle_classes[-1]
+        return name, surcharge
+
+
+def get_rate_card() -> RateCard:
+    return RateCard(
+        base_fee=getattr(settings, 'PRICING_BASE_FEE', DEFAULT_BASE_FEE),
+        per_km=getattr(settings, 'PRICING_PER_KM', DEFAULT_PER_KM),
+        detour_factor=getattr(settings, 'PRICING_DETOUR_FACTOR', DEFAULT_DETOUR_FACTOR),
+        average_speed_kmh=getattr(settings, 'PRICING_AVERAGE_SPEED_KMH', DEFAULT_AVERAGE_SPEED_KMH),
+        vehicle_classes=tuple(getattr(settings, 'PRICING_VEHICLE_CLASSES', DEFAULT_VEHICLE_CLASSES)),
+    )
+
+
+def _cents(amount: float) -> Decimal:
+    return Decimal(round(amount * 100)).scaleb(-2)
+
+
+def _spec_surcharges(spec_ids, rate_card: RateCard) -> dict:
+    """Spec id -> surcharge for each distinct id; unknown or inactive specs are rejected."""
+    index = get_model_spec_index()
+    surcharges = {None: 0.0}
+    for spec_id in set(spec_ids) - {None}:
+        spec = index.get(spec_id)
+        if spec is None:
+            raise ValidationError({'model_spec_id': f'Unknown or inactive vehicle model spec {spec_id}.'})
+        surcharges[spec_id] = rate_card.vehicle_class(spec.max_capacity_kg)[1]
+    return surcharges
+
+
+def price_routes(routes, spec_ids=None, *, rate_card=None) -> list[dict]:
+    """
+    Quote ``(pickup_lat, pickup_lng, dropoff_lat, dropoff_lng)`` routes, in input order.
+
+    ``spec_ids`` (parallel to ``routes``, None entries allowed) selects each route's vehicle
+    class surcharge.
+    """
+    rate_card = rate_card or get_rate_card()
+    if spec_ids is None:
+        spec_ids = [None] * len(routes)
+    surcharges = _spec_surcharges(spec_ids, rate_card)
+    base_fee, per_km = rate_card.base_fee, rate_card.per_km
+    detour, minutes_per_km = rate_card.detour_factor, 60.0 / rate_card.average_speed_kmh
+    quotes = []
+    for route, spec_id in zip(routes, spec_ids):
+        km = haversine_km(*route) * detour
+        quotes.append({
+            'distance_km': round(km, 2),
+            'eta_minutes': round(km * minutes_per_km),
+            'estimated_cost': _cents(base_fee + per_km * km + surcharges[spec_id]),
+        })
+    return quotes
+
+
+def geocode_delivery_routes(deliveries) -> int:
+    """Batch-geocode missing or stale pickups and dropoffs; returns the number of deliveries updated."""
+    pending = []  # (delivery, attribute, text, country)
+    for delivery in deliveries:
+        country = delivery.customer.address_country if delivery.customer_id else 'US'
+        for attribute, text in (
+            ('pickup_address', delivery.pickup_location),
+            ('dropoff_address', delivery.dropoff_location),
+        ):
+            if text and not address_is_current(getattr(delivery, attribute), text, country):
+                pending.append((delivery, attribute, text, country))
+    addresses = validate_addresses([(text, country) for _, _, text, country in pending])
+    updated = {}
+    for (delivery, attribute, _, _), address in zip(pending, addresses):
+        setattr(delivery, attribute, address)
+        updated[delivery.pk] = delivery
+    Delivery.objects.bulk_update(list(updated.values()), ['pickup_address', 'dropoff_address'])
+    return len(updated)
+
+
+def _assigned_spec_ids(delivery_ids) -> dict:
+    """Delivery id -> catalog spec of the most recently assigned vehicle (active specs only)."""
+    index = get_model_spec_index()
+    rows = (
+        DeliveryAssignment.objects.filter(delivery_id__in=delivery_ids, vehicle__isnull=False)
+        .order_by('delivery_id', 'assigned_at', 'id')
+        .values_list('delivery_id', 'vehicle__model_spec_id')
+    )
+    return {delivery_id: spec_id for delivery_id, spec_id in rows if spec_id in index}
+
+
+def estimate_delivery_costs(queryset=None, *, overwrite=False, batch_size=None) -> dict:
+    """
+    Fill ``estimated_cost`` for deliveries with geocoded pickup and dropoff.
+
+    Without ``overwrite`` only deliveries that have no estimate are priced. Deliveries are
+    priced in id order, ``batch_size`` at a time (PRICING_BATCH_SIZE).
+    """
+    if queryset is None:
+        queryset = Delivery.objects.all()
+    if batch_size is None:
+        batch_size = getattr(settings, 'PRICING_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    if not overwrite:
+        queryset = queryset.filter(estimated_cost__isnull=True)
+    geocoded = queryset.filter(
+        pickup_address__latitude__isnull=False,
+        pickup_address__longitude__isnull=False,
+        dropoff_address__latitude__isnull=False,
+        dropoff_address__longitude__isnull=False,
+    )
+    skipped = queryset.count() - geocoded.count()
+    rows_query = geocoded.order_by('id').values_list(
+        'id',
+        'pickup_address__latitude',
+        'pickup_address__longitude',
+        'dropoff_address__latitude',
+        'dropoff_address__longitude',
+    )
+
+    rate_card = get_rate_card()
+    priced = 0
+    last_id = 0
+    while True:
+        rows = list(rows_query.filter(id__gt=last_id)[:batch_size])
+        if not rows:
+            break
+        ids = [row[0] for row in rows]
+        specs = _assigned_spec_ids(ids)
+        quotes = price_routes(
+            [row[1:] for row in rows],
+            [specs.get(delivery_id) for delivery_id in ids],
+            rate_card=rate_card,
+        )
+        Delivery.objects.bulk_update(
+            [
+                Delivery(id=delivery_id, estimated_cost=quote['estimated_cost'])
+                for delivery_id, quote in zip(ids, quotes)
+            ],
+            ['estimated_cost'],
+        )
+        priced += len(rows)
+        last_id = ids[-1]
+    return {'priced': priced, 'skipped_not_geocoded': skipped}
@@ -0,0 +1,109 @@
+"""
+Proximity search (Phase 4C): the K nearest dispatch-eligible drivers to a delivery pickup.
+
+Pickups and driver home bases are geocoded through address_validation (cached) and linked
+as ValidatedAddress rows: pickups when a delivery is created or its pickup_location changes
+(and by ``estimate_delivery_costs --geocode``), so the search itself only reads. Candidates come from the in-process geo index in distance order
+and are checked against the same compliance blockers as the dispatch board, a batch at a
+time, until K eligible drivers are found or the search radius is exhausted.
+"""
+from itertools import islice
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from address_validation.geocode_cache import normalize_address_key
+from address_validation.services import validate_address, validate_addresses
+
+from .compliance_service import get_dispatch_eligibility_for_drivers
+from .geo_index import get_driver_geo_index, invalidate_driver_geo_index
+from .models import Driver
+
+DEFAULT_NEARBY_DRIVERS = 5
+MAX_NEARBY_DRIVERS = 50
+DEFAULT_PROXIMITY_MAX_KM = 100
+
+
+def address_is_current(address, address_text: str, country: str) -> bool:
+    """True when ``address`` was geocoded from (a normalized equivalent of) ``address_text``."""
+    return address is not None and (
+        normalize_address_key(address.original_address, country) == normalize_address_key(address_text, country)
+    )
+
+
+def _pickup_country(delivery) -> str:
+    return delivery.customer.address_country if delivery.customer_id else 'US'
+
+
+def geocode_delivery_pickup(delivery):
+    """Link the delivery's geocoded pickup, re-geocoding when ``pickup_location`` changed."""
+    country = _pickup_country(delivery)
+    if delivery.pickup_location and not address_is_current(delivery.pickup_address, delivery.pickup_location, country):
+        delivery.pickup_address = validate_address(delivery.pickup_location, country)
+        delivery.save(update_fields=['pickup_address'])
+    return delivery.pickup_address
+
+
+def geocode_driver_home_bases(drivers) -> int:
+    """Batch-geocode home bases that are missing or stale; returns the number of drivers updated."""
+    stale = [
+        driver for driver in drivers
+        if driver.full_address
+        and not address_is_current(driver.home_address, driver.full_address, driver.address_country)
+    ]
+    addresses = validate_addresses([(driver.full_address, driver.address_country) for driver in stale])
+    for driver, address in zip(stale, addresses):
+        driver.home_address = address
+    if stale:
+        Driver.objects.bulk_update(stale, ['home_address'])
+        # bulk_update skips the post_save receivers that maintain the geo index
+        invalidate_driver_geo_index()
+    return len(stale)
+
+
+def nearest_eligible_drivers(delivery, *, k=DEFAULT_NEARBY_DRIVERS, max_km=None) -> dict:
+    """Up to ``k`` dispatch-eligible drivers within ``max_km`` of the pickup, nearest first."""
+    if max_km is None:
+        max_km = getattr(settings, 'PROXIMITY_MAX_KM', DEFAULT_PROXIMITY_MAX_KM)
+    pickup = delivery.pickup_address
+    if (
+        not address_is_current(pickup, delivery.pickup_location, _pickup_country(delivery))
+        or pickup.latitude is None
+        or pickup.longitude is None
+    ):
+        raise ValidationError({'pickup_location': 'Pickup location has not been geocoded.'})
+
+    candidates = get_driver_geo_index().nearest(pickup.latitude, pickup.longitude, max_km=max_km)
+    found = []
+    while len(found) < k:
+        batch = list(islice(candidates, 2 * k))
+        if not batch:
+            break
+        eligibility = get_dispatch_eligibility_for_drivers([driver_id for driver_id, _ in batch])
+        found.extend(
+            (driver_id, km) for driver_id, km in batch
+            if eligibility.get(driver_id, {}).get('eligible')
+        )
+    found = found[:k]
+
+    names = {
+        row['id']: row
+        for row in Driver.objects.filter(id__in=[driver_id for driver_id, _ in found])
+        .values('id', 'first_name', 'last_name', 'phone_number')
+    }
+    return {
+        'delivery_id': delivery.id,
+        'pickup': {'latitude': pickup.latitude, 'longitude': pickup.longitude},
+        'max_km': max_km,
+        'drivers': [
+            {
+                'driver_id': driver_id,
+                'first_name': names[driver_id]['first_name'],
+                'last_name': names[driver_id]['last_name'],
+                'phone_number': names[driver_id]['phone_number'],
+                'distance_km': round(km, 2),
+            }
+            for driver_id, km in found
+            if driver_id in names
+        ],
+    }
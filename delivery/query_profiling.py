@@ -0,0 +1,111 @@
+"""Per-request SQL profiling: query count, DB time, slowest statements, duplicate fingerprints."""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('delivery.queries')
+
+DEFAULT_QUERY_BUDGET = 50
+SLOWEST_LIMIT = 5
+DUPLICATE_LIMIT = 5
+SQL_LOG_LENGTH = 300
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r'\s+')
+
+
+def profiling_enabled() -> bool:
+    return getattr(settings, 'QUERY_PROFILING_ENABLED', False)
+
+
+def query_budget() -> int:
+    return getattr(settings, 'QUERY_PROFILING_BUDGET', DEFAULT_QUERY_BUDGET)
+
+
+def fingerprint(sql: str) -> str:
+    """SQL shape with literals and IN-list lengths folded, so per-row queries group together."""
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _LITERAL.sub('?', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryProfile:
+    """Collects statements executed on every connection while ``capture()`` is active."""
+
+    def __init__(self):
+        self.statements = []  # (alias, sql, duration_ms)
+
+    def capture(self) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self._wrapper(connection.alias)))
+        return stack
+
+    def _wrapper(self, alias):
+        def wrapper(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.statements.append((alias, sql, (time.perf_counter() - started) * 1000))
+        return wrapper
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def db_time_ms(self) -> float:
+        return sum(duration for _, _, duration in self.statements)
+
+    def slowest(self, limit: int = SLOWEST_LIMIT) -> list[dict]:
+        ranked = sorted(self.statements, key=lambda statement: statement[2], reverse=True)[:limit]
+        return [
+            {'alias': alias, 'sql': sql[:SQL_LOG_LENGTH], 'duration_ms': round(duration, 2)}
+            for alias, sql, duration in ranked
+        ]
+
+    def duplicates(self, limit: int = DUPLICATE_LIMIT) -> list[dict]:
+        counts = Counter(fingerprint(sql) for _, sql, _ in self.statements)
+        return [
+            {'fingerprint': shape[:SQL_LOG_LENGTH], 'count': count}
+            for shape, count in counts.most_common(limit)
+            if count > 1
+        ]
+
+    def server_timing(self, total_ms: float) -> str:
+        return (
+            f'db;dur={self.db_time_ms:.1f};desc="{self.query_count} queries", '
+            f'app;dur={total_ms:.1f}'
+        )
+
+
+def log_query_profile(request, response, profile: QueryProfile, total_ms: float) -> None:
+    budget = query_budget()
+    extra = {
+        'event': 'db.request_profile',
+        'request_id': getattr(request, 'request_id', None),
+        'path': request.path,
+        'method': request.method,
+        'status_code': response.status_code,
+        'query_count': profile.query_count,
+        'query_budget': budget,
+        'db_time_ms': round(profile.db_time_ms, 2),
+        'total_time_ms': round(total_ms, 2),
+        'slowest_queries': profile.slowest(),
+        'duplicate_queries': profile.duplicates(),
+    }
+    if profile.query_count > budget:
+        logger.warning(
+            'Query budget exceeded: %s queries (budget %s) for %s %s',
+            profile.query_count, budget, request.method, request.path,
+            extra={**extra, 'event': 'db.query_budget_exceeded'},
+        )
+    else:
+        logger.info('Request query profile', extra=extra)
@@ -2,6 +2,7 @@
 
 from django.contrib.auth.models import User
 
+from .compliance_status_service import invalidate_fleet_summary_cache
 from .models import Customer, Driver, DriverApprovalStatus, VehicleApprovalStatus
 from .vehicle_onboarding_service import assign_vehicle_to_driver, create_vehicle_from_catalog
 
@@ -56,7 +57,7 @@ def create_driver_as_staff(validated_data: dict) -> Driver:
         is_superuser=False,
     )
 
-    return Driver.objects.create(
+    driver = Driver.objects.create(
         user=user,
         first_name=first_name,
         last_name=last_name,
@@ -64,6 +65,8 @@ def create_driver_as_staff(validated_data: dict) -> Driver:
         approval_status=DriverApprovalStatus.APPROVED if active else DriverApprovalStatus.PENDING,
         **validated_data,
     )
+    invalidate_fleet_summary_cache()
+    return driver
 
 
 def register_driver(validated_data: dict) -> Driver:
@@ -107,4 +110,5 @@ def register_driver(validated_data: dict) -> Driver:
         approval_status=DriverApprovalStatus.PENDING,
     )
     assign_vehicle_to_driver(driver, vehicle)
+    invalidate_fleet_summary_cache()
     return driver
@@ -29,6 +29,10 @@ from .registration_messages import (
     VIN_TAKEN,
 )
 from .driver_license_validation import list_license_regions, validate_driver_license_number
+from .delivery_status_service import MAX_BULK_TRANSITION
+from .driver_utils import CURRENT_ASSIGNMENT_ATTR
+from .pricing_service import MAX_QUOTES_PER_REQUEST
+from .proximity_service import DEFAULT_NEARBY_DRIVERS, MAX_NEARBY_DRIVERS
 from .vehicle_catalog_validation import (
     get_active_model_spec,
     max_capacity_for_spec,
@@ -277,6 +281,52 @@ class DeliverySerializer(serializers.ModelSerializer):
         return _validate_delivery_location_fields(data, self.instance)
 
 
+class DeliveryRowSerializer(DeliverySerializer):
+    """
+    Read-only DeliverySerializer output built from ``values()`` rows (see ``project``).
+
+    Customer and user columns come from the same join and no model instances are built, so
+    list pages cost one query plus pagination and less CPU per row.
+    """
+
+    CUSTOMER_FIELDS = ('customer_name', 'customer_email', 'customer_phone')
+    PROJECTION = (
+        'id', 'customer', 'pickup_location', 'dropoff_location', 'same_pickup_as_customer',
+        'use_preferred_pickup', 'same_dropoff_as_customer', 'item_description', 'status',
+        'delivery_date', 'delivery_time', 'special_instructions', 'estimated_cost',
+        'created_at', 'updated_at',
+        'customer__is_business', 'customer__company_name', 'customer__phone_number',
+        'customer__user__first_name', 'customer__user__last_name',
+        'customer__user__username', 'customer__user__email',
+    )
+
+    customer = serializers.IntegerField(read_only=True)
+    customer_name = serializers.SerializerMethodField()
+    customer_email = serializers.EmailField(source='customer__user__email', read_only=True)
+    customer_phone = serializers.CharField(source='customer__phone_number', read_only=True)
+
+    @classmethod
+    def project(cls, queryset):
+        return queryset.values(*cls.PROJECTION)
+
+    def get_customer_name(self, row):
+        return Customer.format_display_name(
+            is_business=row['customer__is_business'],
+            company_name=row['customer__company_name'],
+            first_name=row['customer__user__first_name'],
+            last_name=row['customer__user__last_name'],
+            username=row['customer__user__username'],
+        )
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        if row['customer'] is None:
+            # Matches DeliverySerializer, which skips customer.* fields without a customer.
+            for name in self.CUSTOMER_FIELDS:
+                data.pop(name, None)
+        return data
+
+
 class DeliveryCreateSerializer(serializers.ModelSerializer):
     """Serializer for customer creating their own delivery"""
     pickup_location = serializers.CharField(required=False, allow_blank=True, help_text="Pickup address (auto-filled if same_pickup_as_customer is True)")
@@ -325,44 +375,40 @@ class DriverSerializer(serializers.ModelSerializer):
         read_only_fields = ['approval_status', 'approval_rejection_reason', 'approved_at']
         # CIO DIRECTIVE: Removed deprecated 'name' field - use first_name + last_name from User model
     
+    def _current_assignment(self, obj):
+        """Open assignment for this driver; uses the list prefetch when present."""
+        assignments = getattr(obj, CURRENT_ASSIGNMENT_ATTR, None)
+        if assignments is None:
+            from django.utils import timezone
+            today = timezone.now().date()
+            current_assignment = DriverVehicle.objects.filter(
+                driver=obj,
+                assigned_from__lte=today
+            ).filter(
+                models.Q(assigned_to__isnull=True) | models.Q(assigned_to__gte=today)
+            ).select_related('vehicle').order_by('-assigned_from').first()
+            assignments = [current_assignment] if current_assignment else []
+            setattr(obj, CURRENT_ASSIGNMENT_ATTR, assignments)
+        return assignments[0] if assignments else None
+
+    def _current_vehicle_obj(self, obj):
+        assignment = self._current_assignment(obj)
+        return assignment.vehicle if assignment else None
+
     def get_current_vehicle(self, obj):
         """Get the currently assigned vehicle ID"""
-        from django.utils import timezone
-        today = timezone.now().date()
-        current_assignment = DriverVehicle.objects.filter(
-            driver=obj,
-            assigned_from__lte=today
-        ).filter(
-            models.Q(assigned_to__isnull=True) | models.Q(assigned_to__gte=today)
-        ).order_by('-assigned_from').first()
-        
-        return current_assignment.vehicle.id if current_assignment and current_assignment.vehicle else None
+        vehicle = self._current_vehicle_obj(obj)
+        return vehicle.id if vehicle else None
     
     def get_current_vehicle_plate(self, obj):
         """Get the currently assigned vehicle license plate"""
-        from django.utils import timezone
-        today = timezone.now().date()
-        current_assignment = DriverVehicle.objects.filter(
-            driver=obj,
-            assigned_from__lte=today
-        ).filter(
-            models.Q(assigned_to__isnull=True) | models.Q(assigned_to__gte=today)
-        ).order_by('-assigned_from').first()
-        
-        return current_assignment.vehicle.license_plate if current_assignment and current_assignment.vehicle else None
+        vehicle = self._current_vehicle_obj(obj)
+        return vehicle.license_plate if vehicle else None
     
     def get_current_vehicle_model(self, obj):
         """Get the currently assigned vehicle model"""
-        from django.utils import timezone
-        today = timezone.now().date()
-        current_assignment = DriverVehicle.objects.filter(
-            driver=obj,
-            assigned_from__lte=today
-        ).filter(
-            models.Q(assigned_to__isnull=True) | models.Q(assigned_to__gte=today)
-        ).order_by('-assigned_from').first()
-        
-        return current_assignment.vehicle.model if current_assignment and current_assignment.vehicle else None
+        vehicle = self._current_vehicle_obj(obj)
+        return vehicle.model if vehicle else None
     
     # CIO DIRECTIVE: Removed get_first_name/get_last_name methods
     # Direct field access to driver.first_name and driver.last_name now available
@@ -511,6 +557,22 @@ class StaffDriverCreateSerializer(serializers.ModelSerializer):
         return create_driver_as_staff(validated_data)
 
 
+REGISTRATION_VERIFIED_ATTR = '_registration_verified'
+
+
+class VehicleListSerializer(serializers.ListSerializer):
+    """Resolves ``registration_verified`` for a whole page with one bulk status lookup."""
+
+    def to_representation(self, data):
+        from .compliance_status_service import get_vehicle_statuses
+
+        vehicles = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        statuses = get_vehicle_statuses(vehicle.id for vehicle in vehicles)
+        for vehicle in vehicles:
+            setattr(vehicle, REGISTRATION_VERIFIED_ATTR, statuses[vehicle.id].has_verified_registration)
+        return super().to_representation(vehicles)
+
+
 class VehicleSerializer(serializers.ModelSerializer):
     capacity_display = serializers.CharField(read_only=True, help_text="Formatted capacity with unit")
     full_model = serializers.CharField(read_only=True, help_text="Combined make and model for backward compatibility")
@@ -528,12 +590,16 @@ class VehicleSerializer(serializers.ModelSerializer):
             'can_replace_vehicle',
         ]
         read_only_fields = ['approved_at']
+        list_serializer_class = VehicleListSerializer
 
     def get_identity_locked(self, obj: Vehicle) -> bool:
         from .vehicle_field_policy import identity_locked_for_driver
         return identity_locked_for_driver(obj)
 
     def get_registration_verified(self, obj: Vehicle) -> bool:
+        verified = getattr(obj, REGISTRATION_VERIFIED_ATTR, None)
+        if verified is not None:
+            return verified
         from .vehicle_field_policy import vehicle_has_verified_registration
         return vehicle_has_verified_registration(obj)
 
@@ -745,6 +811,84 @@ class DeliveryAssignmentSerializer(serializers.ModelSerializer):
         fields = ['id', 'delivery', 'customer_name', 'driver', 'driver_name', 'vehicle', 'vehicle_license_plate', 'assigned_at']
 
 
+class AutoDispatchSerializer(serializers.Serializer):
+    """Input for POST /api/assignments/auto-dispatch/ (Phase 4C)."""
+
+    date = serializers.DateField()
+    delivery_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    loads_kg = serializers.DictField(
+        child=serializers.FloatField(min_value=0),
+        required=False,
+        help_text='Delivery id -> load in kg; only vehicles that can carry it are considered.',
+    )
+    max_per_driver = serializers.IntegerField(min_value=1, required=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate_loads_kg(self, value):
+        try:
+            return {int(delivery_id): load for delivery_id, load in value.items()}
+        except ValueError:
+            raise serializers.ValidationError('Keys must be delivery ids.')
+
+
+class NearbyDriversQuerySerializer(serializers.Serializer):
+    """Query for GET /api/deliveries/{id}/nearby-drivers/ (Phase 4C)."""
+
+    k = serializers.IntegerField(min_value=1, max_value=MAX_NEARBY_DRIVERS, default=DEFAULT_NEARBY_DRIVERS)
+    max_km = serializers.FloatField(min_value=0, required=False)
+
+
+class BulkDeliveryTransitionSerializer(serializers.Serializer):
+    """Input for POST /api/deliveries/bulk-transition/ (Phase 4C)."""
+
+    delivery_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BULK_TRANSITION,
+    )
+    status = serializers.ChoiceField(choices=Delivery.STATUS_CHOICES)
+    from_status = serializers.ChoiceField(
+        choices=Delivery.STATUS_CHOICES,
+        required=False,
+        help_text='Only move deliveries currently in this status.',
+    )
+    reason = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+
+
+class QuoteRouteField(serializers.Field):
+    """``[pickup_lat, pickup_lng, dropoff_lat, dropoff_lng]`` as a float tuple."""
+
+    default_error_messages = {
+        'invalid': 'Expected [pickup_lat, pickup_lng, dropoff_lat, dropoff_lng].',
+        'out_of_range': 'Latitudes must be within ±90 and longitudes within ±180.',
+    }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (list, tuple)) or len(data) != 4:
+            self.fail('invalid')
+        try:
+            route = tuple(float(value) for value in data)
+        except (TypeError, ValueError):
+            self.fail('invalid')
+        if abs(route[0]) > 90 or abs(route[2]) > 90 or abs(route[1]) > 180 or abs(route[3]) > 180:
+            self.fail('out_of_range')
+        return route
+
+    def to_representation(self, value):
+        return list(value)
+
+
+class BulkQuoteSerializer(serializers.Serializer):
+    """Input for POST /api/deliveries/quotes/ (Phase 4C)."""
+
+    routes = serializers.ListField(child=QuoteRouteField(), allow_empty=False, max_length=MAX_QUOTES_PER_REQUEST)
+    model_spec_id = serializers.IntegerField(
+        min_value=1,
+        required=False,
+        help_text='Catalog spec of the vehicle; its payload class sets the surcharge for every route.',
+    )
+
+
 class DriverWithVehicleSerializer(serializers.ModelSerializer):
     """Specialized serializer for creating driver with immediate vehicle assignment"""
     vehicle_id = serializers.IntegerField(required=True, help_text="ID of vehicle to assign to this driver")
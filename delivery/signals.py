@@ -0,0 +1,27 @@
+"""Model signal wiring for the delivery app."""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+
+from .authentication import revoke_claims_on_profile_change, revoke_claims_on_user_save
+from .compliance_status_service import refresh_status_on_document_delete, refresh_status_on_document_save
+from .geo_index import remove_driver_location, update_driver_location
+from .models import Customer, Driver, LegalDocument, StaffProfile, VehicleManufacturer, VehicleModelSpec
+from .vehicle_catalog_cache import invalidate_model_spec_index, invalidate_vehicle_catalog
+
+for _model in (VehicleManufacturer, VehicleModelSpec):
+    post_save.connect(invalidate_vehicle_catalog, sender=_model, dispatch_uid=f'catalog_save_{_model.__name__}')
+    post_delete.connect(invalidate_vehicle_catalog, sender=_model, dispatch_uid=f'catalog_delete_{_model.__name__}')
+    post_save.connect(invalidate_model_spec_index, sender=_model, dispatch_uid=f'spec_index_save_{_model.__name__}')
+    post_delete.connect(invalidate_model_spec_index, sender=_model, dispatch_uid=f'spec_index_delete_{_model.__name__}')
+
+post_save.connect(update_driver_location, sender=Driver, dispatch_uid='driver_geo_index_save')
+post_delete.connect(remove_driver_location, sender=Driver, dispatch_uid='driver_geo_index_delete')
+
+post_save.connect(revoke_claims_on_user_save, sender=User, dispatch_uid='role_claims_user_save')
+for _model in (StaffProfile, Customer, Driver):
+    post_save.connect(revoke_claims_on_profile_change, sender=_model, dispatch_uid=f'role_claims_save_{_model.__name__}')
+    post_delete.connect(revoke_claims_on_profile_change, sender=_model, dispatch_uid=f'role_claims_delete_{_model.__name__}')
+
+post_save.connect(refresh_status_on_document_save, sender=LegalDocument, dispatch_uid='compliance_status_document_save')
+post_delete.connect(refresh_status_on_document_delete, sender=LegalDocument, dispatch_uid='compliance_status_document_delete')
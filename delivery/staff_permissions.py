@@ -39,19 +39,38 @@ def get_permissions_for_staff_role(staff_role: str) -> list[str]:
     return sorted(PERMISSIONS_BY_ROLE.get(staff_role, ()))
 
 
+# Resolved (staff_role, permissions) cached on the user instance; request.user lives
+# for one request, so every check after the first is an in-memory set lookup.
+STAFF_ACCESS_ATTR = '_staff_access'
+
+
+def get_staff_access(user: User) -> tuple[str, frozenset[str]]:
+    """(staff_role, permission codes) for an is_staff user, resolved once per user instance."""
+    access = getattr(user, STAFF_ACCESS_ATTR, None)
+    if access is None:
+        staff_role = get_staff_role_for_user(user)
+        access = (staff_role, PERMISSIONS_BY_ROLE.get(staff_role, frozenset()))
+        setattr(user, STAFF_ACCESS_ATTR, access)
+    return access
+
+
+def clear_staff_access(user: User) -> None:
+    """Drop the cached role/permissions after the user's staff profile changes."""
+    user.__dict__.pop(STAFF_ACCESS_ATTR, None)
+
+
 def user_has_staff_permission(user: User, permission: str) -> bool:
     """True when user is staff and their role grants the permission code."""
     if not user.is_staff:
         return False
-    staff_role = get_staff_role_for_user(user)
-    return permission in PERMISSIONS_BY_ROLE.get(staff_role, ())
+    return permission in get_staff_access(user)[1]
 
 
 def staff_can_view_operational_data(user: User) -> bool:
     """Staff with any read permission (all v1.0 staff roles)."""
     if not user.is_staff:
         return False
-    return any(user_has_staff_permission(user, perm) for perm in VIEW_PERMISSIONS)
+    return not get_staff_access(user)[1].isdisjoint(VIEW_PERMISSIONS)
 
 
 def require_staff_permission(user: User, permission: str, *, message: str | None = None) -> None:
@@ -7,7 +7,7 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 
 from .models import StaffProfile
 from .staff_constants import PERM_STAFF_MANAGE, StaffRole
-from .staff_permissions import user_has_staff_permission
+from .staff_permissions import clear_staff_access, user_has_staff_permission
 
 
 def require_can_manage_staff(user: User) -> None:
@@ -131,4 +131,7 @@ def update_staff_profile(
     if updates:
         user.save(update_fields=updates)
     profile.save()
+    clear_staff_access(user)
+    if actor.id == user.id:
+        clear_staff_access(actor)
     return profile
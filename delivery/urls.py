@@ -1,6 +1,6 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
-from delivery.views_auth import LoggingTokenObtainPairView
+from delivery.views_auth import LoggingTokenObtainPairView, RoleClaimsTokenRefreshView
+from delivery.views_export import DeliveryExportView, DocumentExportView, DriverExportView
 from delivery.views_me import CurrentUserView
 from .views import (
     DeliveryViewSet, DriverViewSet, VehicleViewSet, DriverVehicleViewSet,
@@ -25,8 +25,11 @@ router.register(r'staff', StaffUserViewSet, basename='staff')
 
 urlpatterns = [
     path('token/', LoggingTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', RoleClaimsTokenRefreshView.as_view(), name='token_refresh'),
     path('me/', CurrentUserView.as_view(), name='current_user'),
+    path('exports/deliveries/', DeliveryExportView.as_view(), name='export_deliveries'),
+    path('exports/drivers/', DriverExportView.as_view(), name='export_drivers'),
+    path('exports/documents/', DocumentExportView.as_view(), name='export_documents'),
 ]
 
 urlpatterns += router.urls
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""Precomputed vehicle catalog payload for the public catalog endpoint."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import uuid
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from .models import VehicleManufacturer, VehicleModelSpec
+from .vehicle_constants import max_vehicle_capacity_for_unit
+
+LB_TO_KG = 0.453592
+
+CATALOG_CACHE_KEY = 'vehicle_catalog:payload'
+# Held in the default cache so one delete reaches every worker (see CACHES). Signals
+# invalidate on save/delete; the timeout only bounds staleness after queryset.update()
+# or raw SQL edits, which bypass them.
+CATALOG_CACHE_SECONDS = 24 * 60 * 60
+CATALOG_MAX_AGE_SECONDS = 5 * 60
+
+
+def catalog_queryset():
+    active_specs = VehicleModelSpec.objects.filter(is_active=True).order_by('name', 'start_year')
+    return (
+        VehicleManufacturer.objects.filter(is_active=True)
+        .prefetch_related(Prefetch('model_specs', queryset=active_specs))
+        .filter(model_specs__is_active=True)
+        .distinct()
+        .order_by('name')
+    )
+
+
+def _build_catalog() -> dict:
+    from .serializers import VehicleManufacturerCatalogSerializer
+
+    data = VehicleManufacturerCatalogSerializer(catalog_queryset(), many=True).data
+    data = json.loads(json.dumps(data))
+    digest = hashlib.sha256(
+        json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8'),
+    ).hexdigest()
+    return {'data': data, 'etag': f'"{digest}"'}
+
+
+def get_vehicle_catalog() -> dict:
+    """``{'data': [...], 'etag': '"<sha256>"'}`` — built once, then served from the cache."""
+    catalog = cache.get(CATALOG_CACHE_KEY)
+    if catalog is None:
+        catalog = _build_catalog()
+        cache.set(CATALOG_CACHE_KEY, catalog, CATALOG_CACHE_SECONDS)
+    return catalog
+
+
+def invalidate_vehicle_catalog(**kwargs) -> None:
+    """Signal receiver: drop the cached catalog after a manufacturer or model spec changes."""
+    cache.delete(CATALOG_CACHE_KEY)
+
+
+# --- Process-local model spec index -------------------------------------------------
+#
+# Registration, replace, resubmit and vehicle updates validate against the catalog on
+# every request. Active specs are held per process keyed by id; a version stamp in the
+# default cache (Redis in deployments, see CACHES) tells every worker when to rebuild
+# after a catalog edit.
+
+SPEC_INDEX_VERSION_KEY = 'vehicle_catalog:spec_index_version'
+
+
+@dataclass(frozen=True, slots=True)
+class ModelSpecEntry:
+    id: int
+    manufacturer_id: int
+    manufacturer_name: str
+    name: str
+    start_year: int
+    end_year: int | None
+    max_payload_lb: int
+    max_towing_lb: int
+    notes: str
+    max_capacity_kg: int
+    max_capacity_lb: int
+
+    def to_model(self) -> VehicleModelSpec:
+        """Unsaved-looking instance with pk and manufacturer set, usable as a FK value."""
+        spec = VehicleModelSpec(
+            id=self.id,
+            manufacturer_id=self.manufacturer_id,
+            name=self.name,
+            start_year=self.start_year,
+            end_year=self.end_year,
+            max_payload_lb=self.max_payload_lb,
+            max_towing_lb=self.max_towing_lb,
+            notes=self.notes,
+            is_active=True,
+        )
+        spec._state.adding = False
+        spec.manufacturer = VehicleManufacturer(
+            id=self.manufacturer_id, name=self.manufacturer_name, is_active=True,
+        )
+        spec.manufacturer._state.adding = False
+        return spec
+
+
+_spec_index: dict[int, ModelSpecEntry] = {}
+_spec_index_version: str | None = None
+_spec_index_lock = threading.Lock()
+
+
+def _current_spec_index_version() -> str:
+    version = cache.get(SPEC_INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(SPEC_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SPEC_INDEX_VERSION_KEY)
+    return version
+
+
+def spec_entry_from_model(spec: VehicleModelSpec) -> ModelSpecEntry:
+    return ModelSpecEntry(
+        id=spec.id,
+        manufacturer_id=spec.manufacturer_id,
+        manufacturer_name=spec.manufacturer.name,
+        name=spec.name,
+        start_year=spec.start_year,
+        end_year=spec.end_year,
+        max_payload_lb=spec.max_payload_lb,
+        max_towing_lb=spec.max_towing_lb,
+        notes=spec.notes,
+        max_capacity_kg=min(int(round(spec.max_payload_lb * LB_TO_KG)), max_vehicle_capacity_for_unit('kg')),
+        max_capacity_lb=min(spec.max_payload_lb, max_vehicle_capacity_for_unit('lb')),
+    )
+
+
+def get_model_spec_index() -> dict[int, ModelSpecEntry]:
+    """Active specs (of active manufacturers) by id; rebuilt when the version stamp moves."""
+    global _spec_index, _spec_index_version
+    version = _current_spec_index_version()
+    if version == _spec_index_version:
+        return _spec_index
+    with _spec_index_lock:
+        if version != _spec_index_version:
+            specs = VehicleModelSpec.objects.select_related('manufacturer').filter(
+                is_active=True,
+                manufacturer__is_active=True,
+            )
+            _spec_index = {spec.id: spec_entry_from_model(spec) for spec in specs}
+            _spec_index_version = version
+    return _spec_index
+
+
+def invalidate_model_spec_index(**kwargs) -> None:
+    """Signal receiver: move the version stamp so every process rebuilds its index."""
+    cache.set(SPEC_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
@@ -5,14 +5,13 @@ from __future__ import annotations
 from django.core.exceptions import ValidationError
 
 from .models import VehicleModelSpec
+from .vehicle_catalog_cache import LB_TO_KG, ModelSpecEntry, get_model_spec_index, spec_entry_from_model
 from .vehicle_constants import (
     MAX_VEHICLE_CAPACITY_KG,
     MAX_VEHICLE_CAPACITY_LB,
     max_vehicle_capacity_for_unit,
 )
 
-LB_TO_KG = 0.453592
-
 
 def max_capacity_for_spec(spec: VehicleModelSpec, unit: str) -> int:
     """Effective max load: min(manufacturer rating, fleet policy cap)."""
@@ -23,17 +22,24 @@ def max_capacity_for_spec(spec: VehicleModelSpec, unit: str) -> int:
     return min(spec_kg, fleet_cap)
 
 
+def _spec_entry(spec: VehicleModelSpec) -> ModelSpecEntry:
+    """Indexed entry for ``spec``; specs outside the active index (retired) are read directly."""
+    entry = get_model_spec_index().get(spec.pk)
+    return entry if entry is not None else spec_entry_from_model(spec)
+
+
 def validate_model_year_for_spec(spec: VehicleModelSpec, year: int) -> None:
+    spec = _spec_entry(spec)
     if year < spec.start_year:
         raise ValidationError({
             'vehicle_year': (
-                f'{spec.manufacturer.name} {spec.name} is available from {spec.start_year}.'
+                f'{spec.manufacturer_name} {spec.name} is available from {spec.start_year}.'
             ),
         })
     if spec.end_year is not None and year > spec.end_year:
         raise ValidationError({
             'vehicle_year': (
-                f'{spec.manufacturer.name} {spec.name} was last sold in {spec.end_year}.'
+                f'{spec.manufacturer_name} {spec.name} was last sold in {spec.end_year}.'
             ),
         })
 
@@ -41,12 +47,13 @@ def validate_model_year_for_spec(spec: VehicleModelSpec, year: int) -> None:
 def validate_capacity_for_spec(spec: VehicleModelSpec, capacity: int, unit: str) -> None:
     if capacity <= 0:
         raise ValidationError({'vehicle_capacity': 'Capacity must be greater than 0.'})
-    allowed = max_capacity_for_spec(spec, unit)
+    spec = _spec_entry(spec)
+    allowed = spec.max_capacity_lb if unit == 'lb' else spec.max_capacity_kg
     if capacity > allowed:
         raise ValidationError({
             'vehicle_capacity': (
                 f'Capacity cannot exceed {allowed} {unit} for '
-                f'{spec.manufacturer.name} {spec.name} '
+                f'{spec.manufacturer_name} {spec.name} '
                 f'(manufacturer max {spec.max_payload_lb} lb; '
                 f'fleet max {MAX_VEHICLE_CAPACITY_KG} kg / {MAX_VEHICLE_CAPACITY_LB} lb).'
             ),
@@ -54,14 +61,13 @@ def validate_capacity_for_spec(spec: VehicleModelSpec, capacity: int, unit: str)
 
 
 def get_active_model_spec(spec_id: int) -> VehicleModelSpec:
+    """Active spec with its manufacturer attached, answered from the process-local index."""
     try:
-        spec = VehicleModelSpec.objects.select_related('manufacturer').get(
-            pk=spec_id,
-            is_active=True,
-            manufacturer__is_active=True,
-        )
-    except VehicleModelSpec.DoesNotExist as exc:
+        entry = get_model_spec_index().get(int(spec_id))
+    except (TypeError, ValueError):
+        entry = None
+    if entry is None:
         raise ValidationError({
             'vehicle_model_spec_id': 'Select a valid vehicle make and model from the list.',
-        }) from exc
-    return spec
+        })
+    return entry.to_model()
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
-from .compliance_constants import DocumentStatus, DocumentType
-from .models import LegalDocument, Vehicle, VehicleApprovalStatus
+from .compliance_status_service import get_vehicle_status
+from .models import Vehicle, VehicleApprovalStatus
 from .vehicle_catalog_validation import get_active_model_spec, validate_capacity_for_spec, validate_model_year_for_spec
 
 IDENTITY_FIELDS = frozenset({
@@ -21,11 +21,7 @@ IDENTITY_FIELDS = frozenset({
 
 
 def vehicle_has_verified_registration(vehicle: Vehicle) -> bool:
-    return LegalDocument.objects.filter(
-        vehicle=vehicle,
-        document_type=DocumentType.VEHICLE_REGISTRATION,
-        status=DocumentStatus.VERIFIED,
-    ).exists()
+    return get_vehicle_status(vehicle.id).has_verified_registration
 
 
 def identity_locked_for_driver(vehicle: Vehicle) -> bool:
@@ -12,22 +12,31 @@ from rest_framework.decorators import action
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.db import transaction
 from django.http import Http404
-from django.db.models import Prefetch
-from .models import Delivery, Driver, Vehicle, DriverVehicle, DeliveryAssignment, Customer, LegalDocument, VehicleManufacturer, VehicleModelSpec
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from DeliveryAppBackend.pagination import SelectablePagination
+from .models import Delivery, Driver, Vehicle, DriverVehicle, DeliveryAssignment, Customer, LegalDocument
 from .driver_utils import (
     get_current_vehicle,
     get_driver_for_user,
     get_driver_vehicle,
     list_driver_vehicle_history,
+    with_current_assignment,
 )
+from .vehicle_catalog_cache import CATALOG_MAX_AGE_SECONDS, catalog_queryset, get_vehicle_catalog
 from .vehicle_constants import MAX_VEHICLE_CAPACITY_KG, MAX_VEHICLE_CAPACITY_LB
 from .vehicle_utils import deactivate_vehicle, reactivate_vehicle, vehicle_has_history
 from .vehicle_update import serialize_vehicle_for_user, update_vehicle, user_can_read_vehicle
 from .auth_logging import log_registration_validation_failure
 from .driver_license_validation import list_license_regions
 from . import compliance_service
+from . import delivery_status_service
+from . import dispatch_service
+from . import pricing_service
+from . import proximity_service
 from . import driver_approval_service
 from . import vehicle_approval_service
 from .vehicle_replace_service import replace_driver_vehicle
@@ -44,6 +53,7 @@ from .permissions import (
     CanManageDriver,
     CanManageDriverVehicleAssignment,
     IsStaffUser,
+    driver_id_for_user,
     scope_customer_queryset,
     scope_delivery_queryset,
     scope_driver_queryset,
@@ -52,7 +62,7 @@ from .permissions import (
 )
 from .staff_constants import PERM_RESOURCES_WRITE, PERM_VEHICLES_REACTIVATE
 from .staff_permissions import user_has_staff_permission
-from .serializers import (DeliverySerializer, DriverSerializer, VehicleSerializer, DriverVehicleSerializer, 
+from .serializers import (AutoDispatchSerializer, BulkDeliveryTransitionSerializer, BulkQuoteSerializer, DeliverySerializer, DeliveryRowSerializer, NearbyDriversQuerySerializer, DriverSerializer, VehicleSerializer, DriverVehicleSerializer, 
                          DeliveryAssignmentSerializer, DriverWithVehicleSerializer, CustomerSerializer, 
                          CustomerRegistrationSerializer, CustomerMeSerializer, DeliveryCreateSerializer, DriverRegistrationSerializer,
                          DriverMeSerializer, DriverOwnedVehicleSerializer, LegalDocumentSerializer,
@@ -68,7 +78,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, CanManageCustomer]
 
     def get_queryset(self):
-        return scope_customer_queryset(self.request.user)
+        return scope_customer_queryset(self.request.user).select_related('user')
     
     @action(detail=False, methods=['post'], permission_classes=[])
     def register(self, request):
@@ -100,19 +110,23 @@ class CustomerViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def my_deliveries(self, request):
-        """Get current customer's deliveries"""
+        """Current customer's deliveries, newest first, paginated like the other lists."""
         try:
             customer = request.user.customer_profile
-            deliveries = customer.deliveries.all().order_by('-created_at')
-            serializer = DeliverySerializer(deliveries, many=True)
-            return Response(serializer.data)
         except Customer.DoesNotExist:
             return Response({'error': 'Customer profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        rows = DeliveryRowSerializer.project(customer.deliveries.order_by('-created_at', '-id'))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(DeliveryRowSerializer(page, many=True).data)
+        return Response(DeliveryRowSerializer(rows, many=True).data)
 
 
 class DeliveryViewSet(viewsets.ModelViewSet):
     queryset = Delivery.objects.all()
     permission_classes = [IsAuthenticated, CanManageDelivery]
+    pagination_class = SelectablePagination
+    cursor_ordering = ('-created_at', '-id')
 
     def get_serializer_class(self):
         if self.action == 'create' and not user_has_staff_permission(self.request.user, PERM_RESOURCES_WRITE):
@@ -120,8 +134,36 @@ class DeliveryViewSet(viewsets.ModelViewSet):
         return DeliverySerializer
 
     def get_queryset(self):
-        return scope_delivery_queryset(self.request.user)
-    
+        return scope_delivery_queryset(self.request.user).select_related('customer__user')
+
+    def perform_create(self, serializer):
+        proximity_service.geocode_delivery_pickup(serializer.save())
+
+    def perform_update(self, serializer):
+        """Status changes go through the lifecycle transition table, not a plain save."""
+        delivery = serializer.instance
+        new_status = serializer.validated_data.pop('status', None)
+        with transaction.atomic():
+            if new_status is not None and new_status != delivery.status:
+                delivery_status_service.transition_delivery(delivery, new_status, user=self.request.user)
+            else:
+                # The save below writes every column; lock the row so it cannot write back
+                # a status that a concurrent transition has already moved on from.
+                delivery.status = (
+                    Delivery.objects.select_for_update().values_list('status', flat=True).get(pk=delivery.pk)
+                )
+            serializer.save()
+        if 'pickup_location' in serializer.validated_data:
+            proximity_service.geocode_delivery_pickup(delivery)
+
+    def list(self, request, *args, **kwargs):
+        """Rows come from a values() projection joined to customer and user (no instances)."""
+        rows = DeliveryRowSerializer.project(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(DeliveryRowSerializer(page, many=True).data)
+        return Response(DeliveryRowSerializer(rows, many=True).data)
+
     @action(detail=False, methods=['post'])
     def request_delivery(self, request):
         """Customer endpoint to request a new delivery"""
@@ -134,6 +176,7 @@ class DeliveryViewSet(viewsets.ModelViewSet):
         serializer = DeliveryCreateSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             delivery = serializer.save()
+            proximity_service.geocode_delivery_pickup(delivery)
             return Response({
                 'message': 'Delivery requested successfully',
                 'delivery': DeliverySerializer(delivery).data
@@ -150,15 +193,50 @@ class DeliveryViewSet(viewsets.ModelViewSet):
                     raise PermissionDenied('You can only cancel your own deliveries.')
             except Customer.DoesNotExist:
                 raise PermissionDenied('Customer profile required.')
-        if delivery.status != 'Pending':
+        if delivery.status != delivery_status_service.PENDING:
             return Response(
                 {'error': 'Only pending deliveries can be cancelled.'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        delivery.status = 'Cancelled'
-        delivery.save(update_fields=['status', 'updated_at'])
+        delivery_status_service.transition_delivery(
+            delivery, delivery_status_service.CANCELLED, user=request.user, reason='cancel',
+        )
         return Response(DeliverySerializer(delivery).data)
 
+    @action(detail=False, methods=['post'], url_path='bulk-transition')
+    def bulk_transition(self, request):
+        """Move many deliveries to one status with conditional updates and audit rows (Phase 4C)."""
+        serializer = BulkDeliveryTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        result = delivery_status_service.transition_deliveries(
+            data['delivery_ids'],
+            data['status'],
+            user=request.user,
+            from_status=data.get('from_status'),
+            reason=data['reason'],
+            queryset=scope_delivery_queryset(request.user),
+        )
+        return Response(result)
+
+    @action(detail=False, methods=['post'], url_path='quotes')
+    def quotes(self, request):
+        """Distance, ETA and estimated cost for a batch of pickup/dropoff routes (Phase 4C)."""
+        serializer = BulkQuoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        routes = serializer.validated_data['routes']
+        spec_id = serializer.validated_data.get('model_spec_id')
+        quotes = pricing_service.price_routes(routes, [spec_id] * len(routes))
+        return Response({'count': len(quotes), 'quotes': quotes})
+
+    @action(detail=True, methods=['get'], url_path='nearby-drivers')
+    def nearby_drivers(self, request, pk=None):
+        """K nearest dispatch-eligible drivers to the pickup, nearest first (Phase 4C)."""
+        delivery = self.get_object()
+        serializer = NearbyDriversQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(proximity_service.nearest_eligible_drivers(delivery, **serializer.validated_data))
+
 
 class DriverViewSet(viewsets.ModelViewSet):
     queryset = Driver.objects.all()
@@ -171,7 +249,10 @@ class DriverViewSet(viewsets.ModelViewSet):
         return DriverSerializer
 
     def get_queryset(self):
-        return scope_driver_queryset(self.request.user)
+        queryset = scope_driver_queryset(self.request.user)
+        if self.action in ('list', 'retrieve'):
+            queryset = with_current_assignment(queryset)
+        return queryset
 
     @action(detail=False, methods=['get', 'patch'])
     def me(self, request):
@@ -483,11 +564,38 @@ class DriverViewSet(viewsets.ModelViewSet):
         if not compliance_service.user_can_access_driver(request.user, driver):
             return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
         if not staff_can_view_operational_data(request.user):
-            my_driver = get_driver_for_user(request.user)
-            if not my_driver or my_driver.id != driver.id:
+            if driver_id_for_user(request.user) != driver.id:
                 return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
         return Response(compliance_service.is_driver_eligible_for_dispatch(driver))
 
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='dispatch-eligibility',
+        url_name='bulk-dispatch-eligibility',
+    )
+    def bulk_dispatch_eligibility(self, request):
+        """Staff dispatch board — eligibility for many drivers at once (Phase 4C).
+
+        ``?ids=1,2,3`` limits the check to those drivers; otherwise every active driver.
+        """
+        raw_ids = request.query_params.get('ids')
+        if raw_ids:
+            try:
+                driver_ids = [int(part) for part in raw_ids.split(',') if part.strip()]
+            except ValueError:
+                return Response({'ids': 'Comma-separated driver ids expected.'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            driver_ids = list(
+                scope_driver_queryset(request.user).filter(active=True).values_list('id', flat=True)
+            )
+        results = compliance_service.get_dispatch_eligibility_for_drivers(driver_ids)
+        return Response([
+            {'driver_id': driver_id, **results[driver_id]}
+            for driver_id in dict.fromkeys(driver_ids)
+            if driver_id in results
+        ])
+
     @action(
         detail=True,
         methods=['post'],
@@ -687,15 +795,19 @@ class DriverVehicleViewSet(viewsets.ModelViewSet):
     queryset = DriverVehicle.objects.all()
     serializer_class = DriverVehicleSerializer
     permission_classes = [IsAuthenticated, CanManageDriverVehicleAssignment]
+    pagination_class = SelectablePagination
+    cursor_ordering = ('-assigned_from', '-id')
 
     def get_queryset(self):
         return scope_driver_vehicle_queryset(self.request.user)
 
 
 class DeliveryAssignmentViewSet(viewsets.ModelViewSet):
-    queryset = DeliveryAssignment.objects.all()
+    queryset = DeliveryAssignment.objects.select_related('driver', 'vehicle', 'delivery__customer__user')
     serializer_class = DeliveryAssignmentSerializer
     permission_classes = [IsAuthenticated, CanManageDeliveryAssignment]
+    pagination_class = SelectablePagination
+    cursor_ordering = ('-assigned_at', '-id')
 
     def perform_create(self, serializer):
         serializer.save()
@@ -708,6 +820,21 @@ class DeliveryAssignmentViewSet(viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         instance.delete()
 
+    @action(detail=False, methods=['post'], url_path='auto-dispatch')
+    def auto_dispatch(self, request):
+        """Plan and assign a day's Pending deliveries to eligible drivers in one call (Phase 4C)."""
+        serializer = AutoDispatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        plan = dispatch_service.auto_dispatch(
+            data['date'],
+            delivery_ids=data.get('delivery_ids'),
+            loads_kg=data.get('loads_kg'),
+            max_per_driver=data.get('max_per_driver'),
+            dry_run=data['dry_run'],
+        )
+        return Response(plan, status=status.HTTP_200_OK if data['dry_run'] else status.HTTP_201_CREATED)
+
 
 class LegalDocumentViewSet(
     mixins.RetrieveModelMixin,
@@ -816,14 +943,39 @@ class ComplianceAdminViewSet(viewsets.ViewSet):
         days = int(request.query_params.get('days', 30))
         return Response(compliance_service.get_fleet_compliance_summary(expiring_within_days=days))
 
+    def _keyset_params(self, request):
+        """``(cursor, limit)`` when the client opts into keyset paging, else None."""
+        params = request.query_params
+        if 'cursor' not in params and 'limit' not in params:
+            return None
+        try:
+            limit = int(params.get('limit', compliance_service.ADMIN_LIST_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        return params.get('cursor') or None, limit
+
     @action(detail=False, methods=['get'], url_path='inbox')
     def inbox(self, request):
+        """Plain list by default; ``?limit=&cursor=`` returns ``{results, next_cursor}``."""
+        keyset = self._keyset_params(request)
+        if keyset:
+            cursor, limit = keyset
+            return Response(compliance_service.page_admin_compliance_inbox(cursor=cursor, limit=limit))
         return Response(compliance_service.list_admin_compliance_inbox())
 
     @action(detail=False, methods=['get'], url_path='expiring')
     def expiring(self, request):
         days = int(request.query_params.get('days', 30))
         include_expired = request.query_params.get('include_expired', 'true').lower() != 'false'
+        keyset = self._keyset_params(request)
+        if keyset:
+            cursor, limit = keyset
+            return Response(compliance_service.page_admin_expiring_documents(
+                within_days=days,
+                include_expired=include_expired,
+                cursor=cursor,
+                limit=limit,
+            ))
         rows = compliance_service.list_admin_expiring_documents(
             within_days=days,
             include_expired=include_expired,
@@ -839,11 +991,16 @@ class VehicleCatalogViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
 
     def get_queryset(self):
-        active_specs = VehicleModelSpec.objects.filter(is_active=True).order_by('name', 'start_year')
-        return (
-            VehicleManufacturer.objects.filter(is_active=True)
-            .prefetch_related(Prefetch('model_specs', queryset=active_specs))
-            .filter(model_specs__is_active=True)
-            .distinct()
-            .order_by('name')
-        )
\ No newline at end of file
+        return catalog_queryset()
+
+    def list(self, request, *args, **kwargs):
+        """Serve the cached catalog with a strong ETag; matching If-None-Match gets a 304."""
+        catalog = get_vehicle_catalog()
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if catalog['etag'] in if_none_match or '*' in if_none_match:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(catalog['data'])
+        response['ETag'] = catalog['etag']
+        patch_cache_control(response, public=True, max_age=CATALOG_MAX_AGE_SECONDS)
+        return response
\ No newline at end of file
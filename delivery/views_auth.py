@@ -1,11 +1,14 @@
 from rest_framework.exceptions import APIException
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from .auth_logging import log_jwt_login_failure
+from .authentication import RoleClaimsTokenRefreshSerializer, RoleTokenObtainPairSerializer
 
 
 class LoggingTokenObtainPairView(TokenObtainPairView):
-    """JWT token endpoint with structured logging on failed login."""
+    """JWT token endpoint with structured logging on failed login; tokens carry role claims."""
+
+    serializer_class = RoleTokenObtainPairSerializer
 
     def post(self, request, *args, **kwargs):
         try:
@@ -13,3 +16,9 @@ class LoggingTokenObtainPairView(TokenObtainPairView):
         except APIException:
             log_jwt_login_failure(request, request.data.get('username', ''))
             raise
+
+
+class RoleClaimsTokenRefreshView(TokenRefreshView):
+    """Token refresh that re-resolves role claims from the database."""
+
+    serializer_class = RoleClaimsTokenRefreshSerializer
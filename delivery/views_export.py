@@ -0,0 +1,50 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.views import APIView
+
+from .export_service import (
+    DELIVERY_EXPORT,
+    DOCUMENT_EXPORT,
+    DRIVER_EXPORT,
+    EXPORT_CONTENT_TYPES,
+    build_export_queryset,
+    export_rows,
+    parse_export_format,
+)
+from .permissions import CanExportData
+
+
+class ExportView(APIView):
+    """
+    Stream ``export_spec`` rows as NDJSON (default) or CSV (``?export_format=csv``).
+
+    Filters: ``status`` (comma-separated), ``date_from`` / ``date_to`` (YYYY-MM-DD).
+    """
+
+    permission_classes = [CanExportData]
+    export_spec = None
+
+    def get(self, request):
+        export_format = parse_export_format(request.query_params)
+        queryset = build_export_queryset(self.export_spec, request.user, request.query_params)
+        response = StreamingHttpResponse(
+            export_rows(self.export_spec, queryset, export_format),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        filename = f'{self.export_spec.name}-{timezone.now():%Y%m%d-%H%M%S}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class DeliveryExportView(ExportView):
+    export_spec = DELIVERY_EXPORT
+
+
+class DriverExportView(ExportView):
+    export_spec = DRIVER_EXPORT
+
+
+class DocumentExportView(ExportView):
+    """Also filters on ``document_type``; dates apply to ``expiry_date``."""
+
+    export_spec = DOCUMENT_EXPORT
@@ -0,0 +1,17 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from DeliveryAppBackend.metrics import REGISTRY
+
+from .permissions import CanViewMetrics
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsView(APIView):
+    """Prometheus text exposition of the process (or multi-process) metrics registry."""
+
+    permission_classes = [CanViewMetrics]
+
+    def get(self, request):
+        return HttpResponse(REGISTRY.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,399 @@
+"""Seed a synthetic fleet and measure per-endpoint SQL query counts and latency.
+
+Used by tests/test_endpoint_benchmarks.py. Rows are bulk-inserted (model ``save`` hooks are
+skipped) so 10k-driver fleets seed in seconds; compliance status rows are then computed the
+same way the app does.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from delivery.authentication import RoleClaimsRefreshToken
+from delivery.compliance_constants import DocumentStatus, DocumentType
+from delivery.compliance_status_service import refresh_compliance_statuses
+from delivery.driver_utils import current_assignment_queryset
+from delivery.models import (
+    Customer,
+    Delivery,
+    DeliveryAssignment,
+    Driver,
+    DriverApprovalStatus,
+    DriverVehicle,
+    LegalDocument,
+    Vehicle,
+    VehicleApprovalStatus,
+)
+from delivery.seed_helpers import get_model_spec, get_or_create_seed_staff
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class BenchmarkFleet:
+    staff: User
+    driver_ids: list[int]
+    vehicle_ids: list[int]
+    delivery_ids: list[int]
+
+    @property
+    def size(self) -> int:
+        return len(self.driver_ids)
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    path: str
+    # Max SQL queries per request; a per-row (N+1) regression blows through it at any fleet size.
+    query_budget: int
+
+    def url(self, fleet: BenchmarkFleet) -> str:
+        return self.path.format(driver_id=fleet.driver_ids[0])
+
+
+@dataclass
+class EndpointResult:
+    name: str
+    path: str
+    fleet_size: int
+    status_code: int
+    queries: int
+    query_budget: int
+    latencies_ms: list[float] = field(repr=False)
+
+    @property
+    def p50_ms(self) -> float:
+        return percentile(self.latencies_ms, 50)
+
+    @property
+    def p95_ms(self) -> float:
+        return percentile(self.latencies_ms, 95)
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'path': self.path,
+            'fleet_size': self.fleet_size,
+            'status_code': self.status_code,
+            'queries': self.queries,
+            'query_budget': self.query_budget,
+            'p50_ms': round(self.p50_ms, 2),
+            'p95_ms': round(self.p95_ms, 2),
+            'samples': len(self.latencies_ms),
+        }
+
+
+ENDPOINTS = (
+    Endpoint('drivers', '/api/drivers/', 6),
+    Endpoint('vehicles', '/api/vehicles/', 4),
+    Endpoint('deliveries', '/api/deliveries/', 2),
+    Endpoint('assignments', '/api/assignments/', 2),
+    Endpoint('customers', '/api/customers/', 2),
+    Endpoint('driver_documents', '/api/drivers/{driver_id}/documents/', 5),
+    Endpoint('compliance_summary', '/api/compliance/admin/summary/', 4),
+    Endpoint('compliance_inbox', '/api/compliance/admin/inbox/?limit=50', 4),
+    Endpoint('compliance_expiring', '/api/compliance/admin/expiring/?limit=50', 4),
+    Endpoint('dispatch_eligibility', '/api/drivers/{driver_id}/dispatch-eligibility/', 12),
+    Endpoint('vehicle_catalog', '/api/vehicle-catalog/', 2),
+)
+
+
+# Indexes the current-assignment lookup may seek on (see DriverVehicle.Meta.indexes).
+CURRENT_ASSIGNMENT_INDEXES = ('drivervehicle_driver_from_idx', 'drivervehicle_open_driver_idx')
+
+
+@dataclass
+class LookupResult:
+    name: str
+    history_rows: int
+    queries: int
+    plan: str
+    latencies_ms: list[float] = field(repr=False)
+
+    @property
+    def p50_ms(self) -> float:
+        return percentile(self.latencies_ms, 50)
+
+    @property
+    def uses_index(self) -> bool:
+        return any(name in self.plan for name in CURRENT_ASSIGNMENT_INDEXES)
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'history_rows': self.history_rows,
+            'queries': self.queries,
+            'uses_index': self.uses_index,
+            'plan': self.plan,
+            'p50_ms': round(self.p50_ms, 3),
+            'p95_ms': round(percentile(self.latencies_ms, 95), 3),
+            'samples': len(self.latencies_ms),
+        }
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Nearest-rank percentile; fine for the handful of samples a benchmark run collects."""
+    ordered = sorted(samples)
+    rank = max(1, -(-pct * len(ordered) // 100))
+    return ordered[rank - 1]
+
+
+def configured_fleet_sizes(default: tuple[int, ...]) -> tuple[int, ...]:
+    """``BENCHMARK_FLEET_SIZES=100,1000,10000`` overrides the sizes a run seeds."""
+    raw = os.environ.get('BENCHMARK_FLEET_SIZES', '')
+    sizes = tuple(int(part) for part in raw.split(',') if part.strip())
+    return sizes or default
+
+
+def configured_history_sizes(default: tuple[int, ...]) -> tuple[int, ...]:
+    """``BENCHMARK_ASSIGNMENT_HISTORY=0,100,1000`` closed assignments per driver, cumulative."""
+    raw = os.environ.get('BENCHMARK_ASSIGNMENT_HISTORY', '')
+    sizes = tuple(int(part) for part in raw.split(',') if part.strip())
+    return sizes or default
+
+
+def configured_repeat(default: int) -> int:
+    return int(os.environ.get('BENCHMARK_REPEAT', default))
+
+
+def seed_fleet(size: int, *, prefix: str = 'bench') -> BenchmarkFleet:
+    """
+    ``size`` approved drivers, each with an assigned vehicle, a verified license, a pending
+    registration and one assigned delivery; one customer per ten drivers.
+    """
+    staff = get_or_create_seed_staff()
+    spec = get_model_spec('Ford', 'F-150')
+    today = timezone.now().date()
+    now = timezone.now()
+
+    users = User.objects.bulk_create(
+        [
+            User(username=f'{prefix}.driver{n}', email=f'{prefix}.driver{n}@example.com')
+            for n in range(size)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    drivers = Driver.objects.bulk_create(
+        [
+            Driver(
+                user=user,
+                first_name='Bench',
+                last_name=f'Driver{n}',
+                phone_number='5550000000',
+                license_number=f'{prefix.upper()}DL{n:07d}',
+                license_issuing_region='CA-BC',
+                approval_status=DriverApprovalStatus.APPROVED,
+                approved_at=now,
+                approved_by=staff,
+            )
+            for n, user in enumerate(users)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    vehicles = Vehicle.objects.bulk_create(
+        [
+            Vehicle(
+                license_plate=f'{prefix.upper()[:2]}{n:07d}',
+                model_spec=spec,
+                make=spec.manufacturer.name,
+                model=spec.name,
+                year=2022,
+                vin=f'1{prefix.upper()[:4]:<4}{n:012d}'[:17],
+                capacity=1000,
+                capacity_unit='kg',
+                approval_status=VehicleApprovalStatus.APPROVED,
+                approved_at=now,
+                approved_by=staff,
+            )
+            for n in range(size)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    DriverVehicle.objects.bulk_create(
+        [
+            DriverVehicle(driver=driver, vehicle=vehicle, assigned_from=today)
+            for driver, vehicle in zip(drivers, vehicles)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    documents = []
+    for driver, vehicle in zip(drivers, vehicles):
+        documents.append(LegalDocument(
+            document_type=DocumentType.DRIVER_LICENSE,
+            driver=driver,
+            status=DocumentStatus.VERIFIED,
+            expiry_date=today + timedelta(days=60),
+            verified_by=staff,
+            verified_at=now,
+        ))
+        documents.append(LegalDocument(
+            document_type=DocumentType.VEHICLE_REGISTRATION,
+            vehicle=vehicle,
+            status=DocumentStatus.PENDING,
+            expiry_date=today + timedelta(days=20),
+        ))
+    LegalDocument.objects.bulk_create(documents, batch_size=BATCH_SIZE)
+
+    customer_users = User.objects.bulk_create(
+        [
+            User(username=f'{prefix}.customer{n}', email=f'{prefix}.customer{n}@example.com')
+            for n in range(max(1, size // 10))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    customers = Customer.objects.bulk_create(
+        [
+            Customer(
+                user=user,
+                phone_number='5550000001',
+                address_street=f'{n} Bench St',
+                address_city='Vancouver',
+                address_state='BC',
+                address_postal_code='V5K0A1',
+                address_country='CA',
+            )
+            for n, user in enumerate(customer_users)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    deliveries = Delivery.objects.bulk_create(
+        [
+            Delivery(
+                customer=customers[n % len(customers)],
+                pickup_location=f'{n} Pickup Rd, Vancouver, BC',
+                dropoff_location=f'{n} Dropoff Ave, Burnaby, BC',
+                item_description='Sofa',
+                delivery_date=today,
+            )
+            for n in range(size)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    DeliveryAssignment.objects.bulk_create(
+        [
+            DeliveryAssignment(delivery=delivery, driver=driver, vehicle=vehicle)
+            for delivery, driver, vehicle in zip(deliveries, drivers, vehicles)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    driver_ids = [driver.id for driver in drivers]
+    vehicle_ids = [vehicle.id for vehicle in vehicles]
+    refresh_compliance_statuses(driver_ids=driver_ids, vehicle_ids=vehicle_ids)
+    return BenchmarkFleet(
+        staff=staff,
+        driver_ids=driver_ids,
+        vehicle_ids=vehicle_ids,
+        delivery_ids=[delivery.id for delivery in deliveries],
+    )
+
+
+def staff_client(fleet: BenchmarkFleet) -> APIClient:
+    client = APIClient()
+    token = RoleClaimsRefreshToken.for_user(fleet.staff).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def measure_endpoint(client: APIClient, endpoint: Endpoint, fleet: BenchmarkFleet, *, repeat: int) -> EndpointResult:
+    """One warm-up request, a query count for the next, then ``repeat`` timed requests."""
+    url = endpoint.url(fleet)
+    client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    # Read now: every request_started signal clears connection.queries.
+    queries = len(ctx.captured_queries)
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return EndpointResult(
+        name=endpoint.name,
+        path=url,
+        fleet_size=fleet.size,
+        status_code=response.status_code,
+        queries=queries,
+        query_budget=endpoint.query_budget,
+        latencies_ms=latencies,
+    )
+
+
+def seed_assignment_history(fleet: BenchmarkFleet, per_driver: int, *, offset: int = 0) -> int:
+    """
+    ``per_driver`` closed 30-day assignments per driver, the newest starting ``offset + 1``
+    months ago (pass the running total as ``offset`` to keep growing history). Returns rows inserted.
+    """
+    today = timezone.now().date()
+    rows = []
+    for driver_id, vehicle_id in zip(fleet.driver_ids, fleet.vehicle_ids):
+        for n in range(offset, offset + per_driver):
+            assigned_from = today - timedelta(days=30 * (n + 1))
+            rows.append(DriverVehicle(
+                driver_id=driver_id,
+                vehicle_id=vehicle_id,
+                assigned_from=assigned_from,
+                assigned_to=assigned_from + timedelta(days=29),
+            ))
+    DriverVehicle.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def explain(queryset) -> str:
+    """Query plan text. On PostgreSQL seq scans are disabled for the transaction so a tiny
+    benchmark table still shows which index the planner *can* use."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+def measure_current_assignment(fleet: BenchmarkFleet, *, repeat: int) -> LookupResult:
+    """Plan, query count and latency of ``get_current_assignment`` for the first driver."""
+    driver_id = fleet.driver_ids[0]
+    queryset = current_assignment_queryset(driver_id)
+    with CaptureQueriesContext(connection) as ctx:
+        current_assignment_queryset(driver_id).first()
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        current_assignment_queryset(driver_id).first()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return LookupResult(
+        name='current_assignment',
+        history_rows=DriverVehicle.objects.count(),
+        queries=len(ctx.captured_queries),
+        plan=explain(queryset[:1]),
+        latencies_ms=latencies,
+    )
+
+
+def build_report(results: list[EndpointResult], *, lookups: list[LookupResult] = ()) -> dict:
+    report = {
+        'generated_at': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'results': [result.as_dict() for result in results],
+    }
+    if lookups:
+        report['lookups'] = [lookup.as_dict() for lookup in lookups]
+    return report
+
+
+def write_report(report: dict, path: str | os.PathLike) -> Path:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+    return target
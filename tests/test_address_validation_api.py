@@ -2,13 +2,16 @@
 Additional comprehensive tests for Address Validation API endpoints
 Testing views, serializers, and service error conditions
 """
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from unittest.mock import patch, Mock
+from address_validation import geocode_cache
 from address_validation.models import ValidatedAddress, AddressValidationLog
 from address_validation.serializers import (
     ValidatedAddressSerializer, 
@@ -155,6 +158,60 @@ class AddressValidationAPITests(APITestCase):
         self.assertEqual(response.data['success_rate'], 85.0)
 
 
+class BulkAddressValidationAPITests(APITestCase):
+    """Test bulk validation endpoint"""
+    
+    url = '/api/address-validation/validate-bulk/'
+    
+    def setUp(self):
+        geocode_cache.clear()
+        self.user = User.objects.create_user(username='bulkuser', password='testpass123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+    
+    def _post(self, addresses):
+        return self.client.post(self.url, {'addresses': addresses}, format='json')
+    
+    def test_results_in_input_order_with_duplicates_validated_once(self):
+        """Inputs with the same normalized key share one row"""
+        response = self._post([
+            {'address': '12 Oak St, Springfield, IL 62701'},
+            {'address': '500 Pine Ave, Toronto, ON M5V 3A8', 'country_hint': 'CA'},
+            {'address': '12 OAK ST  Springfield IL 62701'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]['original_address'], '12 Oak St, Springfield, IL 62701')
+        self.assertEqual(results[1]['country'], 'Canada')
+        self.assertEqual(results[0]['id'], results[2]['id'])
+        self.assertEqual(ValidatedAddress.objects.count(), 2)
+        self.assertEqual(AddressValidationLog.objects.count(), 2)
+    
+    def test_repeat_batch_served_from_cache(self):
+        """A repeated batch creates no new rows"""
+        batch = [{'address': f'{n} Maple Rd, Austin, TX 78701'} for n in range(1, 4)]
+        first = self._post(batch).data['results']
+        second = self._post(batch).data['results']
+        self.assertEqual([row['id'] for row in first], [row['id'] for row in second])
+        self.assertEqual(ValidatedAddress.objects.count(), 3)
+    
+    def test_query_count_independent_of_batch_size(self):
+        """Misses are written with bulk_create"""
+        def run(prefix, size):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self._post([{'address': f'{n} {prefix} St, Austin, TX'} for n in range(size)])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(ctx.captured_queries)
+        self.assertEqual(run('Cedar', 2), run('Birch', 12))
+    
+    def test_rejects_empty_and_oversized_batches(self):
+        """Batch size is bounded"""
+        self.assertEqual(self._post([]).status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = [{'address': f'{n} Elm St'} for n in range(501)]
+        self.assertEqual(self._post(too_many).status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class AddressValidationServiceErrorTests(TestCase):
     """Test error handling in address validation service"""
     
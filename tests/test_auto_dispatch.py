@@ -0,0 +1,241 @@
+# Phase 4C — automatic dispatch engine
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from delivery.dispatch_service import (
+    UNASSIGNED_DRIVER_LIMIT_REACHED,
+    UNASSIGNED_EXCEEDS_CAPACITY,
+    UNASSIGNED_NO_ELIGIBLE_DRIVER,
+    auto_dispatch,
+    vehicle_capacity_kg,
+)
+from delivery.models import (
+    Customer,
+    Delivery,
+    DeliveryAssignment,
+    DocumentType,
+    DriverApprovalStatus,
+    DriverVehicle,
+    LegalDocument,
+    StaffProfile,
+    VehicleApprovalStatus,
+)
+from delivery.seed_helpers import (
+    assign_vehicle_to_driver,
+    ensure_user_account,
+    get_or_create_seed_staff,
+    seed_compliance_documents,
+    upsert_catalog_vehicle,
+    upsert_driver,
+)
+from delivery.staff_constants import StaffRole
+
+
+class AutoDispatchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.staff = get_or_create_seed_staff()
+        self.plan_date = timezone.now().date() + timedelta(days=1)
+        customer_user = User.objects.create_user(username='dispatchcustomer', password='pass')
+        self.customer = Customer.objects.create(user=customer_user, phone_number='555-0500')
+        self._seq = 0
+
+    def _driver(self, *, capacity_kg=1000, compliant=True, approval_status=DriverApprovalStatus.APPROVED):
+        self._seq += 1
+        n = self._seq
+        user, _ = ensure_user_account(
+            username=f'dispatch.driver{n}',
+            email=f'dispatch.driver{n}@example.com',
+            password='pass',
+            first_name='Dispatch',
+            last_name=f'Driver{n}',
+        )
+        driver, _ = upsert_driver(
+            user=user,
+            staff=self.staff,
+            first_name='Dispatch',
+            last_name=f'Driver{n}',
+            phone_number='5550000000',
+            license_number=f'DISPDL{n:04d}',
+            license_issuing_region='CA-BC',
+            approval_status=approval_status,
+        )
+        vehicle, _ = upsert_catalog_vehicle(
+            license_plate=f'DSP{n:04d}',
+            manufacturer='Ford',
+            model='F-150',
+            year=2022,
+            vin=f'1DSPTEST{n:09d}',
+            capacity_kg=capacity_kg,
+        )
+        vehicle.approval_status = VehicleApprovalStatus.APPROVED
+        vehicle.save(update_fields=['approval_status'])
+        assign_vehicle_to_driver(driver, vehicle)
+        seed_compliance_documents(self.staff, driver, vehicle, 'full_verified' if compliant else 'none')
+        return driver, vehicle
+
+    def _delivery(self, **kwargs):
+        return Delivery.objects.create(
+            customer=self.customer,
+            pickup_location='1 Pickup St',
+            dropoff_location='2 Dropoff Ave',
+            delivery_date=kwargs.pop('delivery_date', self.plan_date),
+            **kwargs,
+        )
+
+    def test_assigns_pending_deliveries_to_eligible_drivers_only(self):
+        eligible, vehicle = self._driver()
+        self._driver(compliant=False)
+        deliveries = [self._delivery() for _ in range(3)]
+        self._delivery(status='Cancelled')
+        self._delivery(delivery_date=self.plan_date + timedelta(days=1))
+
+        plan = auto_dispatch(self.plan_date)
+
+        self.assertEqual(plan['eligible_drivers'], 1)
+        self.assertEqual(plan['unassigned'], [])
+        self.assertEqual(
+            sorted(row['delivery_id'] for row in plan['assigned']),
+            [delivery.id for delivery in deliveries],
+        )
+        rows = DeliveryAssignment.objects.filter(delivery__in=deliveries)
+        self.assertEqual({(row.driver_id, row.vehicle_id) for row in rows}, {(eligible.id, vehicle.id)})
+
+    def test_balances_by_existing_assignments_that_day(self):
+        busy, _ = self._driver()
+        free, _ = self._driver()
+        DeliveryAssignment.objects.create(delivery=self._delivery(status='En Route'), driver=busy)
+        new_delivery = self._delivery()
+
+        plan = auto_dispatch(self.plan_date)
+
+        self.assertEqual(plan['assigned'][0]['delivery_id'], new_delivery.id)
+        self.assertEqual(plan['assigned'][0]['driver_id'], free.id)
+
+    def test_known_loads_go_to_smallest_vehicle_that_fits(self):
+        small, small_vehicle = self._driver(capacity_kg=500)
+        large, large_vehicle = self._driver(capacity_kg=1200)
+        heavy = self._delivery()
+        light = self._delivery()
+        too_heavy = self._delivery()
+        self.assertEqual(vehicle_capacity_kg(small_vehicle), 500)
+
+        plan = auto_dispatch(
+            self.plan_date,
+            loads_kg={heavy.id: vehicle_capacity_kg(large_vehicle), light.id: 100, too_heavy.id: 5000},
+        )
+
+        by_delivery = {row['delivery_id']: row['driver_id'] for row in plan['assigned']}
+        self.assertEqual(by_delivery, {heavy.id: large.id, light.id: small.id})
+        self.assertEqual(plan['unassigned'], [{'delivery_id': too_heavy.id, 'reason': UNASSIGNED_EXCEEDS_CAPACITY}])
+
+    def test_spec_payload_caps_declared_capacity(self):
+        _, vehicle = self._driver(capacity_kg=1000)
+        vehicle.capacity = 99999
+        self.assertLess(vehicle_capacity_kg(vehicle), 99999)
+
+    def test_per_driver_limit(self):
+        self._driver()
+        deliveries = [self._delivery() for _ in range(3)]
+        plan = auto_dispatch(self.plan_date, max_per_driver=2)
+        self.assertEqual(len(plan['assigned']), 2)
+        self.assertEqual(
+            plan['unassigned'],
+            [{'delivery_id': deliveries[2].id, 'reason': UNASSIGNED_DRIVER_LIMIT_REACHED}],
+        )
+
+    def test_no_eligible_driver(self):
+        self._driver(compliant=False)
+        delivery = self._delivery()
+        plan = auto_dispatch(self.plan_date)
+        self.assertEqual(plan['unassigned'], [{'delivery_id': delivery.id, 'reason': UNASSIGNED_NO_ELIGIBLE_DRIVER}])
+        self.assertFalse(DeliveryAssignment.objects.exists())
+
+    def test_dry_run_writes_nothing_and_rerun_skips_assigned(self):
+        self._driver()
+        self._delivery()
+        self.assertEqual(len(auto_dispatch(self.plan_date, dry_run=True)['assigned']), 1)
+        self.assertFalse(DeliveryAssignment.objects.exists())
+        auto_dispatch(self.plan_date)
+        self.assertEqual(auto_dispatch(self.plan_date)['assigned'], [])
+        self.assertEqual(DeliveryAssignment.objects.count(), 1)
+
+    def test_assignment_committed_while_waiting_for_locks_is_not_duplicated(self):
+        driver, _ = self._driver()
+        taken = self._delivery()
+        free = self._delivery()
+        select_for_update = QuerySet.select_for_update
+
+        def lock_then_concurrent_commit(queryset, *args, **kwargs):
+            # Rows come from the pre-lock snapshot; another run's assignment lands after.
+            rows = list(select_for_update(queryset, *args, **kwargs))
+            DeliveryAssignment.objects.create(delivery=taken, driver=driver)
+            return rows
+
+        with patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=lock_then_concurrent_commit):
+            plan = auto_dispatch(self.plan_date)
+
+        self.assertEqual([row['delivery_id'] for row in plan['assigned']], [free.id])
+        self.assertEqual(DeliveryAssignment.objects.filter(delivery=taken).count(), 1)
+
+    def test_eligibility_evaluated_on_plan_date(self):
+        expiring, _ = self._driver()
+        handed_back, _ = self._driver()
+        steady, _ = self._driver()
+        LegalDocument.objects.filter(driver=expiring, document_type=DocumentType.DRIVER_LICENSE).update(
+            expiry_date=self.plan_date - timedelta(days=1),
+        )
+        DriverVehicle.objects.filter(driver=handed_back).update(assigned_to=self.plan_date)
+        self._delivery()
+
+        plan = auto_dispatch(self.plan_date)
+
+        self.assertEqual(plan['eligible_drivers'], 1)
+        self.assertEqual(plan['assigned'][0]['driver_id'], steady.id)
+
+    def test_query_count_constant_in_batch_size(self):
+        for _ in range(2):
+            self._driver()
+        self._delivery()
+        auto_dispatch(self.plan_date, dry_run=True)  # warm the model spec index
+        with CaptureQueriesContext(connection) as small:
+            auto_dispatch(self.plan_date, dry_run=True)
+        for _ in range(10):
+            self._delivery()
+        with CaptureQueriesContext(connection) as large:
+            auto_dispatch(self.plan_date, dry_run=True)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_endpoint_requires_assign_permission(self):
+        self._driver()
+        delivery = self._delivery()
+        read_only = User.objects.create_user(username='dispatchreadonly', password='pass', is_staff=True)
+        StaffProfile.objects.create(user=read_only, staff_role=StaffRole.READ_ONLY)
+        client = APIClient()
+        client.force_authenticate(read_only)
+        url = '/api/assignments/auto-dispatch/'
+        self.assertEqual(
+            client.post(url, {'date': self.plan_date.isoformat()}, format='json').status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        client.force_authenticate(self.staff)
+        self.assertEqual(client.post(url, {}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        response = client.post(
+            url,
+            {'date': self.plan_date.isoformat(), 'loads_kg': {str(delivery.id): 50}},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['assigned'][0]['delivery_id'], delivery.id)
+        self.assertIsNotNone(response.data['assigned'][0]['assignment_id'])
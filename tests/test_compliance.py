@@ -1135,6 +1135,69 @@ class Phase4CDispatchTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['driver'], self.driver.id)
 
+    def _make_driver(self, n, **driver_kwargs):
+        user = User.objects.create_user(username=f'bulk4c{n}', password='pass')
+        return Driver.objects.create(
+            user=user,
+            phone_number='555-0410',
+            license_number=f'DL-4C-B{n:03d}',
+            **driver_kwargs,
+        )
+
+    def test_bulk_eligibility_matches_per_driver(self):
+        from delivery.compliance_service import (
+            get_dispatch_eligibility_blockers,
+            get_dispatch_eligibility_for_drivers,
+        )
+        seed_full_driver_compliance(self.staff, self.driver, self.vehicle)
+        pending = self._make_driver(1, approval_status='PENDING')
+        inactive_vehicle = Vehicle.objects.create(
+            license_plate='4CB02',
+            make='Ram',
+            model='1500',
+            year=2021,
+            vin='1FT4CTEST00000002',
+            capacity=1200,
+            capacity_unit='kg',
+            active=False,
+            approval_status='APPROVED',
+        )
+        expired_driver = self._make_driver(2)
+        DriverVehicle.objects.create(
+            driver=expired_driver,
+            vehicle=inactive_vehicle,
+            assigned_from=timezone.now().date(),
+        )
+        seed_verified_vehicle_compliance(self.staff, inactive_vehicle, days=20)
+        LegalDocument.objects.create(
+            document_type=DocumentType.DRIVER_LICENSE,
+            driver=expired_driver,
+            status=DocumentStatus.EXPIRED,
+            expiry_date=date.today() - timedelta(days=5),
+        )
+
+        drivers = [self.driver, pending, expired_driver]
+        with self.assertNumQueries(3):
+            bulk = get_dispatch_eligibility_for_drivers([d.id for d in drivers])
+        for driver in drivers:
+            expected = get_dispatch_eligibility_blockers(driver)
+            self.assertEqual(bulk[driver.id]['blockers'], expected)
+            self.assertEqual(bulk[driver.id]['eligible'], not expected)
+        self.assertTrue(bulk[self.driver.id]['eligible'])
+        self.assertIn('driver_license_expired', bulk[expired_driver.id]['blockers'])
+
+    def test_bulk_eligibility_endpoint_staff_only(self):
+        other = self._make_driver(3)
+        response = self.staff_client.get(
+            f'/api/drivers/dispatch-eligibility/?ids={other.id},{self.driver.id}',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['driver_id'] for row in response.data], [other.id, self.driver.id])
+        self.assertIn('no_vehicle_assigned', response.data[0]['blockers'])
+
+        response = self.driver_client.get('/api/drivers/dispatch-eligibility/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
 
 class MisclassifiedDriverDocumentTests(TestCase):
     def setUp(self):
@@ -1180,3 +1243,102 @@ class MisclassifiedDriverDocumentTests(TestCase):
         self.assertEqual(count, 1)
         doc = LegalDocument.objects.get(driver=self.driver, document_type=DocumentType.DRIVER_LICENSE)
         self.assertEqual(doc.status, DocumentStatus.REJECTED)
+
+
+class ComplianceStatusTableTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='staff_status', password='pass', is_staff=True)
+        self.driver_user = User.objects.create_user(username='driver_status', password='pass')
+        self.driver = Driver.objects.create(
+            user=self.driver_user,
+            phone_number='555-0600',
+            license_number='DL-STATUS-001',
+        )
+        self.vehicle = Vehicle.objects.create(
+            license_plate='STAT001',
+            make='Ford',
+            model='F-150',
+            year=2022,
+            vin='1FTSTATUS0000001',
+            capacity=1500,
+            capacity_unit='kg',
+        )
+        DriverVehicle.objects.create(
+            driver=self.driver,
+            vehicle=self.vehicle,
+            assigned_from=timezone.now().date(),
+        )
+
+    def test_service_mutations_maintain_status_rows(self):
+        from delivery.models import ComplianceStatus
+
+        seed_full_driver_compliance(self.staff, self.driver, self.vehicle, days=20)
+        driver_row = ComplianceStatus.objects.get(driver=self.driver)
+        vehicle_row = ComplianceStatus.objects.get(vehicle=self.vehicle)
+        self.assertTrue(driver_row.is_fully_compliant)
+        self.assertTrue(vehicle_row.is_fully_compliant)
+        self.assertTrue(vehicle_row.has_verified_registration)
+        self.assertTrue(vehicle_row.has_expiring_docs)
+        self.assertEqual(vehicle_row.expiring_soon_count, 2)
+
+        summary = get_compliance_summary(self.driver)
+        self.assertTrue(summary['is_fully_compliant'])
+        self.assertEqual(summary['verified'], 3)
+        self.assertEqual(summary['expiring_soon'], 3)
+
+        LegalDocument.objects.filter(vehicle=self.vehicle).update(
+            expiry_date=date.today() - timedelta(days=1),
+        )
+        self.assertEqual(mark_expired_documents(), 2)
+        vehicle_row.refresh_from_db()
+        self.assertTrue(vehicle_row.has_expired_docs)
+        self.assertFalse(vehicle_row.is_fully_compliant)
+        self.assertIn('vehicle_registration_expired', vehicle_row.blockers)
+        self.assertFalse(is_vehicle_compliant(self.vehicle)['compliant'])
+
+    def test_reads_do_not_write_status_rows(self):
+        from delivery.models import ComplianceStatus
+
+        summary = get_compliance_summary(self.driver)
+        self.assertFalse(summary['is_fully_compliant'])
+        self.assertFalse(is_vehicle_compliant(self.vehicle)['compliant'])
+        self.assertFalse(ComplianceStatus.objects.exists())
+
+    def test_direct_document_writes_refresh_status(self):
+        from delivery.models import ComplianceStatus
+
+        document = LegalDocument.objects.create(
+            document_type=DocumentType.DRIVER_LICENSE,
+            driver=self.driver,
+            status=DocumentStatus.VERIFIED,
+            expiry_date=date.today() + timedelta(days=90),
+        )
+        self.assertFalse(ComplianceStatus.objects.get(driver=self.driver).has_missing_docs)
+        document.delete()
+        self.assertTrue(ComplianceStatus.objects.get(driver=self.driver).has_missing_docs)
+
+        LegalDocument.objects.create(document_type=DocumentType.DRIVER_LICENSE, driver=self.driver)
+        self.driver.delete()  # cascaded document deletes do not refresh the deleted driver
+        self.assertFalse(ComplianceStatus.objects.filter(driver_id=document.driver_id).exists())
+
+    def test_reconcile_repairs_drift_from_direct_writes(self):
+        from delivery.compliance_status_service import reconcile_compliance_statuses
+        from delivery.models import ComplianceStatus
+
+        LegalDocument.objects.create(
+            document_type=DocumentType.DRIVER_LICENSE,
+            driver=self.driver,
+            status=DocumentStatus.VERIFIED,
+            expiry_date=date.today() + timedelta(days=90),
+        )
+        reconcile_compliance_statuses()
+        # queryset.update() bypasses the document receivers.
+        LegalDocument.objects.filter(driver=self.driver).update(expiry_date=date.today() - timedelta(days=1))
+        self.assertEqual(ComplianceStatus.objects.get(driver=self.driver).blockers, [])
+
+        dry = reconcile_compliance_statuses(dry_run=True)
+        self.assertEqual(dry['repaired'], 1)
+        result = reconcile_compliance_statuses()
+        self.assertEqual(result['repaired'], 1)
+        self.assertEqual(ComplianceStatus.objects.get(driver=self.driver).blockers, ['driver_license_expired'])
+        self.assertEqual(reconcile_compliance_statuses()['repaired'], 0)
@@ -1,16 +1,19 @@
 # Phase 4D — admin compliance ops API
 
 from datetime import date, timedelta
+from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from delivery import compliance_service
 from delivery.compliance_constants import DocumentStatus, DocumentType
-from delivery.compliance_service import create_document, mark_verified
-from delivery.models import Driver, DriverApprovalStatus, DriverVehicle, Vehicle
+from delivery.compliance_service import create_document, get_fleet_compliance_summary, mark_verified
+from delivery.models import Driver, DriverApprovalStatus, DriverVehicle, LegalDocument, Vehicle
 
 
 def auth_client(user):
@@ -21,6 +24,7 @@ def auth_client(user):
 
 class ComplianceAdminAPITests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.staff = User.objects.create_user(username='staff4d', password='pass', is_staff=True)
         self.staff_client = auth_client(self.staff)
         self.driver_user = User.objects.create_user(username='driver4d', password='pass')
@@ -66,6 +70,39 @@ class ComplianceAdminAPITests(APITestCase):
         self.assertGreaterEqual(response.data['documents_pending'], 1)
         self.assertGreaterEqual(response.data['drivers_pending_approval'], 1)
 
+    def test_summary_is_two_aggregates_then_cached(self):
+        with self.assertNumQueries(2):
+            first = get_fleet_compliance_summary()
+        with self.assertNumQueries(0):
+            second = get_fleet_compliance_summary()
+        self.assertEqual(first, second)
+        self.assertEqual(first['drivers_pending_approval'], 1)
+
+    def test_summary_warm_hit_is_one_cache_read(self):
+        get_fleet_compliance_summary()
+        get_fleet_compliance_summary(expiring_within_days=7)
+        with patch.object(compliance_service, 'cache', wraps=cache) as shared:
+            with self.assertNumQueries(0):
+                self.assertEqual(get_fleet_compliance_summary(expiring_within_days=7)['expiring_within_days'], 7)
+        self.assertEqual(shared.get.call_count, 1)
+        shared.set.assert_not_called()
+
+    def test_summary_invalidation_drops_every_window(self):
+        get_fleet_compliance_summary()
+        get_fleet_compliance_summary(expiring_within_days=7)
+        create_document(self.staff, driver=self.driver, data={'document_type': DocumentType.DRIVER_LICENSE})
+        with self.assertNumQueries(2):
+            self.assertEqual(get_fleet_compliance_summary(expiring_within_days=7)['documents_pending'], 1)
+
+    def test_summary_cache_invalidated_by_document_mutation(self):
+        before = get_fleet_compliance_summary()['documents_pending']
+        create_document(
+            self.staff,
+            driver=self.driver,
+            data={'document_type': DocumentType.DRIVER_LICENSE},
+        )
+        self.assertEqual(get_fleet_compliance_summary()['documents_pending'], before + 1)
+
     def test_inbox_lists_pending_documents(self):
         create_document(
             self.staff,
@@ -108,3 +145,91 @@ class ComplianceAdminAPITests(APITestCase):
         doc_types = {row['document_type'] for row in response.data}
         self.assertIn(DocumentType.DRIVER_LICENSE, doc_types)
         self.assertIn(DocumentType.VEHICLE_REGISTRATION, doc_types)
+
+    def _add_vehicle_with_pending_doc(self, n):
+        user = User.objects.create_user(username=f'inboxdriver{n}', password='pass')
+        driver = Driver.objects.create(
+            user=user,
+            first_name='Inbox',
+            last_name=f'Driver{n}',
+            phone_number='555-0401',
+            license_number=f'DL-4D-IN{n:03d}',
+        )
+        vehicle = Vehicle.objects.create(
+            license_plate=f'4DIN{n:03d}',
+            make='Ford',
+            model='F-150',
+            year=2022,
+            vin=f'1FT4DINBOX{n:07d}',
+            capacity=1200,
+            capacity_unit='kg',
+        )
+        DriverVehicle.objects.create(driver=driver, vehicle=vehicle, assigned_from=timezone.now().date())
+        create_document(
+            self.staff,
+            vehicle=vehicle,
+            data={'document_type': DocumentType.VEHICLE_REGISTRATION},
+        )
+        return driver
+
+    def test_inbox_query_count_constant(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._add_vehicle_with_pending_doc(1)
+        with CaptureQueriesContext(connection) as small:
+            self.staff_client.get('/api/compliance/admin/inbox/')
+        drivers = [self._add_vehicle_with_pending_doc(n) for n in range(2, 7)]
+        with CaptureQueriesContext(connection) as large:
+            response = self.staff_client.get('/api/compliance/admin/inbox/')
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        driver_ids = {row['driver_id'] for row in response.data}
+        self.assertTrue({d.id for d in drivers} <= driver_ids)
+
+    def test_inbox_keyset_pages_cover_all_rows(self):
+        for n in range(1, 6):
+            self._add_vehicle_with_pending_doc(n)
+        full = self.staff_client.get('/api/compliance/admin/inbox/').data
+        seen = []
+        cursor = ''
+        while True:
+            response = self.staff_client.get(f'/api/compliance/admin/inbox/?limit=2&cursor={cursor}')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(row['document_id'] for row in response.data['results'])
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, [row['document_id'] for row in full])
+
+    def test_expiring_keyset_page(self):
+        for offset in (5, 10, 15):
+            doc = create_document(
+                self.staff,
+                vehicle=self.vehicle,
+                data={
+                    'document_type': DocumentType.VEHICLE_REGISTRATION,
+                    'expiry_date': date.today() + timedelta(days=offset),
+                },
+            )
+            mark_verified(self.staff, doc.id)
+            LegalDocument.objects.filter(pk=doc.pk).update(status=DocumentStatus.VERIFIED)
+        first = self.staff_client.get('/api/compliance/admin/expiring/?limit=2').data
+        self.assertEqual(len(first['results']), 2)
+        second = self.staff_client.get(
+            f"/api/compliance/admin/expiring/?limit=2&cursor={first['next_cursor']}",
+        ).data
+        self.assertEqual(len(second['results']), 1)
+        self.assertIsNone(second['next_cursor'])
+        dates = [row['expiry_date'] for row in first['results'] + second['results']]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_invalid_cursor_rejected(self):
+        response = self.staff_client.get('/api/compliance/admin/inbox/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_integer_limit_rejected(self):
+        for url in ('/api/compliance/admin/inbox/?limit=abc', '/api/compliance/admin/expiring/?limit=2.5'):
+            response = self.staff_client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+            self.assertIn('limit', response.data)
+
@@ -77,7 +77,8 @@ class RunComplianceDailyJobsTests(TestCase):
         expired.refresh_from_db()
         self.assertEqual(expired.status, DocumentStatus.EXPIRED)
         self.assertIn('Marked 1 document(s) as EXPIRED', output)
-        self.assertIn('Sent 1 (30-day)', output)
+        self.assertIn('Queued 1 (30-day)', output)
+        self.assertIn('Sent 1 outbox email(s)', output)
 
         remind.refresh_from_db()
         self.assertIsNotNone(remind.expiry_reminder_30_sent_at)
@@ -1,19 +1,23 @@
 # Phase 4D — compliance expiry email reminders
 
 from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
 
 from django.contrib.auth.models import User
 from django.core import mail
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.utils import timezone
 
-from delivery.compliance_constants import DocumentStatus, DocumentType
+from delivery.compliance_constants import DocumentStatus, DocumentType, OutboxStatus
+from delivery.compliance_email_outbox import MAX_ATTEMPTS, backoff_delay, drain_compliance_email_outbox
 from delivery.compliance_reminder_service import (
     clear_expiry_reminder_fields,
     send_compliance_expiry_reminders,
 )
 from delivery.compliance_service import create_document, mark_verified
-from delivery.models import Driver, DriverVehicle, LegalDocument, Vehicle
+from delivery.models import ComplianceEmailOutbox, Driver, DriverVehicle, LegalDocument, Vehicle
 
 
 class ComplianceExpiryReminderTests(TestCase):
@@ -69,7 +73,9 @@ class ComplianceExpiryReminderTests(TestCase):
         doc = self._verified_driver_license(expiry=expiry)
 
         result = send_compliance_expiry_reminders(as_of_date=today)
-        self.assertEqual(result['sent'][30], 1)
+        self.assertEqual(result['queued'][30], 1)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(drain_compliance_email_outbox()['sent'], 1)
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn('expires in 30 days', mail.outbox[0].subject)
 
@@ -78,7 +84,8 @@ class ComplianceExpiryReminderTests(TestCase):
 
         mail.outbox.clear()
         result_again = send_compliance_expiry_reminders(as_of_date=today)
-        self.assertEqual(result_again['sent'][30], 0)
+        self.assertEqual(result_again['queued'][30], 0)
+        self.assertEqual(drain_compliance_email_outbox()['sent'], 0)
         self.assertEqual(len(mail.outbox), 0)
 
     @override_settings(
@@ -98,7 +105,8 @@ class ComplianceExpiryReminderTests(TestCase):
         mark_verified(self.staff, doc.id)
 
         result = send_compliance_expiry_reminders(as_of_date=today)
-        self.assertEqual(result['sent'][0], 1)
+        self.assertEqual(result['queued'][0], 1)
+        drain_compliance_email_outbox()
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn('expires today', mail.outbox[0].subject)
         self.assertEqual(mail.outbox[0].to, ['driver.remind@example.com'])
@@ -112,12 +120,28 @@ class ComplianceExpiryReminderTests(TestCase):
         doc = self._verified_driver_license(expiry=today + timedelta(days=14))
 
         result = send_compliance_expiry_reminders(as_of_date=today, dry_run=True)
-        self.assertEqual(result['sent'][14], 1)
+        self.assertEqual(result['queued'][14], 1)
+        self.assertFalse(ComplianceEmailOutbox.objects.exists())
         self.assertEqual(len(mail.outbox), 0)
 
         doc.refresh_from_db()
         self.assertIsNone(doc.expiry_reminder_14_sent_at)
 
+    @override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        DEFAULT_FROM_EMAIL='noreply@test.local',
+    )
+    def test_command_queues_then_drains(self):
+        self._verified_driver_license(expiry=date.today() + timedelta(days=30))
+
+        call_command('send_compliance_expiry_reminders', '--no-drain', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+        out = StringIO()
+        call_command('send_compliance_expiry_reminders', stdout=out)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('Sent 1 outbox email(s)', out.getvalue())
+
     def test_clear_expiry_reminder_fields(self):
         doc = self._verified_driver_license(expiry=date.today() + timedelta(days=30))
         doc.expiry_reminder_30_sent_at = timezone.now()
@@ -131,3 +155,124 @@ class ComplianceExpiryReminderTests(TestCase):
         ])
         doc.refresh_from_db()
         self.assertIsNone(doc.expiry_reminder_30_sent_at)
+
+    def _add_vehicle_with_registration(self, n: int, *, expiry: date) -> LegalDocument:
+        user = User.objects.create_user(
+            username=f'batch_remind{n}',
+            password='pass',
+            email=f'batch{n}@example.com',
+        )
+        driver = Driver.objects.create(
+            user=user,
+            first_name='Batch',
+            last_name=f'Driver{n}',
+            phone_number='555-0411',
+            license_number=f'DL-RMB-{n:03d}',
+            license_issuing_region='CA-BC',
+        )
+        vehicle = Vehicle.objects.create(
+            license_plate=f'RMB{n:03d}',
+            make='Ford',
+            model='Transit',
+            year=2022,
+            vin=f'1FTRMBATCH{n:06d}',
+            capacity=1200,
+            capacity_unit='kg',
+        )
+        DriverVehicle.objects.create(driver=driver, vehicle=vehicle, assigned_from=timezone.now().date())
+        doc = create_document(
+            self.staff,
+            vehicle=vehicle,
+            data={'document_type': DocumentType.VEHICLE_REGISTRATION, 'expiry_date': expiry},
+        )
+        return mark_verified(self.staff, doc.id)
+
+    def test_enqueue_queries_do_not_scale_with_documents(self):
+        today = date.today()
+        expiry = today + timedelta(days=14)
+        self._add_vehicle_with_registration(1, expiry=expiry)
+        # 3 threshold document queries + 1 recipient query + key lookup + insert
+        with self.assertNumQueries(6):
+            send_compliance_expiry_reminders(as_of_date=today)
+
+        for n in range(2, 8):
+            self._add_vehicle_with_registration(n, expiry=expiry)
+        with self.assertNumQueries(6):
+            result = send_compliance_expiry_reminders(as_of_date=today)
+        self.assertEqual(result['queued'][14], 6)
+        self.assertEqual(ComplianceEmailOutbox.objects.count(), 7)
+
+    def test_rerun_before_drain_does_not_duplicate(self):
+        today = date.today()
+        self._verified_driver_license(expiry=today + timedelta(days=30))
+
+        send_compliance_expiry_reminders(as_of_date=today)
+        result = send_compliance_expiry_reminders(as_of_date=today)
+        self.assertEqual(result['queued'][30], 0)
+        self.assertEqual(ComplianceEmailOutbox.objects.count(), 1)
+
+    @override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        DEFAULT_FROM_EMAIL='noreply@test.local',
+    )
+    def test_drain_failure_retries_with_backoff(self):
+        today = date.today()
+        first = self._add_vehicle_with_registration(1, expiry=today + timedelta(days=30))
+        second = self._add_vehicle_with_registration(2, expiry=today + timedelta(days=30))
+        send_compliance_expiry_reminders(as_of_date=today)
+        queued_at = timezone.now() - timedelta(hours=1)
+        ComplianceEmailOutbox.objects.update(updated_at=queued_at)
+
+        from django.core.mail.backends.locmem import EmailBackend
+
+        original_send = EmailBackend.send_messages
+
+        def flaky_send(backend, messages):
+            if messages[0].to == ['batch2@example.com']:
+                raise ConnectionError('smtp down')
+            return original_send(backend, messages)
+
+        with patch.object(EmailBackend, 'send_messages', flaky_send):
+            result = drain_compliance_email_outbox()
+        self.assertEqual((result['sent'], result['retrying']), (1, 1))
+        self.assertEqual(len(mail.outbox), 1)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertIsNotNone(first.expiry_reminder_30_sent_at)
+        self.assertIsNone(second.expiry_reminder_30_sent_at)
+
+        row = ComplianceEmailOutbox.objects.get(document=second)
+        self.assertEqual((row.status, row.attempts), (OutboxStatus.PENDING, 1))
+        self.assertIn('smtp down', row.last_error)
+        self.assertGreater(row.updated_at, queued_at)
+        self.assertTrue(all(
+            updated_at > queued_at for updated_at in ComplianceEmailOutbox.objects.values_list('updated_at', flat=True)
+        ))
+        self.assertGreater(row.next_attempt_at, timezone.now() + backoff_delay(1) - timedelta(seconds=5))
+
+        # Not due yet; once due it goes out and the document is stamped.
+        self.assertEqual(drain_compliance_email_outbox()['sent'], 0)
+        ComplianceEmailOutbox.objects.filter(id=row.id).update(next_attempt_at=timezone.now())
+        self.assertEqual(drain_compliance_email_outbox()['sent'], 1)
+        second.refresh_from_db()
+        self.assertIsNotNone(second.expiry_reminder_30_sent_at)
+
+    @override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        DEFAULT_FROM_EMAIL='noreply@test.local',
+    )
+    def test_drain_gives_up_after_max_attempts(self):
+        today = date.today()
+        self._verified_driver_license(expiry=today + timedelta(days=30))
+        send_compliance_expiry_reminders(as_of_date=today)
+        ComplianceEmailOutbox.objects.update(attempts=MAX_ATTEMPTS - 1)
+
+        from django.core.mail.backends.locmem import EmailBackend
+
+        with patch.object(EmailBackend, 'send_messages', side_effect=ConnectionError('smtp down')):
+            result = drain_compliance_email_outbox()
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(ComplianceEmailOutbox.objects.get().status, OutboxStatus.FAILED)
+        self.assertEqual(backoff_delay(1), timedelta(minutes=1))
+        self.assertEqual(backoff_delay(3), timedelta(minutes=4))
@@ -0,0 +1,99 @@
+"""Keyset pagination selectable with ?pagination=cursor on high-volume list endpoints."""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from delivery.models import Customer, Delivery, Driver, DriverVehicle, Vehicle
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='cursorstaff', password='pass', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        customer_user = User.objects.create_user(username='cursorcustomer', password='pass')
+        self.customer = Customer.objects.create(user=customer_user, phone_number='5550001111')
+        deliveries = Delivery.objects.bulk_create([
+            Delivery(customer=self.customer, pickup_location=f'{n} A St', dropoff_location=f'{n} B St')
+            for n in range(25)
+        ])
+        # Several rows share created_at so the id tie-breaker matters.
+        base = timezone.now()
+        for n, delivery in enumerate(deliveries):
+            Delivery.objects.filter(pk=delivery.pk).update(created_at=base - timedelta(minutes=n // 3))
+        self.expected_ids = list(
+            Delivery.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+    def _walk(self, url):
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response)
+            ids.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        return ids, pages
+
+    def test_default_is_still_page_number(self):
+        response = self.client.get('/api/deliveries/')
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_cursor_pages_cover_every_row_once_in_order(self):
+        ids, pages = self._walk('/api/deliveries/?pagination=cursor')
+        self.assertEqual(ids, self.expected_ids)
+        self.assertEqual(len(pages), 3)
+        self.assertNotIn('count', pages[0].data)
+        self.assertIsNone(pages[0].data['previous'])
+
+    def test_previous_link_returns_prior_page(self):
+        _, pages = self._walk('/api/deliveries/?pagination=cursor')
+        previous = self.client.get(pages[2].data['previous'])
+        self.assertEqual(
+            [row['id'] for row in previous.data['results']],
+            [row['id'] for row in pages[1].data['results']],
+        )
+        self.assertIsNotNone(previous.data['next'])
+
+    def test_deep_page_costs_same_as_first_without_count(self):
+        _, pages = self._walk('/api/deliveries/?pagination=cursor')
+        costs = []
+        for url in ('/api/deliveries/?pagination=cursor', pages[0].data['next']):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(url)
+            costs.append([query['sql'] for query in ctx.captured_queries])
+        self.assertEqual(len(costs[0]), len(costs[1]))
+        for sql in costs[1]:
+            self.assertNotIn('COUNT(', sql.upper())
+            self.assertNotIn('OFFSET', sql.upper())
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get('/api/deliveries/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_driver_vehicle_list_supports_cursor(self):
+        for n in range(12):
+            user = User.objects.create_user(username=f'cursordriver{n}', password='pass')
+            driver = Driver.objects.create(
+                user=user, phone_number='5550002222', license_number=f'CURSORDL{n:03d}',
+            )
+            vehicle = Vehicle.objects.create(
+                license_plate=f'CUR{n:03d}', make='Ford', model='Transit', year=2022,
+                vin=f'1CURSOR{n:010d}', capacity=1000, capacity_unit='kg',
+            )
+            DriverVehicle.objects.create(
+                driver=driver, vehicle=vehicle,
+                assigned_from=timezone.now().date() - timedelta(days=n % 4),
+            )
+        ids, _ = self._walk('/api/driver-vehicles/?pagination=cursor')
+        self.assertEqual(
+            ids,
+            list(DriverVehicle.objects.order_by('-assigned_from', '-id').values_list('id', flat=True)),
+        )
@@ -0,0 +1,101 @@
+"""Delivery lists render from a customer/user join in a constant number of queries."""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from delivery.models import Customer, Delivery
+from delivery.serializers import DeliveryRowSerializer, DeliverySerializer
+
+
+def auth_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+class DeliveryListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='dlqstaff', password='pass', is_staff=True)
+        self.customer_user = User.objects.create_user(
+            username='dlqcustomer', password='pass', email='dlq@example.com',
+            first_name='Dana', last_name='Lee',
+        )
+        self.customer = Customer.objects.create(user=self.customer_user, phone_number='555-0101')
+        self._seq = 0
+
+    def _add_delivery(self, customer=None):
+        self._seq += 1
+        customer = customer or self._new_customer()
+        return Delivery.objects.create(
+            customer=customer,
+            pickup_location=f'{self._seq} Pickup St',
+            dropoff_location=f'{self._seq} Dropoff Ave',
+            estimated_cost='19.90',
+        )
+
+    def _new_customer(self):
+        user = User.objects.create_user(username=f'dlqbiz{self._seq}', password='pass')
+        return Customer.objects.create(
+            user=user, phone_number='555-0102', is_business=True, company_name=f'Movers {self._seq}',
+        )
+
+    def _query_count(self, client, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response
+
+    def test_row_serializer_matches_model_serializer(self):
+        self._add_delivery(self.customer)
+        self._add_delivery()
+        Delivery.objects.create(pickup_location='No customer', dropoff_location='Anywhere')
+        queryset = Delivery.objects.order_by('id')
+        rows = DeliveryRowSerializer(DeliveryRowSerializer.project(queryset), many=True).data
+        self.assertEqual(rows, DeliverySerializer(queryset, many=True).data)
+        self.assertEqual(rows[0]['customer_name'], 'Dana Lee')
+        self.assertEqual(rows[1]['customer_name'], 'Movers 2')
+        self.assertNotIn('customer_name', rows[2])
+
+    def test_staff_board_query_count_constant_as_page_grows(self):
+        client = auth_client(self.staff)
+        self._add_delivery()
+        baseline, _ = self._query_count(client, '/api/deliveries/')
+        for _ in range(8):
+            self._add_delivery()
+        grown, response = self._query_count(client, '/api/deliveries/')
+        self.assertEqual(len(response.data['results']), 9)
+        self.assertEqual(grown, baseline)
+
+    def test_cursor_pages_from_projection(self):
+        client = auth_client(self.staff)
+        for _ in range(12):
+            self._add_delivery(self.customer)
+        first = client.get('/api/deliveries/?pagination=cursor')
+        second = client.get(first.data['next'])
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(len(set(ids)), 12)
+
+    def test_my_deliveries_paginated_with_constant_queries(self):
+        client = auth_client(self.customer_user)
+        self._add_delivery(self.customer)
+        baseline, _ = self._query_count(client, '/api/customers/my_deliveries/')
+        for _ in range(11):
+            self._add_delivery(self.customer)
+        grown, response = self._query_count(client, '/api/customers/my_deliveries/')
+        self.assertEqual(grown, baseline)
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(response.data['results'][0]['customer_email'], 'dlq@example.com')
+
+    def test_my_deliveries_only_own(self):
+        self._add_delivery(self.customer)
+        self._add_delivery()
+        response = auth_client(self.customer_user).get('/api/customers/my_deliveries/')
+        self.assertEqual(
+            [row['customer'] for row in response.data['results']],
+            [self.customer.id],
+        )
@@ -0,0 +1,173 @@
+# Phase 4C — batch route distance, ETA and cost estimation
+
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APITestCase
+
+from address_validation.models import ValidatedAddress
+from delivery.geo_index import haversine_km
+from delivery.models import Customer, Delivery, DeliveryAssignment, StaffProfile
+from delivery.pricing_service import estimate_delivery_costs, get_rate_card, price_routes
+from delivery.seed_helpers import get_model_spec, upsert_catalog_vehicle
+from delivery.staff_constants import StaffRole
+
+VANCOUVER = (49.2827, -123.1207)
+BURNABY = (49.2488, -122.9805)
+RATE_CARD = {
+    'PRICING_BASE_FEE': 10.0,
+    'PRICING_PER_KM': 2.0,
+    'PRICING_DETOUR_FACTOR': 1.0,
+    'PRICING_AVERAGE_SPEED_KMH': 60.0,
+    'PRICING_VEHICLE_CLASSES': (('van', 500, 0.0), ('truck', None, 20.0)),
+}
+
+
+def _address(text, lat, lng):
+    return ValidatedAddress.objects.create(
+        original_address=text, validation_status='valid', latitude=lat, longitude=lng,
+    )
+
+
+@override_settings(**RATE_CARD)
+class PriceRoutesTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.km = haversine_km(*VANCOUVER, *BURNABY)
+
+    def test_base_plus_distance(self):
+        same_place, route = price_routes([VANCOUVER + VANCOUVER, VANCOUVER + BURNABY])
+        self.assertEqual(same_place, {'distance_km': 0.0, 'eta_minutes': 0, 'estimated_cost': Decimal('10.00')})
+        self.assertEqual(route['distance_km'], round(self.km, 2))
+        self.assertEqual(route['eta_minutes'], round(self.km))
+        self.assertEqual(route['estimated_cost'], Decimal(f'{10 + 2 * self.km:.2f}'))
+
+    def test_vehicle_class_surcharge_from_spec_payload(self):
+        spec = get_model_spec('Ford', 'F-150')
+        name, surcharge = get_rate_card().vehicle_class(spec.max_payload_kg)
+        self.assertEqual(name, 'truck')
+        plain, with_spec = price_routes([VANCOUVER + BURNABY] * 2, [None, spec.id])
+        self.assertEqual(with_spec['estimated_cost'] - plain['estimated_cost'], Decimal('20.00'))
+
+    def test_unknown_spec_rejected(self):
+        with self.assertRaises(ValidationError):
+            price_routes([VANCOUVER + BURNABY], [999999])
+
+    def test_large_batch_runs_without_queries(self):
+        spec = get_model_spec('Ford', 'F-150')
+        price_routes([VANCOUVER + BURNABY], [spec.id])  # warm the model spec index
+        with CaptureQueriesContext(connection) as ctx:
+            quotes = price_routes([VANCOUVER + BURNABY] * 5000, [spec.id] * 5000)
+        self.assertEqual(len(quotes), 5000)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_quotes_endpoint(self):
+        client = APIClient()
+        self.assertEqual(client.post('/api/deliveries/quotes/', {}, format='json').status_code, status.HTTP_401_UNAUTHORIZED)
+        url = '/api/deliveries/quotes/'
+        customer_user = User.objects.create_user(username='quotecustomer', password='pass')
+        Customer.objects.create(user=customer_user, phone_number='555-0801')
+        read_only = User.objects.create_user(username='quotereadonly', password='pass', is_staff=True)
+        StaffProfile.objects.create(user=read_only, staff_role=StaffRole.READ_ONLY)
+        for user in (User.objects.create_user(username='quoteuser', password='pass'), customer_user):
+            client.force_authenticate(user)
+            self.assertEqual(client.post(url, {}, format='json').status_code, status.HTTP_403_FORBIDDEN)
+
+        client.force_authenticate(read_only)
+        response = client.post(url, {'routes': [list(VANCOUVER + BURNABY)] * 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['quotes'][0]['estimated_cost'], Decimal(f'{10 + 2 * self.km:.2f}'))
+        for body in (
+            {'routes': []},
+            {'routes': [[49.2, -123.1, 49.3]]},
+            {'routes': [[95, -123.1, 49.3, -123.0]]},
+            {'routes': [list(VANCOUVER + BURNABY)], 'model_spec_id': 999999},
+        ):
+            self.assertEqual(client.post(url, body, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(**RATE_CARD)
+class EstimateDeliveryCostsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='pricingcustomer', password='pass')
+        self.customer = Customer.objects.create(user=user, phone_number='555-0800')
+        self._seq = 0
+
+    def _delivery(self, *, geocoded=True, **kwargs):
+        self._seq += 1
+        delivery = Delivery.objects.create(
+            customer=self.customer,
+            pickup_location=f'{self._seq} Pickup St',
+            dropoff_location=f'{self._seq} Dropoff Ave',
+            **kwargs,
+        )
+        if geocoded:
+            delivery.pickup_address = _address(delivery.pickup_location, *VANCOUVER)
+            delivery.dropoff_address = _address(delivery.dropoff_location, *BURNABY)
+            delivery.save(update_fields=['pickup_address', 'dropoff_address'])
+        return delivery
+
+    def test_fills_missing_estimates_only(self):
+        priced = self._delivery()
+        kept = self._delivery(estimated_cost=Decimal('99.00'))
+        self._delivery(geocoded=False)
+
+        result = estimate_delivery_costs()
+
+        self.assertEqual(result, {'priced': 1, 'skipped_not_geocoded': 1})
+        priced.refresh_from_db()
+        kept.refresh_from_db()
+        self.assertEqual(priced.estimated_cost, price_routes([VANCOUVER + BURNABY])[0]['estimated_cost'])
+        self.assertEqual(kept.estimated_cost, Decimal('99.00'))
+        self.assertEqual(estimate_delivery_costs(overwrite=True)['priced'], 2)
+
+    def test_uses_assigned_vehicle_class(self):
+        delivery = self._delivery()
+        vehicle, _ = upsert_catalog_vehicle(
+            license_plate='PRC0001', manufacturer='Ford', model='F-150', year=2022,
+            vin='1PRCTEST000000001', capacity_kg=900,
+        )
+        DeliveryAssignment.objects.create(delivery=delivery, vehicle=vehicle)
+        estimate_delivery_costs()
+        delivery.refresh_from_db()
+        self.assertEqual(
+            delivery.estimated_cost,
+            price_routes([VANCOUVER + BURNABY], [vehicle.model_spec_id])[0]['estimated_cost'],
+        )
+
+    def test_query_count_per_batch_not_per_delivery(self):
+        self._delivery()
+        estimate_delivery_costs(overwrite=True)  # warm the model spec index
+        with CaptureQueriesContext(connection) as small:
+            estimate_delivery_costs(overwrite=True)
+        for _ in range(20):
+            self._delivery()
+        with CaptureQueriesContext(connection) as large:
+            estimate_delivery_costs(overwrite=True)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_backfill_command_geocodes_then_prices(self):
+        delivery = self._delivery(geocoded=False)
+
+        def geocode(items):
+            points = {delivery.pickup_location: VANCOUVER, delivery.dropoff_location: BURNABY}
+            return [_address(text, *points[text]) for text, _ in items]
+
+        out = StringIO()
+        with patch('delivery.pricing_service.validate_addresses', side_effect=geocode) as batch:
+            call_command('estimate_delivery_costs', '--geocode', stdout=out)
+        batch.assert_called_once_with([(delivery.pickup_location, 'US'), (delivery.dropoff_location, 'US')])
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.estimated_cost, price_routes([VANCOUVER + BURNABY])[0]['estimated_cost'])
+        self.assertIn('Priced 1 delivery(ies)', out.getvalue())
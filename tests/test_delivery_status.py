@@ -0,0 +1,151 @@
+# Phase 4C — delivery status lifecycle, bulk transitions and audit rows
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APITestCase
+
+from delivery.delivery_status_service import (
+    CANCELLED,
+    COMPLETED,
+    EN_ROUTE,
+    PENDING,
+    SKIPPED_INVALID_TRANSITION,
+    SKIPPED_NOT_FOUND,
+    DeliveryStatusConflict,
+    transition_deliveries,
+    transition_delivery,
+)
+from delivery.models import Customer, Delivery, DeliveryStatusEvent, StaffProfile
+from delivery.staff_constants import StaffRole
+
+
+class DeliveryStatusTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='statusstaff', password='pass', is_staff=True)
+        customer_user = User.objects.create_user(username='statuscustomer', password='pass')
+        self.customer = Customer.objects.create(user=customer_user, phone_number='555-0900')
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def _delivery(self, delivery_status=PENDING):
+        return Delivery.objects.create(
+            customer=self.customer,
+            pickup_location='1 Pickup St',
+            dropoff_location='2 Dropoff Ave',
+            status=delivery_status,
+        )
+
+    def test_bulk_closeout_moves_only_allowed_sources(self):
+        en_route = [self._delivery(EN_ROUTE) for _ in range(3)]
+        pending = self._delivery(PENDING)
+        done = self._delivery(COMPLETED)
+
+        result = transition_deliveries(
+            [d.id for d in en_route] + [pending.id, done.id, 999999], COMPLETED, user=self.staff, reason='closeout',
+        )
+
+        self.assertEqual(
+            sorted(row['delivery_id'] for row in result['transitioned']),
+            [d.id for d in en_route],
+        )
+        self.assertEqual(
+            sorted(result['skipped'], key=lambda row: row['delivery_id']),
+            [
+                {'delivery_id': pending.id, 'status': PENDING, 'reason': SKIPPED_INVALID_TRANSITION},
+                {'delivery_id': done.id, 'status': COMPLETED, 'reason': SKIPPED_INVALID_TRANSITION},
+                {'delivery_id': 999999, 'status': None, 'reason': SKIPPED_NOT_FOUND},
+            ],
+        )
+        self.assertEqual(Delivery.objects.filter(status=COMPLETED).count(), 4)
+        events = DeliveryStatusEvent.objects.filter(batch_id=result['batch_id'])
+        self.assertEqual(
+            set(events.values_list('delivery_id', 'from_status', 'to_status', 'changed_by_id', 'reason')),
+            {(d.id, EN_ROUTE, COMPLETED, self.staff.id, 'closeout') for d in en_route},
+        )
+
+    def test_from_status_narrows_sources(self):
+        pending = self._delivery(PENDING)
+        en_route = self._delivery(EN_ROUTE)
+        result = transition_deliveries([pending.id, en_route.id], CANCELLED, from_status=EN_ROUTE)
+        self.assertEqual(result['transitioned'], [{'delivery_id': en_route.id, 'from_status': EN_ROUTE}])
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, PENDING)
+        with self.assertRaises(ValidationError):
+            transition_deliveries([pending.id], PENDING)
+
+    def test_stale_single_transition_conflicts(self):
+        delivery = self._delivery(PENDING)
+        stale = Delivery.objects.get(pk=delivery.pk)
+        transition_delivery(delivery, EN_ROUTE)
+        with self.assertRaises(DeliveryStatusConflict):
+            transition_delivery(stale, CANCELLED)
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, EN_ROUTE)
+        self.assertEqual(delivery.status_events.count(), 1)
+
+    def test_query_count_independent_of_batch_size(self):
+        small_ids = [self._delivery(EN_ROUTE).id for _ in range(2)]
+        with CaptureQueriesContext(connection) as small:
+            transition_deliveries(small_ids, COMPLETED)
+        large_ids = [self._delivery(EN_ROUTE).id for _ in range(40)]
+        with CaptureQueriesContext(connection) as large:
+            transition_deliveries(large_ids, COMPLETED)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_bulk_endpoint(self):
+        deliveries = [self._delivery(EN_ROUTE) for _ in range(2)]
+        url = '/api/deliveries/bulk-transition/'
+        body = {'delivery_ids': [d.id for d in deliveries], 'status': COMPLETED, 'reason': 'end of day'}
+
+        response = self.client.post(url, body, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['transitioned']), 2)
+        self.assertEqual(response.data['skipped'], [])
+        self.assertEqual(self.client.post(url, {**body, 'status': 'Lost'}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, {**body, 'delivery_ids': []}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_endpoint_requires_assign_permission(self):
+        delivery = self._delivery(EN_ROUTE)
+        read_only = User.objects.create_user(username='statusreadonly', password='pass', is_staff=True)
+        StaffProfile.objects.create(user=read_only, staff_role=StaffRole.READ_ONLY)
+        for user in (read_only, self.customer.user):
+            self.client.force_authenticate(user)
+            response = self.client.post(
+                '/api/deliveries/bulk-transition/',
+                {'delivery_ids': [delivery.id], 'status': COMPLETED},
+                format='json',
+            )
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, EN_ROUTE)
+
+    def test_patch_status_follows_transition_table(self):
+        delivery = self._delivery(PENDING)
+        url = f'/api/deliveries/{delivery.id}/'
+        self.assertEqual(self.client.patch(url, {'status': COMPLETED}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(url, {'status': EN_ROUTE, 'item_description': 'Sofa'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], EN_ROUTE)
+        delivery.refresh_from_db()
+        self.assertEqual((delivery.status, delivery.item_description), (EN_ROUTE, 'Sofa'))
+        self.assertEqual(delivery.status_events.get().from_status, PENDING)
+
+    def test_patch_without_status_keeps_stored_status(self):
+        delivery = self._delivery(PENDING)
+        Delivery.objects.filter(pk=delivery.pk).update(status=EN_ROUTE)
+        response = self.client.patch(f'/api/deliveries/{delivery.id}/', {'item_description': 'Desk'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], EN_ROUTE)
+
+    def test_cancel_writes_audit_row(self):
+        delivery = self._delivery(PENDING)
+        self.client.force_authenticate(self.customer.user)
+        response = self.client.post(f'/api/deliveries/{delivery.id}/cancel/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], CANCELLED)
+        event = delivery.status_events.get()
+        self.assertEqual((event.from_status, event.to_status, event.changed_by), (PENDING, CANCELLED, self.customer.user))
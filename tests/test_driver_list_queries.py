@@ -0,0 +1,71 @@
+"""Driver list current-vehicle columns resolve in a constant number of queries."""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from delivery.models import Driver, DriverVehicle, Vehicle
+
+
+class DriverListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='listqstaff', password='pass', is_staff=True)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.staff).access_token}',
+        )
+        self._seq = 0
+
+    def _add_driver_with_vehicle(self):
+        self._seq += 1
+        n = self._seq
+        user = User.objects.create_user(username=f'listqdriver{n}', password='pass')
+        driver = Driver.objects.create(
+            user=user,
+            first_name='List',
+            last_name=f'Driver{n}',
+            phone_number='5550000000',
+            license_number=f'LQDL{n:04d}',
+        )
+        vehicle = Vehicle.objects.create(
+            license_plate=f'LQ{n:04d}',
+            make='Ford',
+            model=f'Transit{n}',
+            year=2022,
+            vin=f'1LQTEST{n:010d}',
+            capacity=1000,
+            capacity_unit='kg',
+        )
+        DriverVehicle.objects.create(
+            driver=driver,
+            vehicle=vehicle,
+            assigned_from=timezone.now().date(),
+        )
+        return driver, vehicle
+
+    def _list_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/drivers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response
+
+    def test_current_vehicle_fields_use_prefetch(self):
+        driver, vehicle = self._add_driver_with_vehicle()
+        _, response = self._list_query_count()
+        row = next(r for r in response.data['results'] if r['id'] == driver.id)
+        self.assertEqual(row['current_vehicle'], vehicle.id)
+        self.assertEqual(row['current_vehicle_plate'], vehicle.license_plate)
+        self.assertEqual(row['current_vehicle_model'], vehicle.model)
+
+    def test_query_count_constant_as_page_grows(self):
+        self._add_driver_with_vehicle()
+        baseline, _ = self._list_query_count()
+        for _ in range(7):
+            self._add_driver_with_vehicle()
+        grown, response = self._list_query_count()
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertEqual(grown, baseline)
@@ -0,0 +1,101 @@
+"""Per-endpoint query budgets and latency across fleet sizes.
+
+Runs at small sizes by default. For a real benchmark:
+
+    BENCHMARK_FLEET_SIZES=100,1000,10000 BENCHMARK_ASSIGNMENT_HISTORY=0,100,1000 \
+        BENCHMARK_REPORT=bench_report.json python -m pytest tests/test_endpoint_benchmarks.py
+"""
+
+import os
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from tests.benchmark_harness import (
+    ENDPOINTS,
+    build_report,
+    configured_fleet_sizes,
+    configured_history_sizes,
+    configured_repeat,
+    measure_current_assignment,
+    measure_endpoint,
+    seed_assignment_history,
+    seed_fleet,
+    staff_client,
+    write_report,
+)
+
+
+# Budgets count application SQL only. Deployments cache in Redis (see CACHES), so pin an
+# in-memory cache here; otherwise a database cache backend adds its own SELECTs per request.
+BENCHMARK_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=BENCHMARK_CACHES)
+class EndpointBenchmarkTests(APITestCase):
+    def test_query_budgets_hold_as_fleet_grows(self):
+        sizes = configured_fleet_sizes(default=(5, 20))
+        repeat = configured_repeat(default=3)
+        results = []
+        for size in sizes:
+            cache.clear()
+            with transaction.atomic():
+                fleet = seed_fleet(size)
+                client = staff_client(fleet)
+                results.extend(
+                    measure_endpoint(client, endpoint, fleet, repeat=repeat)
+                    for endpoint in ENDPOINTS
+                )
+                transaction.set_rollback(True)
+        cache.clear()
+
+        report_path = os.environ.get('BENCHMARK_REPORT')
+        if report_path:
+            write_report(build_report(results), report_path)
+
+        by_endpoint = {}
+        for result in results:
+            by_endpoint.setdefault(result.name, []).append(result)
+        for name, runs in by_endpoint.items():
+            with self.subTest(endpoint=name):
+                for run in runs:
+                    self.assertEqual(run.status_code, 200, run.path)
+                for run in runs:
+                    self.assertLessEqual(
+                        run.queries,
+                        run.query_budget,
+                        f'{name} ran {run.queries} queries with {run.fleet_size} drivers',
+                    )
+                counts = {run.fleet_size: run.queries for run in runs}
+                self.assertEqual(
+                    len(set(counts.values())),
+                    1,
+                    f'{name} query count grows with fleet size: {counts}',
+                )
+
+
+class CurrentAssignmentLookupBenchmarkTests(APITestCase):
+    def test_lookup_is_an_index_seek_as_history_grows(self):
+        """One indexed query for the current vehicle, however many closed assignments exist."""
+        repeat = configured_repeat(default=3)
+        lookups = []
+        with transaction.atomic():
+            fleet = seed_fleet(5, prefix='hist')
+            seeded = 0
+            for per_driver in configured_history_sizes(default=(0, 50)):
+                seed_assignment_history(fleet, per_driver - seeded, offset=seeded)
+                seeded = per_driver
+                lookups.append(measure_current_assignment(fleet, repeat=repeat))
+            transaction.set_rollback(True)
+
+        report_path = os.environ.get('BENCHMARK_REPORT')
+        if report_path:
+            write_report(build_report([], lookups=lookups), Path(report_path).with_suffix('.lookups.json'))
+
+        for lookup in lookups:
+            with self.subTest(history_rows=lookup.history_rows):
+                self.assertEqual(lookup.queries, 1)
+                self.assertTrue(lookup.uses_index, lookup.plan)
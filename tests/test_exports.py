@@ -0,0 +1,138 @@
+"""Streaming staff exports (NDJSON / CSV) for deliveries, drivers and compliance documents."""
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from delivery.compliance_constants import DocumentStatus, DocumentType
+from delivery.models import Customer, Delivery, Driver, LegalDocument, StaffProfile
+from delivery.staff_constants import StaffRole
+
+
+def _body(response) -> str:
+    return b''.join(response.streaming_content).decode()
+
+
+def _ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in _body(response).splitlines()]
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='exportstaff', password='pass', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        customer_user = User.objects.create_user(username='exportcustomer', password='pass')
+        self.customer = Customer.objects.create(user=customer_user, phone_number='555-0100')
+        for index, delivery_status in enumerate(['Pending', 'Pending', 'Completed', 'Cancelled', 'En Route']):
+            Delivery.objects.create(
+                customer=self.customer,
+                pickup_location=f'{index} Pickup St',
+                dropoff_location=f'{index} Dropoff Ave',
+                status=delivery_status,
+                estimated_cost='12.50',
+            )
+
+    def test_deliveries_ndjson_filtered_by_status(self):
+        response = self.client.get('/api/exports/deliveries/?status=Pending,Completed')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('attachment; filename="deliveries-', response['Content-Disposition'])
+        rows = _ndjson(response)
+        self.assertEqual(sorted(row['status'] for row in rows), ['Completed', 'Pending', 'Pending'])
+        self.assertEqual(rows[0]['estimated_cost'], '12.50')
+        self.assertEqual([row['id'] for row in rows], sorted(row['id'] for row in rows))
+
+    def test_deliveries_csv_has_header_and_rows(self):
+        response = self.client.get('/api/exports/deliveries/?export_format=csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        reader = list(csv.DictReader(io.StringIO(_body(response))))
+        self.assertEqual(len(reader), 5)
+        self.assertEqual(reader[0]['pickup_location'], '0 Pickup St')
+        self.assertEqual(reader[0]['delivery_date'], '')
+
+    def test_csv_neutralizes_formula_cells(self):
+        Delivery.objects.filter(pickup_location='0 Pickup St').update(
+            pickup_location='=HYPERLINK("http://evil.example","x")',
+            dropoff_location='@SUM(A1)',
+        )
+        response = self.client.get('/api/exports/deliveries/?export_format=csv')
+        row = list(csv.DictReader(io.StringIO(_body(response))))[0]
+        self.assertEqual(row['pickup_location'], '\'=HYPERLINK("http://evil.example","x")')
+        self.assertEqual(row['dropoff_location'], "'@SUM(A1)")
+        self.assertEqual(row['estimated_cost'], '12.50')
+
+        ndjson_row = _ndjson(self.client.get('/api/exports/deliveries/'))[0]
+        self.assertEqual(ndjson_row['dropoff_location'], '@SUM(A1)')
+
+    def test_date_filters_are_inclusive(self):
+        today = timezone.localdate()
+        self.assertEqual(len(_ndjson(self.client.get(f'/api/exports/deliveries/?date_from={today}&date_to={today}'))), 5)
+        tomorrow = today + timedelta(days=1)
+        self.assertEqual(_ndjson(self.client.get(f'/api/exports/deliveries/?date_from={tomorrow}')), [])
+
+    def test_invalid_filters_rejected(self):
+        self.assertEqual(
+            self.client.get('/api/exports/deliveries/?status=Lost').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.get('/api/exports/deliveries/?date_from=yesterday').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.get('/api/exports/deliveries/?export_format=xlsx').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_rows_streamed_in_chunks(self):
+        response = self.client.get('/api/exports/deliveries/')
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sum(chunk.count(b'\n') for chunk in chunks), 5)
+
+    def test_non_staff_forbidden(self):
+        self.client.force_authenticate(self.customer.user)
+        for path in ('/api/exports/deliveries/', '/api/exports/drivers/', '/api/exports/documents/'):
+            self.assertEqual(self.client.get(path).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_anonymous_rejected(self):
+        self.assertEqual(APIClient().get('/api/exports/deliveries/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_drivers_export(self):
+        driver_user = User.objects.create_user(username='exportdriver', password='pass', email='d@example.com')
+        Driver.objects.create(user=driver_user, phone_number='555-0200', license_number='DL-EXPORT-1')
+        rows = _ndjson(self.client.get('/api/exports/drivers/?status=APPROVED'))
+        self.assertEqual([row['user__email'] for row in rows], ['d@example.com'])
+
+    def test_documents_export_filters_type_and_expiry(self):
+        driver_user = User.objects.create_user(username='docdriver', password='pass')
+        driver = Driver.objects.create(user=driver_user, phone_number='555-0300', license_number='DL-EXPORT-2')
+        expiry = date.today() + timedelta(days=10)
+        LegalDocument.objects.create(
+            document_type=DocumentType.DRIVER_LICENSE,
+            driver=driver,
+            expiry_date=expiry,
+            status=DocumentStatus.VERIFIED,
+        )
+        rows = _ndjson(self.client.get(
+            f'/api/exports/documents/?document_type=DRIVER_LICENSE&status=VERIFIED&date_to={expiry}'
+        ))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['expiry_date'], expiry.isoformat())
+        self.assertNotIn('file_key', rows[0])
+
+    def test_read_only_staff_role_can_export(self):
+        read_only = User.objects.create_user(username='exportreadonly', password='pass', is_staff=True)
+        StaffProfile.objects.create(user=read_only, staff_role=StaffRole.READ_ONLY)
+        self.client.force_authenticate(read_only)
+        self.assertEqual(self.client.get('/api/exports/documents/').status_code, status.HTTP_200_OK)
@@ -0,0 +1,95 @@
+"""Metrics registry, request instrumentation and the /metrics endpoint."""
+import tempfile
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from DeliveryAppBackend.metrics import REGISTRY, MetricsRegistry
+from delivery.compliance_service import mark_expired_documents
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    def test_counter_and_histogram_exposition(self):
+        registry = MetricsRegistry()
+        calls = registry.counter('calls_total', 'Calls.', ('outcome',))
+        latency = registry.histogram('call_seconds', 'Latency.', ('provider',), buckets=(0.1, 1.0))
+        calls.inc(outcome='ok')
+        calls.inc(2, outcome='ok')
+        latency.observe(0.05, provider='google')
+        latency.observe(5, provider='google')
+
+        text = registry.render()
+        self.assertIn('# TYPE calls_total counter', text)
+        self.assertIn('calls_total{outcome="ok"} 3.0', text)
+        self.assertIn('call_seconds_bucket{provider="google",le="0.1"} 1', text)
+        self.assertIn('call_seconds_bucket{provider="google",le="1.0"} 1', text)
+        self.assertIn('call_seconds_bucket{provider="google",le="+Inf"} 2', text)
+        self.assertIn('call_seconds_count{provider="google"} 2', text)
+        self.assertIn('call_seconds_sum{provider="google"} 5.05', text)
+
+    def test_label_names_are_enforced(self):
+        registry = MetricsRegistry()
+        calls = registry.counter('calls_total', 'Calls.', ('outcome',))
+        with self.assertRaises(ValueError):
+            calls.inc(route='x')
+
+    def test_snapshots_from_every_process_are_summed(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROC_DIR=directory):
+            workers = [MetricsRegistry(), MetricsRegistry()]
+            for worker in workers:
+                worker._snapshot_name = f'{id(worker)}.json'
+                worker.counter('jobs_total', 'Jobs.', ('result',)).inc(result='sent')
+                worker.flush()
+            self.assertIn('jobs_total{result="sent"} 2.0', workers[0].render())
+
+
+@override_settings(
+    MIDDLEWARE=[
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'delivery.middleware.MetricsMiddleware',
+    ],
+    METRICS_ENABLED=True,
+    METRICS_TOKEN='scrape-secret',
+)
+class MetricsEndpointTests(APITestCase):
+    def setUp(self):
+        REGISTRY.reset()
+        self.staff = User.objects.create_user(username='metricsstaff', password='pass', is_staff=True)
+        self.client = APIClient()
+
+    def test_request_latency_and_queries_recorded_per_route(self):
+        self.client.force_authenticate(self.staff)
+        self.client.get('/api/drivers/')
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertIn(
+            'http_request_duration_seconds_count{route="driver-list",method="GET",status="200"} 1',
+            text,
+        )
+        self.assertIn('db_queries_total{route="driver-list"}', text)
+
+    def test_compliance_job_results_counted(self):
+        mark_expired_documents()
+        self.client.force_authenticate(self.staff)
+        text = self.client.get('/metrics').content.decode()
+        self.assertIn('compliance_job_results_total{job="expire_documents",result="expired"} 0.0', text)
+
+    def test_scraper_token_or_staff_required(self):
+        self.assertIn(
+            self.client.get('/metrics').status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Metrics scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Metrics wrong')
+        self.assertNotEqual(response.status_code, status.HTTP_200_OK)
+
+        driver = User.objects.create_user(username='metricsdriver', password='pass')
+        self.client.force_authenticate(driver)
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_403_FORBIDDEN)
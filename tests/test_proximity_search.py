@@ -0,0 +1,257 @@
+# Phase 4C — nearest eligible drivers to a delivery pickup
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from address_validation.models import ValidatedAddress
+from delivery import geo_index
+from delivery.geo_index import GeoGrid, get_driver_geo_index, haversine_km
+from delivery.models import Customer, Delivery, StaffProfile, VehicleApprovalStatus
+from delivery.proximity_service import (
+    geocode_delivery_pickup,
+    geocode_driver_home_bases,
+    nearest_eligible_drivers,
+)
+from delivery.seed_helpers import (
+    assign_vehicle_to_driver,
+    ensure_user_account,
+    get_or_create_seed_staff,
+    seed_compliance_documents,
+    upsert_catalog_vehicle,
+    upsert_driver,
+)
+from delivery.staff_constants import StaffRole
+
+PICKUP = (49.2827, -123.1207)  # Vancouver
+
+
+def _address(text, lat, lng):
+    return ValidatedAddress.objects.create(
+        original_address=text, validation_status='valid', latitude=lat, longitude=lng,
+    )
+
+
+class GeoGridTests(SimpleTestCase):
+    def test_nearest_yields_in_distance_order_within_radius(self):
+        grid = GeoGrid()
+        points = {1: (49.30, -123.10), 2: (49.90, -123.10), 3: (49.2827, -123.1207), 4: (51.0, -114.0)}
+        for key, (lat, lng) in points.items():
+            grid.upsert(key, lat, lng)
+
+        results = list(grid.nearest(*PICKUP, max_km=100))
+
+        self.assertEqual([key for key, _ in results], [3, 1, 2])
+        self.assertAlmostEqual(results[1][1], haversine_km(*PICKUP, *points[1]))
+
+    def test_matches_brute_force(self):
+        grid = GeoGrid(cell_degrees=0.05)
+        points = {key: (49.0 + (key * 37 % 100) / 100, -123.5 + (key * 53 % 100) / 100) for key in range(200)}
+        for key, (lat, lng) in points.items():
+            grid.upsert(key, lat, lng)
+        expected = sorted(
+            (haversine_km(*PICKUP, lat, lng), key)
+            for key, (lat, lng) in points.items()
+            if haversine_km(*PICKUP, lat, lng) <= 40
+        )
+        self.assertEqual([key for key, _ in grid.nearest(*PICKUP, max_km=40)], [key for _, key in expected])
+
+    def test_upsert_moves_and_remove_drops(self):
+        grid = GeoGrid()
+        grid.upsert(1, 10.0, 10.0)
+        grid.upsert(1, *PICKUP)
+        grid.upsert(2, 49.3, -123.1)
+        grid.remove(2)
+        self.assertEqual(len(grid), 1)
+        self.assertEqual([key for key, _ in grid.nearest(*PICKUP, max_km=5)], [1])
+
+
+class NearbyDriversTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.staff = get_or_create_seed_staff()
+        customer_user = User.objects.create_user(username='nearbycustomer', password='pass')
+        self.customer = Customer.objects.create(user=customer_user, phone_number='555-0700')
+        self.delivery = Delivery.objects.create(
+            customer=self.customer,
+            pickup_location='1 Pickup St, Vancouver',
+            dropoff_location='2 Dropoff Ave',
+            delivery_date=timezone.now().date() + timedelta(days=1),
+        )
+        self.delivery.pickup_address = _address(self.delivery.pickup_location, *PICKUP)
+        self.delivery.save(update_fields=['pickup_address'])
+        self._seq = 0
+
+    def _driver(self, lat, lng, *, compliant=True):
+        self._seq += 1
+        n = self._seq
+        user, _ = ensure_user_account(
+            username=f'nearby.driver{n}',
+            email=f'nearby.driver{n}@example.com',
+            password='pass',
+            first_name='Nearby',
+            last_name=f'Driver{n}',
+        )
+        driver, _ = upsert_driver(
+            user=user,
+            staff=self.staff,
+            first_name='Nearby',
+            last_name=f'Driver{n}',
+            phone_number='5550000000',
+            license_number=f'NEARDL{n:04d}',
+            license_issuing_region='CA-BC',
+        )
+        vehicle, _ = upsert_catalog_vehicle(
+            license_plate=f'NRB{n:04d}',
+            manufacturer='Ford',
+            model='F-150',
+            year=2022,
+            vin=f'1NRBTEST{n:09d}',
+            capacity_kg=1000,
+        )
+        vehicle.approval_status = VehicleApprovalStatus.APPROVED
+        vehicle.save(update_fields=['approval_status'])
+        assign_vehicle_to_driver(driver, vehicle)
+        seed_compliance_documents(self.staff, driver, vehicle, 'full_verified' if compliant else 'none')
+        driver.home_address = _address(f'{n} Home Rd', lat, lng)
+        driver.save(update_fields=['home_address'])
+        return driver
+
+    def test_returns_k_nearest_eligible_drivers(self):
+        near = self._driver(49.29, -123.12)
+        self._driver(49.285, -123.121, compliant=False)
+        middle = self._driver(49.40, -123.10)
+        self._driver(49.60, -123.00)
+        self._driver(53.5, -113.5)  # Edmonton, outside the radius
+
+        result = nearest_eligible_drivers(self.delivery, k=2)
+
+        self.assertEqual([row['driver_id'] for row in result['drivers']], [near.id, middle.id])
+        self.assertLess(result['drivers'][0]['distance_km'], result['drivers'][1]['distance_km'])
+
+    def test_index_follows_driver_saves_without_rebuild(self):
+        driver = self._driver(49.60, -123.00)
+        get_driver_geo_index()
+        with patch.object(geo_index, 'indexed_drivers', side_effect=AssertionError('rebuilt')):
+            driver.home_address = _address('Moved Rd', 49.2830, -123.1210)
+            driver.save(update_fields=['home_address'])
+            self.assertEqual(nearest_eligible_drivers(self.delivery, k=1, max_km=1)['drivers'][0]['driver_id'], driver.id)
+            driver.active = False
+            driver.save(update_fields=['active'])
+            self.assertNotIn(driver.id, get_driver_geo_index())
+
+    def test_other_process_change_triggers_rebuild(self):
+        driver = self._driver(49.29, -123.12)
+        get_driver_geo_index()
+        cache.set(geo_index.DRIVER_GEO_INDEX_VERSION_KEY, 'written-elsewhere', None)
+        with patch.object(geo_index, 'indexed_drivers', return_value=[]) as rebuild:
+            self.assertNotIn(driver.id, get_driver_geo_index())
+        rebuild.assert_called_once()
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_shared_cache'},
+    })
+    def test_driver_save_reaches_other_worker(self):
+        call_command('createcachetable', verbosity=0)
+        driver = self._driver(49.29, -123.12)
+        get_driver_geo_index()
+        # Worker B: its own index and its own cache connection.
+        worker_index = (geo_index._index, geo_index._index_version)
+
+        driver.active = False
+        driver.save(update_fields=['active'])
+
+        with patch.multiple(
+            geo_index,
+            cache=caches.create_connection('default'),
+            _index=worker_index[0],
+            _index_version=worker_index[1],
+        ):
+            self.assertNotIn(driver.id, get_driver_geo_index())
+
+    def test_batch_geocode_invalidates_index(self):
+        driver = self._driver(49.60, -123.00)
+        driver.address_street = '9 Moved Rd'
+        driver.save(update_fields=['address_street'])
+        self.assertEqual(get_driver_geo_index()._points[driver.id], (49.60, -123.00))
+
+        moved = _address(driver.full_address, *PICKUP)
+        with patch('delivery.proximity_service.validate_addresses', return_value=[moved]):
+            self.assertEqual(geocode_driver_home_bases([driver]), 1)
+
+        self.assertEqual(get_driver_geo_index()._points[driver.id], PICKUP)
+
+    def test_pickup_regeocoded_when_location_changes(self):
+        self.delivery.pickup_location = '500 Elsewhere Blvd'
+        moved = _address(self.delivery.pickup_location, 49.0, -122.0)
+        with patch('delivery.proximity_service.validate_address', return_value=moved) as geocode:
+            self.assertEqual(geocode_delivery_pickup(self.delivery), moved)
+            geocode_delivery_pickup(self.delivery)
+        geocode.assert_called_once_with('500 Elsewhere Blvd', 'US')
+
+    def test_endpoint_requires_assign_permission(self):
+        driver = self._driver(49.29, -123.12)
+        url = f'/api/deliveries/{self.delivery.id}/nearby-drivers/'
+        read_only = User.objects.create_user(username='nearbyreadonly', password='pass', is_staff=True)
+        StaffProfile.objects.create(user=read_only, staff_role=StaffRole.READ_ONLY)
+        client = APIClient()
+        for user in (self.customer.user, read_only):
+            client.force_authenticate(user)
+            self.assertEqual(client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        client.force_authenticate(self.staff)
+        self.assertEqual(client.get(f'{url}?k=0').status_code, status.HTTP_400_BAD_REQUEST)
+        response = client.get(f'{url}?k=3&max_km=25')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['drivers'][0]['driver_id'], driver.id)
+        self.assertEqual(response.data['max_km'], 25)
+
+    def test_search_rejects_stale_pickup_without_geocoding(self):
+        Delivery.objects.filter(pk=self.delivery.pk).update(pickup_location='Nowhere')
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        with patch('delivery.proximity_service.validate_address') as geocode:
+            response = client.get(f'/api/deliveries/{self.delivery.id}/nearby-drivers/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('pickup_location', response.data)
+        geocode.assert_not_called()
+        self.assertEqual(Delivery.objects.get(pk=self.delivery.pk).pickup_address_id, self.delivery.pickup_address_id)
+
+    def test_pickup_geocoded_when_edited(self):
+        moved = _address('500 Elsewhere Blvd', 49.0, -122.0)
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        with patch('delivery.proximity_service.validate_address', return_value=moved) as geocode:
+            response = client.patch(
+                f'/api/deliveries/{self.delivery.id}/',
+                {'pickup_location': '500 Elsewhere Blvd'},
+                format='json',
+            )
+            client.patch(f'/api/deliveries/{self.delivery.id}/', {'dropoff_location': '3 Other Ave'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        geocode.assert_called_once_with('500 Elsewhere Blvd', 'US')
+        self.assertEqual(Delivery.objects.get(pk=self.delivery.pk).pickup_address, moved)
+
+    def test_requested_delivery_pickup_geocoded(self):
+        client = APIClient()
+        client.force_authenticate(self.customer.user)
+        with patch(
+            'delivery.proximity_service.validate_address',
+            side_effect=lambda text, country: _address(text, *PICKUP),
+        ) as geocode:
+            response = client.post('/api/deliveries/request_delivery/', {
+                'pickup_location': '9 New Pickup Rd, Vancouver',
+                'dropoff_location': '2 Dropoff Ave',
+                'delivery_date': str(timezone.now().date() + timedelta(days=1)),
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        geocode.assert_called_once()
+        delivery = Delivery.objects.get(pk=response.data['delivery']['id'])
+        self.assertEqual(delivery.pickup_address.original_address, '9 New Pickup Rd, Vancouver')
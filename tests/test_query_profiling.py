@@ -0,0 +1,57 @@
+"""Per-request SQL profiling middleware."""
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from delivery.query_profiling import fingerprint
+
+PROFILED_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'delivery.middleware.RequestIdMiddleware',
+    'delivery.middleware.QueryProfilingMiddleware',
+]
+
+
+@override_settings(MIDDLEWARE=PROFILED_MIDDLEWARE, QUERY_PROFILING_ENABLED=True)
+class QueryProfilingMiddlewareTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='profstaff', password='pass', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_profile_logged_with_request_id_and_server_timing(self):
+        with self.assertLogs('delivery.queries', level='INFO') as logs:
+            response = self.client.get('/api/drivers/', HTTP_X_REQUEST_ID='req-123')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+
+        record = logs.records[0]
+        self.assertEqual(record.event, 'db.request_profile')
+        self.assertEqual(record.request_id, 'req-123')
+        self.assertGreater(record.query_count, 0)
+        self.assertLessEqual(len(record.slowest_queries), 5)
+
+    @override_settings(QUERY_PROFILING_BUDGET=0)
+    def test_warns_when_query_budget_exceeded(self):
+        with self.assertLogs('delivery.queries', level='WARNING') as logs:
+            self.client.get('/api/drivers/')
+        record = logs.records[0]
+        self.assertEqual(record.event, 'db.query_budget_exceeded')
+        self.assertEqual(record.query_budget, 0)
+
+    @override_settings(QUERY_PROFILING_ENABLED=False)
+    def test_disabled_by_default_setting(self):
+        response = self.client.get('/api/drivers/')
+        self.assertNotIn('Server-Timing', response)
+
+    def test_fingerprint_groups_per_row_queries(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id = 5 AND name = \'a\''),
+            fingerprint('SELECT * FROM t WHERE id = 17 AND name = \'b\''),
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+        )
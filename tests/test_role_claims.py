@@ -0,0 +1,137 @@
+"""JWT role claims: stateless principal for permission checks and revocation on role change."""
+
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from delivery import authentication
+from delivery.authentication import ROLE_CLAIMS_REVOKED_KEY
+from delivery.me_service import ROLE_CLAIMS_KEY
+from delivery.models import Customer, Driver, StaffProfile
+from delivery.staff_constants import PERM_RESOURCES_WRITE, StaffRole
+from delivery.staff_service import update_staff_profile
+
+
+class RoleClaimsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.super_admin = User.objects.create_user(username='claimsadmin', password='testpass123', is_staff=True)
+        StaffProfile.objects.create(user=self.super_admin, staff_role=StaffRole.SUPER_ADMIN)
+        self.ops = User.objects.create_user(username='claimsops', password='testpass123', is_staff=True)
+        self.ops_profile = StaffProfile.objects.create(user=self.ops, staff_role=StaffRole.OPERATIONS_ADMIN)
+        self.customer_user = User.objects.create_user(username='claimscust', password='testpass123')
+        self.customer = Customer.objects.create(user=self.customer_user, phone_number='5553001')
+        self.driver_user = User.objects.create_user(username='claimsdriver', password='testpass123')
+        self.driver = Driver.objects.create(
+            user=self.driver_user,
+            phone_number='5553002',
+            license_number='CLAIMSDL001',
+        )
+
+    def _login(self, username):
+        response = self.client.post(
+            '/api/token/',
+            {'username': username, 'password': 'testpass123'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def _client(self, access):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return client
+
+    def test_login_embeds_me_payload(self):
+        tokens = self._login('claimsops')
+        claims = AccessToken(tokens['access'])[ROLE_CLAIMS_KEY]
+        self.assertEqual(claims['me']['staff_role'], StaffRole.OPERATIONS_ADMIN)
+        self.assertIn(PERM_RESOURCES_WRITE, claims['me']['permissions'])
+        self.assertEqual(claims['me']['profile_id'], self.ops_profile.id)
+
+        customer_claims = AccessToken(self._login('claimscust')['access'])[ROLE_CLAIMS_KEY]
+        self.assertEqual(customer_claims['customer_id'], self.customer.id)
+        self.assertIsNone(customer_claims['driver_id'])
+
+    def test_me_and_permission_denials_need_no_queries(self):
+        client = self._client(self._login('claimsdriver')['access'])
+        with self.assertNumQueries(0):
+            me = client.get('/api/me/')
+            denied = client.get('/api/compliance/admin/summary/')
+        self.assertEqual(me.data['profile_id'], self.driver.id)
+        self.assertEqual(denied.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_staff_request_skips_user_lookup(self):
+        client = self._client(self._login('claimsops')['access'])
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/api/drivers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('"auth_user"."password"' in q['sql'] for q in ctx.captured_queries))
+
+    def test_role_change_revokes_claims(self):
+        access = self._login('claimsops')['access']
+        update_staff_profile(self.super_admin, self.ops_profile, staff_role=StaffRole.READ_ONLY)
+
+        response = self._client(access).delete(f'/api/drivers/{self.driver.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_reresolves_claims(self):
+        tokens = self._login('claimsops')
+        update_staff_profile(self.super_admin, self.ops_profile, staff_role=StaffRole.READ_ONLY)
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        claims = AccessToken(response.data['access'])[ROLE_CLAIMS_KEY]
+        self.assertEqual(claims['me']['staff_role'], StaffRole.READ_ONLY)
+
+    def test_deactivation_rejects_outstanding_access_token(self):
+        client = self._client(self._login('claimsdriver')['access'])
+        self.driver_user.is_active = False
+        self.driver_user.save()
+
+        response = client.get('/api/me/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True)
+    def test_password_change_rejects_outstanding_access_token(self):
+        client = self._client(self._login('claimscust')['access'])
+        self.customer_user.set_password('newpass456')
+        self.customer_user.save()
+
+        response = client.get('/api/me/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_orm_profile_edit_revokes_claims(self):
+        access = self._login('claimsops')['access']
+        self.ops_profile.staff_role = StaffRole.READ_ONLY
+        self.ops_profile.save()  # e.g. the Django admin, bypassing staff_service
+
+        response = self._client(access).delete(f'/api/drivers/{self.driver.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_revocation_marker_read_once_per_check_window(self):
+        client = self._client(self._login('claimsdriver')['access'])
+        authentication._revocations.clear()
+        key = ROLE_CLAIMS_REVOKED_KEY.format(user_id=self.driver_user.id)
+        with patch.object(authentication, 'cache', wraps=cache) as shared:
+            for _ in range(3):
+                self.assertEqual(client.get('/api/me/').status_code, status.HTTP_200_OK)
+        self.assertEqual([c.args[0] for c in shared.get.call_args_list].count(key), 1)
+
+    @override_settings(ROLE_CLAIMS_REVOCATION_CHECK_SECONDS=0)
+    def test_revocation_from_another_worker_applies_after_check_window(self):
+        access = self._login('claimsops')['access']
+        self._client(access).get('/api/me/')
+        # Another worker revoked: only the shared marker is written, not this process's memo.
+        cache.set(ROLE_CLAIMS_REVOKED_KEY.format(user_id=self.ops.id), AccessToken(access)[ROLE_CLAIMS_KEY]['issued_at'])
+        StaffProfile.objects.filter(pk=self.ops_profile.pk).update(staff_role=StaffRole.READ_ONLY)
+
+        response = self._client(access).delete(f'/api/drivers/{self.driver.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,12 +1,18 @@
 """Tests for staff role permission helpers."""
 
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from delivery.models import StaffProfile
 from delivery.staff_constants import (
     PERM_COMPLIANCE_VERIFY,
     PERM_DELIVERIES_ASSIGN,
+    PERM_DRIVERS_VIEW,
     PERM_RESOURCES_WRITE,
     PERM_STAFF_MANAGE,
     StaffRole,
@@ -14,6 +20,7 @@ from delivery.staff_constants import (
 from delivery.staff_permissions import (
     get_permissions_for_staff_role,
     get_staff_role_for_user,
+    staff_can_view_operational_data,
     user_has_staff_permission,
 )
 
@@ -80,3 +87,27 @@ class StaffPermissionTests(TestCase):
             is_staff=True,
         )
         self.assertEqual(get_staff_role_for_user(legacy), StaffRole.SUPER_ADMIN)
+
+    def test_permission_checks_resolve_role_once_per_user_instance(self):
+        user = User.objects.get(pk=self.ops_admin.pk)
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                self.assertTrue(staff_can_view_operational_data(user))
+                self.assertTrue(user_has_staff_permission(user, PERM_DELIVERIES_ASSIGN))
+                self.assertFalse(user_has_staff_permission(user, PERM_STAFF_MANAGE))
+
+
+class StaffPermissionRequestQueryTests(APITestCase):
+    def test_rbac_loads_staff_profile_with_user(self):
+        staff = User.objects.create_user(username='rbacqstaff', password='testpass123', is_staff=True)
+        StaffProfile.objects.create(user=staff, staff_role=StaffRole.READ_ONLY)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(staff).access_token}')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/api/drivers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_queries = [q['sql'] for q in ctx.captured_queries if 'delivery_staffprofile' in q['sql']]
+        self.assertEqual(len(profile_queries), 1)
+        self.assertIn('auth_user', profile_queries[0])
+        self.assertTrue(user_has_staff_permission(response.wsgi_request.user, PERM_DRIVERS_VIEW))
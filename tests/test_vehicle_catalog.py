@@ -1,15 +1,32 @@
 """Tests for vehicle manufacturer/model catalog."""
 
-from django.test import TestCase
+from unittest.mock import patch
+
+from django.core.cache import cache, caches
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from delivery import vehicle_catalog_cache
 from delivery.models import VehicleManufacturer, VehicleModelSpec
-from delivery.vehicle_catalog_validation import max_capacity_for_spec
+from delivery.vehicle_catalog_cache import (
+    get_model_spec_index,
+    get_vehicle_catalog,
+    invalidate_model_spec_index,
+)
+from delivery.vehicle_catalog_validation import (
+    get_active_model_spec,
+    max_capacity_for_spec,
+    validate_capacity_for_spec,
+    validate_model_year_for_spec,
+)
 
 
 class VehicleCatalogTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
 
     def test_migration_seeded_catalog(self):
@@ -30,3 +47,128 @@ class VehicleCatalogTests(TestCase):
         spec = VehicleModelSpec.objects.get(manufacturer__name='Ford', name='F-350 Super Duty')
         self.assertEqual(max_capacity_for_spec(spec, 'kg'), 2000)
         self.assertEqual(max_capacity_for_spec(spec, 'lb'), 4400)
+
+
+class VehicleCatalogCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_warm_catalog_costs_no_queries(self):
+        first = self.client.get('/api/vehicle-catalog/')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertTrue(first['ETag'].startswith('"'))
+        self.assertIn('public', first['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/vehicle-catalog/')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get('/api/vehicle-catalog/')['ETag']
+
+        response = self.client.get('/api/vehicle-catalog/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        stale = self.client.get('/api/vehicle-catalog/', HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+
+    def test_spec_save_invalidates_catalog(self):
+        etag = self.client.get('/api/vehicle-catalog/')['ETag']
+        spec = VehicleModelSpec.objects.get(manufacturer__name='Ford', name='F-150')
+        spec.max_payload_lb = 3000
+        spec.save()
+
+        response = self.client.get('/api/vehicle-catalog/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        ford = next(item for item in response.data if item['name'] == 'Ford')
+        f150 = next(model for model in ford['models'] if model['name'] == 'F-150')
+        self.assertEqual(f150['max_payload_lb'], 3000)
+        cache.clear()
+
+
+class ModelSpecIndexTests(TestCase):
+    def setUp(self):
+        invalidate_model_spec_index()
+        self.f150 = VehicleModelSpec.objects.get(manufacturer__name='Ford', name='F-150')
+
+    def test_warm_index_validates_without_queries(self):
+        get_active_model_spec(self.f150.id)
+        with self.assertNumQueries(0):
+            spec = get_active_model_spec(self.f150.id)
+            validate_model_year_for_spec(spec, self.f150.start_year)
+            validate_capacity_for_spec(spec, 1000, 'kg')
+            with self.assertRaises(ValidationError):
+                validate_capacity_for_spec(spec, 5000, 'lb')
+        self.assertEqual(spec.pk, self.f150.pk)
+        self.assertEqual(spec.manufacturer.name, 'Ford')
+
+    def test_unknown_or_inactive_spec_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            get_active_model_spec(0)
+        self.f150.is_active = False
+        self.f150.save()
+        with self.assertRaises(ValidationError):
+            get_active_model_spec(self.f150.id)
+
+    def test_version_stamp_change_rebuilds_index(self):
+        get_active_model_spec(self.f150.id)
+        VehicleModelSpec.objects.filter(pk=self.f150.pk).update(start_year=2030)
+        # queryset.update() skips signals; another worker's edit moves the stamp instead.
+        invalidate_model_spec_index()
+        with self.assertRaises(ValidationError):
+            validate_model_year_for_spec(get_active_model_spec(self.f150.id), 2025)
+
+
+DATABASE_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'test_shared_cache',
+    }
+}
+
+
+@override_settings(CACHES=DATABASE_CACHE)
+class SharedCacheCatalogTests(TestCase):
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+
+    def test_catalog_edit_invalidates_every_worker(self):
+        worker_cache = caches.create_connection('default')
+        with patch.object(vehicle_catalog_cache, 'cache', worker_cache):
+            etag = get_vehicle_catalog()['etag']
+
+        spec = VehicleModelSpec.objects.get(manufacturer__name='Ford', name='F-150')
+        spec.max_payload_lb = 3000
+        spec.save()
+
+        with patch.object(vehicle_catalog_cache, 'cache', worker_cache):
+            self.assertNotEqual(get_vehicle_catalog()['etag'], etag)
+
+
+@override_settings(CACHES=DATABASE_CACHE)
+class SharedCacheModelSpecIndexTests(TestCase):
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+        self.f150 = VehicleModelSpec.objects.get(manufacturer__name='Ford', name='F-150')
+
+    def test_other_worker_rebuilds_after_catalog_edit(self):
+        self.assertIn(self.f150.id, get_model_spec_index())
+        # Worker B: its own index and its own cache connection.
+        worker_index = (vehicle_catalog_cache._spec_index, vehicle_catalog_cache._spec_index_version)
+        worker_cache = caches.create_connection('default')
+
+        # Worker A deactivates the spec; its receiver moves the stamp in the shared table.
+        self.f150.is_active = False
+        self.f150.save()
+
+        with patch.multiple(
+            vehicle_catalog_cache,
+            cache=worker_cache,
+            _spec_index=worker_index[0],
+            _spec_index_version=worker_index[1],
+        ):
+            self.assertNotIn(self.f150.id, get_model_spec_index())